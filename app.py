@@ -5,10 +5,11 @@ Tam çalışır versiyon - HİÇBİR ÖZELLİK EKSİK DEĞİL!
 
 from flask import Flask, render_template, request, jsonify, Response
 from flask_cors import CORS
-from flask_socketio import SocketIO, emit
+from flask_socketio import SocketIO, emit, join_room, leave_room
 from config.settings import Settings, check_settings
-from src.api_handler import MultiProviderAPIHandler
-from src.conversation import ConversationManager
+from src.api_handler import MultiProviderAPIHandler, get_client_pool_stats
+from src.conversation_registry import ConversationRegistry
+from src.conversation_summarizer import ConversationSummarizer
 from src.database import Database
 from src.personality import Personality 
 
@@ -25,17 +26,23 @@ from src.artifact_detector import ArtifactDetector
 
 # Prediction Engine
 from src.prediction_engine import AdvancedPredictionEngine as PredictionEngine
+from src.prediction_broadcaster import PredictionBroadcaster
+from src.scoring_profile import ScoringProfile
+from src.market_analytics import MarketAnalytics
+from src.order_book import OrderBookManager, fetch_depth_snapshot
+from src.trade_broadcaster import TradeBroadcaster
+from src.ingestion import IngestionPipeline
+from src.tick_store import TickStore, tick_records
+from src.tick_log import TickLog
+from src.trade_decoder import TradeDecoder
+from src.binance_stream import BinanceStreamManager
+from src.downsample import METHODS as DOWNSAMPLE_METHODS, downsample
 
 import os
 import random
+import time
 from gtts import gTTS
 import uuid
-import websocket
-import json
-import threading
-import time
-from collections import deque
-from datetime import datetime
 import re
 
 # Flask uygulaması
@@ -47,7 +54,20 @@ socketio = SocketIO(app, cors_allowed_origins="*", async_mode='threading', logge
 
 # Global değişkenler
 db = Database()
-active_conversations = {}
+conversation_registry = ConversationRegistry(
+    loader=lambda conv_id: db.get_recent_messages(conv_id, Settings.MAX_HISTORY),
+    handler_factory=MultiProviderAPIHandler,
+    max_entries=Settings.CONVERSATION_CACHE_MAX,
+    idle_ttl=Settings.CONVERSATION_IDLE_TTL,
+    memory_budget=Settings.CONVERSATION_MEMORY_BUDGET_MB * 1024 * 1024,
+    summary_loader=db.get_summary
+)
+conversation_summarizer = ConversationSummarizer(
+    db,
+    handler_factory=lambda: MultiProviderAPIHandler(Settings.SUMMARY_PROVIDER, Settings.SUMMARY_MODEL),
+    min_messages=Settings.SUMMARY_MIN_MESSAGES,
+    max_chars=Settings.SUMMARY_MAX_CHARS
+) if Settings.SUMMARY_ENABLED else None
 
 # Self-improvement sistemi
 learning_engine = LearningEngine()
@@ -59,15 +79,83 @@ self_improver = SelfImprover(auto_apply=False)
 artifact_manager = ArtifactManager()
 code_executor = CodeExecutor()
 
+# Ortak tick deposu (grafik geçmişi + tahmin motoru aynı veriyi okur)
+tick_store = TickStore(Settings.TICK_STORE_CAPACITY)
+
+# L2 emir defterleri (destek/direnç defterdeki duvarlardan)
+order_books = OrderBookManager(
+    fetch_snapshot=lambda symbol, limit: fetch_depth_snapshot(symbol, limit, Settings.BINANCE_REST_URL),
+    max_levels=Settings.ORDER_BOOK_MAX_LEVELS,
+    top_n=Settings.ORDER_BOOK_TOP_N,
+    wall_factor=Settings.ORDER_BOOK_WALL_FACTOR
+) if Settings.ORDER_BOOK_ENABLED else None
+
 # Prediction Engine
-prediction_engine = PredictionEngine()
+prediction_engine = PredictionEngine(
+    tick_store=tick_store,
+    market_analytics=MarketAnalytics(
+        bucket_ms=Settings.MARKET_ANALYTICS_BUCKET_MS,
+        window=Settings.MARKET_ANALYTICS_WINDOW,
+        benchmark=Settings.MARKET_BENCHMARK
+    ),
+    order_books=order_books,
+    cache_max_age=Settings.PREDICTION_CACHE_MAX_AGE,
+    indicator_timeframe=Settings.PREDICTION_TIMEFRAME,
+    profile=ScoringProfile.load(Settings.PREDICTION_PROFILE_PATH) if Settings.PREDICTION_PROFILE_PATH else None
+)
+prediction_broadcaster = PredictionBroadcaster(
+    socketio,
+    prediction_engine,
+    interval=Settings.PREDICTION_BROADCAST_INTERVAL
+)
+if prediction_engine.alert_engine is not None:
+    prediction_engine.alert_engine.add_listener(prediction_broadcaster.publish_alert_event)
+
+# Kalıcı tick kaydı (veri alım hattından yazılır, açılışta motoru ısıtır, backtest'e kaynak olur)
+tick_log = TickLog(
+    Settings.TICK_LOG_DIR,
+    segment_records=Settings.TICK_LOG_SEGMENT_RECORDS,
+    max_segments=Settings.TICK_LOG_MAX_SEGMENTS
+) if Settings.TICK_LOG_ENABLED else None
+
+def warm_start_from_tick_log():
+    """
+    Kayıtlı son tick'lerle tick deposunu ve tahmin motorunu ısıt (ayrıştırma yok, mmap)
+    İçe aktarmada değil, sunucu başlatılırken çağrılır
+    """
+    if tick_log is None:
+        return
+    
+    since_ms = int((time.time() - Settings.TICK_LOG_WARM_SECONDS) * 1000)
+    started = time.perf_counter()
+    histories = {}
+    
+    for symbol in tick_log.symbols():
+        try:
+            ticks = tick_log.read(symbol, since_ms=since_ms)
+        except Exception as e:
+            print(f"❌ Tick kaydı okunamadı ({symbol}): {e}")
+            continue
+        if len(ticks):
+            histories[symbol] = ticks
+    
+    if histories:
+        loaded = sum(len(ticks) for ticks in histories.values())
+        replayed = prediction_engine.warm_start(histories)
+        print(f"💾 Tick kaydından ısınma: {loaded:,} tick -> {replayed:,} işlendi "
+              f"({(time.perf_counter() - started) * 1000:.0f} ms)")
 
 # ============ BINANCE WEBSOCKET SİSTEMİ + GRAFİK VERİ SAKLAMA ============
-binance_ws = None
-binance_thread = None
 
-# Her coin için fiyat geçmişi (son 100 veri)
-price_history = {}
+# Trade'ler tek tek değil, sabit hızda toplu çerçeveler halinde yayınlanır
+trade_broadcaster = TradeBroadcaster(
+    socketio,
+    rate_hz=Settings.TRADE_BROADCAST_RATE,
+    ack_timeout=Settings.TRADE_ACK_TIMEOUT
+)
+
+# Trade mesajlarından sadece coin/fiyat/miktar/zaman çıkarılır (hızlı JSON varsa o kullanılır)
+binance_decoder = TradeDecoder()
 
 def normalize_text_stream(text: str) -> str:
     """Streaming metin normalizasyonu - kelime birleşmelerini düzelt"""
@@ -76,77 +164,75 @@ def normalize_text_stream(text: str) -> str:
     return text
 
 def on_binance_message(ws, message):
-    """Binance'den gelen veriyi işle ve frontend'e gönder"""
-    try:
-        data = json.loads(message)
-        stream_name = data.get('stream', 'unknown')
-        
-        if 'data' in data:
-            trade_data = data['data']
-            symbol = stream_name.split('@')[0].upper()
-            price = float(trade_data['p'])
-            quantity = float(trade_data.get('q', 0))
-            timestamp = trade_data['T']
-            
-            # Fiyat geçmişine ekle (grafik için)
-            if symbol not in price_history:
-                price_history[symbol] = deque(maxlen=100)
-            
-            price_history[symbol].append({
-                'price': price,
-                'timestamp': timestamp,
-                'time': time.strftime('%H:%M:%S', time.localtime(timestamp/1000))
-            })
-            
-            # Prediction Engine'e veri ekle (volume ile birlikte)
-            prediction_engine.add_price_data(
-                symbol=symbol, 
-                price=price, 
-                volume=quantity,
-                timestamp=datetime.fromtimestamp(timestamp/1000)
-            )
+    """Binance mesajını kuyruğa at (işleme ayrı thread'de, soket hiç bekletilmez)"""
+    binance_ingestion.submit(message)
+
+def process_binance_batch(batch):
+    """Kuyruktan gelen mesajları toplu işle: tick deposu/tahmin motoru ve trade yayını"""
+    trades = []
+    latest = {}  # Coin -> (fiyat, miktar, zaman, trade sayısı) - yayına sadece son trade gider
+    
+    for _, message in batch:
+        try:
+            # Defter diff'leri ayrı işlenir (stream adı mesajın başında)
+            if order_books is not None and message.find('@depth', 0, 64) != -1:
+                order_books.handle_message(message)
+                continue
+            trade = binance_decoder.decode(message)
+        except Exception as e:
+            print(f"❌ Binance mesaj hatası: {e}")
+            continue
         
-        # Frontend'e gönder
-        socketio.emit('binance_update', data, namespace='/', to=None)
-        socketio.sleep(0)
+        if trade is None:
+            continue
+        symbol, price, quantity, timestamp = trade
         
-    except Exception as e:
-        print(f"❌ Binance mesaj hatası: {e}")
-
-def on_binance_error(ws, error):
-    print(f"❌ Binance WebSocket hatası: {error}")
-
-def on_binance_close(ws, close_status_code, close_msg):
-    print("🔴 Binance bağlantısı kapandı")
-
-def on_binance_open(ws):
-    print("✅ Binance WebSocket bağlantısı kuruldu!")
-
-def start_binance_websocket(symbols):
-    """Binance WebSocket'i başlat (Multi-stream) - ÇOK COİN DESTEĞİ"""
-    global binance_ws
+        trades.append((symbol, price, quantity, timestamp))
+        previous = latest.get(symbol)
+        latest[symbol] = (price, quantity, timestamp, previous[3] + 1 if previous else 1)
     
-    streams = '/'.join([f"{s}@trade" for s in symbols])
-    url = f"wss://stream.binance.com:9443/stream?streams={streams}"
+    # Prediction Engine'e toplu ekle - tick'ler ortak depoya yazılır (uyarılar coin başına bir kez değerlendirilir)
+    if trades:
+        prediction_engine.add_price_batch(trades)
+        if tick_log is not None:
+            tick_log.append_batch(trades)
     
+    # Frontend'e toplu çerçeveyle gidecek (coin başına son trade)
+    for symbol, (price, quantity, timestamp, count) in latest.items():
+        trade_broadcaster.publish(symbol, price, quantity, timestamp, count)
+
+# WebSocket alımı ile işleme arasında sınırlı kuyruk (dolarsa en eski mesajlar düşer)
+binance_ingestion = IngestionPipeline(
+    process_binance_batch,
+    maxsize=Settings.INGESTION_QUEUE_SIZE,
+    batch_size=Settings.INGESTION_BATCH_SIZE,
+    name='binance-ingestion'
+)
+
+# Stream'ler bağlantılara bölünür; kopan bağlantı jitter'lı beklemeyle yeniden kurulur
+binance_streams = BinanceStreamManager(
+    on_binance_message,
+    base_url=Settings.BINANCE_STREAM_URL,
+    streams_per_connection=Settings.BINANCE_STREAMS_PER_CONNECTION,
+    backoff_base=Settings.BINANCE_RECONNECT_BASE,
+    backoff_max=Settings.BINANCE_RECONNECT_MAX
+)
+
+def trade_streams(symbols):
+    """Coin listesi -> stream adları ('BTCUSDT' -> 'btcusdt@trade' + defter açıksa 'btcusdt@depth@100ms')"""
+    suffixes = ['@trade'] + ([Settings.ORDER_BOOK_STREAM] if order_books is not None else [])
+    return [f"{symbol.lower()}{suffix}" for symbol in symbols for suffix in suffixes]
+
+def start_binance_websocket(symbols):
+    """Binance WebSocket bağlantılarını başlat (Multi-stream) - ÇOK COİN DESTEĞİ"""
     print(f"🔗 Bağlanılan coinler: {', '.join([s.upper() for s in symbols])}")
-    
-    binance_ws = websocket.WebSocketApp(
-        url,
-        on_open=on_binance_open,
-        on_message=on_binance_message,
-        on_error=on_binance_error,
-        on_close=on_binance_close
-    )
-    
-    binance_ws.run_forever()
+    binance_ingestion.start()
+    binance_streams.subscribe(trade_streams(symbols))
 
 def stop_binance_websocket():
-    """Binance WebSocket'i durdur"""
-    global binance_ws
-    if binance_ws:
-        binance_ws.close()
-        print("🛑 Binance WebSocket durduruldu")
+    """Binance WebSocket bağlantılarını durdur"""
+    binance_streams.stop()
+    print("🛑 Binance WebSocket durduruldu")
 
 
 # ============ SAYFA ROUTE'LARI ============
@@ -174,8 +260,6 @@ def artifact_test():
 @app.route('/api/binance/start', methods=['POST'])
 def start_binance():
     """Binance WebSocket'i başlat - ÇOK COİN DESTEĞİ"""
-    global binance_thread
-    
     data = request.json
     # ⬇️ VARSAYILAN 20+ COİN
     symbols = data.get('symbols', [
@@ -186,12 +270,10 @@ def start_binance():
         'suiusdt', 'injusdt', 'thetausdt', 'ldousdt', 'ftmusdt'
     ])
     
-    if binance_thread and binance_thread.is_alive():
+    if binance_streams.running:
         return jsonify({"error": "Binance zaten çalışıyor"}), 400
     
-    binance_thread = threading.Thread(target=start_binance_websocket, args=(symbols,))
-    binance_thread.daemon = True
-    binance_thread.start()
+    start_binance_websocket(symbols)
     
     return jsonify({
         "success": True, 
@@ -207,28 +289,175 @@ def stop_binance():
     return jsonify({"success": True, "message": "Binance WebSocket durduruldu"})
 
 
+@app.route('/api/binance/subscribe', methods=['POST'])
+def subscribe_binance():
+    """Çalışırken coin ekle (diğer bağlantılar kopmadan)"""
+    symbols = (request.json or {}).get('symbols', [])
+    if not symbols:
+        return jsonify({"error": "symbols gerekli"}), 400
+    
+    binance_ingestion.start()
+    added = binance_streams.subscribe(trade_streams(symbols))
+    return jsonify({"success": True, "added": added, "streams": len(binance_streams.streams())})
+
+
+@app.route('/api/binance/unsubscribe', methods=['POST'])
+def unsubscribe_binance():
+    """Çalışırken coin çıkar (boşalan bağlantı kapatılır)"""
+    symbols = (request.json or {}).get('symbols', [])
+    if not symbols:
+        return jsonify({"error": "symbols gerekli"}), 400
+    
+    removed = binance_streams.unsubscribe(trade_streams(symbols))
+    if order_books is not None:
+        for symbol in symbols:
+            order_books.remove(symbol.upper())
+    return jsonify({"success": True, "removed": removed, "streams": len(binance_streams.streams())})
+
+
 @app.route('/api/binance/status', methods=['GET'])
 def binance_status():
-    """Binance durumunu kontrol et"""
-    is_running = binance_thread and binance_thread.is_alive()
-    return jsonify({"running": is_running})
+    """Binance durumunu kontrol et (bağlantı başına mesaj hızı dahil)"""
+    return jsonify(binance_streams.get_stats())
+
+
+@app.route('/api/binance/ingestion-stats', methods=['GET'])
+def binance_ingestion_stats():
+    """Veri alım kuyruğu metrikleri (derinlik, düşürülen mesaj, gecikme) ve çözücü sayaçları"""
+    return jsonify({
+        **binance_ingestion.get_stats(),
+        'decoder': binance_decoder.get_stats(),
+        'order_books': order_books.get_stats() if order_books is not None else None
+    })
+
+
+@app.route('/api/binance/broadcast-stats', methods=['GET'])
+def binance_broadcast_stats():
+    """Trade yayıncısı istatistikleri"""
+    return jsonify(trade_broadcaster.get_stats())
+
+
+@app.route('/api/binance/tick-log-stats', methods=['GET'])
+def binance_tick_log_stats():
+    """Kalıcı tick kaydı istatistikleri (coin, kayıt, disk boyutu)"""
+    if tick_log is None:
+        return jsonify({"enabled": False})
+    return jsonify({"enabled": True, **tick_log.get_stats()})
+
+
+@socketio.on('subscribe_trades')
+def handle_subscribe_trades():
+    """Toplu trade çerçevelerine abone ol"""
+    trade_broadcaster.add_client(request.sid)
+    trade_broadcaster.start()
+
+
+@socketio.on('unsubscribe_trades')
+def handle_unsubscribe_trades():
+    trade_broadcaster.remove_client(request.sid)
+
+
+@socketio.on('trades_ack')
+def handle_trades_ack():
+    """İstemci son trade çerçevesini işledi (geri basınç)"""
+    trade_broadcaster.ack(request.sid)
+
+
+@app.route('/api/binance/orderbook/<symbol>', methods=['GET'])
+def get_order_book(symbol):
+    """L2 defter özeti (likidite, dengesizlik, duvarlar) ve en iyi ?levels= seviye"""
+    if order_books is None:
+        return jsonify({"error": "Emir defteri kapalı"}), 404
+    
+    symbol = symbol.upper()
+    metrics = order_books.get_metrics(symbol)
+    if metrics is None:
+        return jsonify({"error": "Bu coin için senkron defter yok"}), 404
+    
+    levels = min(request.args.get('levels', 20, type=int), Settings.ORDER_BOOK_MAX_LEVELS)
+    return jsonify({"symbol": symbol, **metrics, "depth": order_books.get_depth(symbol, levels)})
 
 
 @app.route('/api/binance/history/<symbol>', methods=['GET'])
 def get_price_history(symbol):
-    """Belirli bir coin'in fiyat geçmişini getir (grafik için)"""
+    """
+    Belirli bir coin'in fiyat geçmişini getir (grafik için)
+    
+    Parametresiz: bellekteki son PRICE_HISTORY_POINTS tick
+    ?from=&to= (epoch-ms): aralık tick kaydından (yoksa bellekten) okunur ve
+        ?points= (varsayılan HISTORY_DEFAULT_POINTS) noktaya seyreltilir (?method=lttb|minmax)
+    ?since= (epoch-ms): sadece bu zamandan sonraki tick'ler (artımlı güncelleme)
+    Tick kaydından okunan aralık en fazla HISTORY_MAX_SPAN_MS (from yoksa to'dan geriye bu kadar)
+    ve HISTORY_MAX_RECORDS kayıt olabilir; daha geniş istekler 400 döner
+    """
     symbol = symbol.upper()
+    args = request.args
     
-    if symbol not in price_history:
+    if not any(key in args for key in ('from', 'to', 'since', 'points')):
+        if symbol not in tick_store:
+            return jsonify({"error": "Bu coin için veri yok"}), 404
+        
+        # Zaman metinleri burada (okuma anında) üretilir
+        history_list = tick_store.to_records(symbol, Settings.PRICE_HISTORY_POINTS)
+        
+        return jsonify({
+            "symbol": symbol,
+            "data": history_list,
+            "count": len(history_list)
+        })
+    
+    try:
+        start_ms = args.get('from', type=int)
+        end_ms = args.get('to', type=int)
+        since_ms = args.get('since', type=int)
+        points = min(args.get('points', Settings.HISTORY_DEFAULT_POINTS, type=int), Settings.HISTORY_MAX_POINTS)
+        method = args.get('method', 'lttb')
+        if method not in DOWNSAMPLE_METHODS or points < 2:
+            raise ValueError
+    except (TypeError, ValueError):
+        return jsonify({"error": "Geçersiz parametre (from/to/since: epoch-ms, points >= 2, method: lttb|minmax)"}), 400
+    
+    if since_ms is not None:
+        start_ms = max(start_ms or 0, since_ms + 1)
+    
+    # Kalıcı kayıt varsa günlerce geri gidilebilir; yoksa bellekteki halka tampon
+    if tick_log is not None and symbol in tick_log.symbols():
+        source = 'tick_log'
+        if start_ms is None:
+            start_ms = (end_ms if end_ms is not None else int(time.time() * 1000)) - Settings.HISTORY_MAX_SPAN_MS
+        elif (end_ms if end_ms is not None else int(time.time() * 1000)) - start_ms > Settings.HISTORY_MAX_SPAN_MS:
+            return jsonify({"error": f"Aralık çok geniş (en fazla {Settings.HISTORY_MAX_SPAN_MS // 60_000} dakika)"}), 400
+        
+        # Sınırın bir fazlası okunur: aşılırsa tamamı kopyalanmadan reddedilir
+        ticks = tick_log.read(symbol, since_ms=start_ms, until_ms=end_ms, limit=Settings.HISTORY_MAX_RECORDS + 1)
+        if len(ticks) > Settings.HISTORY_MAX_RECORDS:
+            return jsonify({"error": f"Aralıkta çok fazla kayıt var (en fazla {Settings.HISTORY_MAX_RECORDS}); aralığı daraltın"}), 400
+        timestamps, prices = ticks['timestamp'], ticks['price']
+    elif symbol in tick_store:
+        source = 'memory'
+        timestamps, prices, _ = tick_store.range(symbol, start_ms, end_ms)
+    else:
         return jsonify({"error": "Bu coin için veri yok"}), 404
     
-    # Deque'yi listeye çevir
-    history_list = list(price_history[symbol])
+    total = len(timestamps)
+    if total > points:
+        selected = downsample(timestamps, prices, points, method)
+        timestamps, prices = timestamps[selected], prices[selected]
+    
+    history_list = tick_records(timestamps, prices)
     
     return jsonify({
         "symbol": symbol,
         "data": history_list,
-        "count": len(history_list)
+        "count": len(history_list),
+        "total": total,
+        "downsampled": total > len(history_list),
+        "method": method,
+        "source": source,
+        "from": start_ms,
+        "to": end_ms,
+        # Sonraki artımlı istek için ?since= değeri
+        "last_timestamp": history_list[-1]['timestamp'] if history_list else since_ms
     })
 
 
@@ -258,6 +487,13 @@ def get_risk_alerts():
     return jsonify(alerts)
 
 
+@app.route('/api/prediction/alerts/log', methods=['GET'])
+def get_alert_log():
+    """Son açılan/kapanan uyarı olayları"""
+    limit = request.args.get('limit', default=100, type=int)
+    return jsonify(prediction_engine.get_alert_log(limit))
+
+
 @app.route('/api/prediction/market-summary', methods=['GET'])
 def get_market_summary():
     """Piyasa özeti"""
@@ -267,6 +503,23 @@ def get_market_summary():
     return jsonify(summary)
 
 
+@app.route('/api/prediction/correlations', methods=['GET'])
+def get_correlations():
+    """Coinler arası korelasyon matrisi, BTC betaları ve piyasa genişliği (?symbols=BTCUSDT,ETHUSDT)"""
+    analytics = prediction_engine.market_analytics
+    if analytics is None:
+        return jsonify({"error": "Piyasa analitiği kapalı"}), 404
+    
+    symbols = [s for s in request.args.get('symbols', '').split(',') if s]
+    return jsonify({**analytics.get_correlations(symbols or None), 'breadth': analytics.get_breadth()})
+
+
+@app.route('/api/prediction/cache-stats', methods=['GET'])
+def get_prediction_cache_stats():
+    """Tahmin önbelleği isabet/ıska sayaçları"""
+    return jsonify(prediction_engine.get_cache_stats())
+
+
 @app.route('/api/prediction/statistics/<symbol>', methods=['GET'])
 def get_symbol_statistics(symbol):
     """Coin istatistikleri"""
@@ -277,6 +530,41 @@ def get_symbol_statistics(symbol):
     return jsonify(stats)
 
 
+# ============ AI PREDICTION SOCKET.IO ABONELİKLERİ 📡 ============
+
+@socketio.on('subscribe_predictions')
+def handle_subscribe_predictions(data=None):
+    """Tahmin yayınlarına abone ol (symbols verilmezse tüm coinler + toplu veriler)"""
+    symbols = (data or {}).get('symbols')
+    
+    if symbols:
+        for symbol in symbols:
+            join_room(PredictionBroadcaster.symbol_room(symbol))
+    else:
+        join_room(PredictionBroadcaster.ROOM)
+    
+    prediction_broadcaster.start()
+    emit('prediction_snapshot', prediction_broadcaster.snapshot(symbols))
+
+
+@socketio.on('unsubscribe_predictions')
+def handle_unsubscribe_predictions(data=None):
+    """Tahmin yayınlarından çık"""
+    symbols = (data or {}).get('symbols')
+    
+    if symbols:
+        for symbol in symbols:
+            leave_room(PredictionBroadcaster.symbol_room(symbol))
+    else:
+        leave_room(PredictionBroadcaster.ROOM)
+
+
+@app.route('/api/prediction/broadcast-stats', methods=['GET'])
+def get_prediction_broadcast_stats():
+    """Tahmin yayıncısı istatistikleri"""
+    return jsonify(prediction_broadcaster.get_stats())
+
+
 # ============ PROVIDER & MODEL API'LERİ ============
 
 @app.route('/api/providers', methods=['GET'])
@@ -327,8 +615,9 @@ def create_conversation():
 def delete_conversation(conv_id):
     """Sohbet sil"""
     db.delete_conversation(conv_id)
-    if conv_id in active_conversations:
-        del active_conversations[conv_id]
+    conversation_registry.remove(conv_id)
+    if conversation_summarizer:
+        conversation_summarizer.forget(conv_id)
     return jsonify({"success": True})
 
 
@@ -341,8 +630,9 @@ def delete_all_conversations():
         
         for conv in conversations:
             db.delete_conversation(conv['id'])
-            if conv['id'] in active_conversations:
-                del active_conversations[conv['id']]
+            conversation_registry.remove(conv['id'])
+            if conversation_summarizer:
+                conversation_summarizer.forget(conv['id'])
             deleted_count += 1
         
         return jsonify({
@@ -354,6 +644,16 @@ def delete_all_conversations():
         return jsonify({"success": False, "error": str(e)}), 500
 
 
+@app.route('/api/conversations/cache-stats', methods=['GET'])
+def conversation_cache_stats():
+    """Bellekteki aktif sohbet istatistikleri (boyut, isabet, çıkarmalar) ve paylaşılan client havuzu"""
+    return jsonify({
+        **conversation_registry.get_stats(),
+        'client_pool': get_client_pool_stats(),
+        'summarizer': conversation_summarizer.get_stats() if conversation_summarizer else None
+    })
+
+
 @app.route('/api/conversations/<int:conv_id>/messages', methods=['GET'])
 def get_messages(conv_id):
     """Sohbet mesajlarını getir"""
@@ -375,26 +675,12 @@ def chat():
     if not conv_id or not message:
         return jsonify({"error": "Eksik parametreler"}), 400
     
-    # Conversation Manager'ı hazırla
-    if conv_id not in active_conversations:
-        conv_manager = ConversationManager()
-        api_handler = MultiProviderAPIHandler(provider, model)
-        active_conversations[conv_id] = (conv_manager, api_handler)
-        
-        # Eski mesajları yükle
-        old_messages = db.get_messages(conv_id)
-        for msg in old_messages:
-            if msg['role'] == 'user':
-                conv_manager.add_user_message(msg['content'])
-            elif msg['role'] == 'assistant':
-                conv_manager.add_assistant_message(msg['content'])
-    else:
-        conv_manager, api_handler = active_conversations[conv_id]
-        
-        # Model değiştiyse yeni handler oluştur
-        if provider != api_handler.provider or (model and model != api_handler.model):
-            api_handler = MultiProviderAPIHandler(provider, model)
-            active_conversations[conv_id] = (conv_manager, api_handler)
+    # Conversation Manager'ı hazırla (bellekte yoksa eski mesajlar veritabanından yüklenir)
+    conv_manager, api_handler = conversation_registry.get(conv_id, provider, model)
+    
+    # Arka planda tamamlanan özet varsa bu istek thread'inde uygula
+    if conversation_summarizer:
+        conversation_summarizer.apply(conv_id, conv_manager)
     
     # LEARNING: Implicit feedback analizi
     implicit_feedback = feedback_system.analyze_implicit_feedback(
@@ -421,7 +707,8 @@ def chat():
     # DYNAMIC PERSONALITY + MARKET CONTEXT: System prompt'u zenginleştir
     messages = conv_manager.get_messages()
     if messages and messages[0]['role'] == 'system':
-        base_prompt = messages[0]['content']
+        # Her turda temel prompt'tan kurulur (önceki turun zenginleştirmesi üst üste eklenmez)
+        base_prompt = conv_manager.base_system_prompt
         enhanced_prompt = dynamic_personality.get_enhanced_system_prompt(base_prompt)
         
         # Eğer piyasa sorusu ise market context ekle
@@ -431,17 +718,17 @@ def chat():
                 detected_symbol = None
                 for word in message_lower.split():
                     word_clean = word.strip('.,!?')
-                    if word_clean.upper() in [s.upper() for s in price_history.keys()]:
+                    if word_clean.upper() in tick_store:
                         detected_symbol = word_clean.upper()
                         break
                 
                 # Eğer sembol bulunamazsa, en aktif coin'leri kontrol et
-                if not detected_symbol and price_history:
+                if not detected_symbol and len(tick_store):
                     # BTC'yi varsayılan olarak al
-                    if 'BTCUSDT' in price_history:
+                    if 'BTCUSDT' in tick_store:
                         detected_symbol = 'BTCUSDT'
                     else:
-                        detected_symbol = list(price_history.keys())[0]
+                        detected_symbol = tick_store.symbols()[0]
                 
                 # Prediction ve market summary'yi al
                 prediction_data = None
@@ -463,6 +750,10 @@ def chat():
         
         messages[0]['content'] = enhanced_prompt
     
+    # Geçmişi modelin token bütçesine sığdır (zenginleştirilmiş system prompt dahil)
+    conv_manager.fit_to_model(api_handler.model)
+    messages = conv_manager.get_prompt_messages()
+    
     def generate():
         """Streaming response generator"""
         full_response = ""
@@ -476,6 +767,11 @@ def chat():
             # Yanıtı kaydet
             conv_manager.add_assistant_message(full_response)
             db.save_message(conv_id, 'assistant', full_response)
+            conversation_registry.touch(conv_id)
+            
+            # Bağlamdan düşen eski mesajları arka planda özete kat
+            if conversation_summarizer:
+                conversation_summarizer.schedule(conv_id, conv_manager)
             
             # LEARNING: Konuşma kalitesi metriklerini kaydet
             quality_metrics = feedback_system.analyze_conversation_quality(
@@ -841,6 +1137,8 @@ if __name__ == '__main__':
     if not check_settings():
         exit(1)
     
+    warm_start_from_tick_log()
+    
     # Mevcut provider'ları listele
     available = []
     if Settings.GROQ_API_KEY:
@@ -78,6 +78,114 @@ class Settings:
     AI_NAME = "Nova"
     MAX_HISTORY = 20
 
+    # Bellekteki aktif sohbetler (LRU + boşta kalma süresi + bellek bütçesi)
+    CONVERSATION_CACHE_MAX = 200  # En fazla sohbet
+    CONVERSATION_IDLE_TTL = 1800  # Saniye; bu kadar kullanılmayan sohbet bellekten çıkar
+    CONVERSATION_MEMORY_BUDGET_MB = 64  # Mesaj içerikleri için tahmini üst sınır
+
+    # Token bütçesi: geçmiş, modelin bağlam penceresinden cevap payı (MAX_TOKENS) düşülerek sığdırılır
+    CONTEXT_WINDOW_TOKENS = {
+        "gemini-2.5-flash": 1_048_576,
+        "gemini-2.0-flash-exp": 1_048_576,
+        "llama-3.3-70b": 65_536,
+        "llama3.3-70b": 65_536
+    }
+    DEFAULT_CONTEXT_WINDOW_TOKENS = 32_768
+    CONTEXT_MAX_PROMPT_TOKENS = 24_000  # Büyük pencereli modellerde de prompt maliyetini sınırlar
+    CONTEXT_MIN_MESSAGE_TOKENS = 1024  # Son (kullanıcı) mesajına her durumda ayrılan en az yer
+
+    # Bağlamdan düşen mesajların arka planda özetlenmesi (ucuz model çağrısı)
+    SUMMARY_ENABLED = os.getenv('SUMMARY_ENABLED', 'false').lower() == 'true'
+    SUMMARY_PROVIDER = os.getenv('SUMMARY_PROVIDER', DEFAULT_PROVIDER)
+    SUMMARY_MODEL = os.getenv('SUMMARY_MODEL')  # Boşsa provider'ın varsayılan modeli
+    SUMMARY_MIN_MESSAGES = 4  # Bu kadar mesaj düşmeden özetleme yapılmaz
+    SUMMARY_MAX_CHARS = 2000
+
+    # ═══════════════════════════════════════════════════════════
+    # TAHMİN MOTORU AYARLARI
+    # ═══════════════════════════════════════════════════════════
+
+    # Aynı tick sürümünde tahminler önbellekten döner; bu süre (saniye)
+    # içinde yeni tick gelse bile önbellek kabul edilir (None = sadece sürüm)
+    PREDICTION_CACHE_MAX_AGE = 1.0
+
+    # Göstergelerin hesaplandığı bar zaman dilimi ('1s', '1m', '5m', '15m', '1h'; None = ham tick)
+    PREDICTION_TIMEFRAME = '1s'
+
+    # Coin başına bellekte tutulan tick sayısı (grafik geçmişi ve tahmin motoru ortak kullanır)
+    TICK_STORE_CAPACITY = 200
+
+    # /api/binance/history varsayılan nokta sayısı
+    PRICE_HISTORY_POINTS = 100
+
+    # Coinler arası korelasyon / BTC betası / piyasa genişliği: kova süresi (ms) ve pencere (kova)
+    MARKET_ANALYTICS_BUCKET_MS = 5000
+    MARKET_ANALYTICS_WINDOW = 360
+    MARKET_BENCHMARK = 'BTCUSDT'
+
+    # Aralık istenen geçmiş sorgularında varsayılan / en fazla nokta (LTTB veya min/max seyreltme)
+    HISTORY_DEFAULT_POINTS = 500
+    HISTORY_MAX_POINTS = 5000
+    # Tick kaydından tek istekte okunabilecek en geniş aralık ve en fazla kayıt (24 byte/kayıt)
+    HISTORY_MAX_SPAN_MS = 24 * 3600 * 1000
+    HISTORY_MAX_RECORDS = 2_000_000
+
+    # Tahminlerin sunucuda yeniden hesaplanıp Socket.IO ile yayınlanma aralığı (saniye)
+    PREDICTION_BROADCAST_INTERVAL = 2.0
+
+    # Sinyal ağırlıkları ve karar/uyarı eşikleri için JSON profil dosyası (boş = varsayılanlar)
+    # Örnek profil: python -m src.parameter_sweep ... --save-best data/scoring_profile.json
+    PREDICTION_PROFILE_PATH = os.getenv('PREDICTION_PROFILE_PATH', '')
+
+    # ═══════════════════════════════════════════════════════════
+    # BINANCE CANLI VERİ AYARLARI
+    # ═══════════════════════════════════════════════════════════
+
+    # Combined-stream adresi (yerel deneme: python -m src.fake_binance_server -> ws://127.0.0.1:9001/stream)
+    BINANCE_STREAM_URL = os.getenv('BINANCE_STREAM_URL', 'wss://stream.binance.com:9443/stream')
+
+    # Bağlantı başına stream sayısı (Binance sınırı 1024); fazlası yeni bağlantılara bölünür
+    BINANCE_STREAMS_PER_CONNECTION = 200
+
+    # REST adresi (emir defteri snapshot'ı için)
+    BINANCE_REST_URL = os.getenv('BINANCE_REST_URL', 'https://api.binance.com')
+
+    # L2 emir defteri (@depth diff stream'i + REST snapshot senkronu)
+    ORDER_BOOK_ENABLED = os.getenv('ORDER_BOOK_ENABLED', 'true').lower() == 'true'
+    ORDER_BOOK_STREAM = '@depth@100ms'
+    ORDER_BOOK_MAX_LEVELS = 1000  # Taraf başına tutulan seviye
+    ORDER_BOOK_TOP_N = 20  # Likidite / dengesizlik için en iyi seviye sayısı
+    ORDER_BOOK_WALL_FACTOR = 5.0  # Medyan miktarın bu katını aşan seviye "duvar" sayılır
+
+    # Kopan bağlantı için jitter'lı üstel bekleme (saniye): rastgele [0, min(üst, taban * 2^deneme)]
+    BINANCE_RECONNECT_BASE = 1.0
+    BINANCE_RECONNECT_MAX = 60.0
+
+    # Trade çerçevelerinin tarayıcılara gönderilme hızı (saniyede çerçeve, 4-10 önerilir)
+    TRADE_BROADCAST_RATE = 5.0
+
+    # Onay (trades_ack) gelmeyen istemci bu süre (saniye) sonra tekrar hazır sayılır
+    TRADE_ACK_TIMEOUT = 5.0
+
+    # WebSocket ile işleme arasındaki kuyruğun kapasitesi (dolarsa en eski mesajlar düşer)
+    INGESTION_QUEUE_SIZE = 20000
+
+    # Tüketicinin tek seferde işlediği en fazla mesaj sayısı
+    INGESTION_BATCH_SIZE = 500
+
+    # Kalıcı tick kaydı (yalnızca sona eklenen ikili segmentler, açılışta mmap ile ısınma)
+    # Varsayılan kapalı: açıldığında disk kullanımı coin sayısı x segment x segment boyutu kadardır
+    TICK_LOG_ENABLED = os.getenv('TICK_LOG_ENABLED', 'false').lower() == 'true'
+    TICK_LOG_DIR = "data/ticks"
+
+    # Segment başına kayıt (kayıt = 24 byte; 250K kayıt = 6 MB) ve coin başına tutulacak segment
+    # Varsayılanlarla coin başına en fazla ~48 MB
+    TICK_LOG_SEGMENT_RECORDS = 250_000
+    TICK_LOG_MAX_SEGMENTS = 8
+
+    # Açılışta motoru ısıtmak için okunacak geçmiş (saniye)
+    TICK_LOG_WARM_SECONDS = 3600
+
     # ═══════════════════════════════════════════════════════════
     # DATABASE AYARLARI
     # ═══════════════════════════════════════════════════════════
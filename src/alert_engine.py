@@ -0,0 +1,210 @@
+"""
+OLAY TABANLI RİSK UYARI MOTORU 🚨
+Uyarıları veri akışı içinde değerlendirir; eşik geçişlerini histerezisle algılar
+ve sadece yeni açılan / kapanan uyarıları olay olarak yayınlar
+"""
+
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+# Uyarı kapanış eşikleri (giriş eşiğine göre geri dönüş payı)
+DEFAULT_HYSTERESIS = {
+    'volatility': 0.8,   # Volatilite giriş eşiğinin %80'inin altına inince kapanır
+    'change': 1.0,       # Değişim uyarıları eşikten 1 puan geri dönünce kapanır
+    'rsi': 5,            # RSI uyarıları eşikten 5 puan geri dönünce kapanır
+    'proximity': 1.5,    # Destek/direnç uyarıları mesafe %1.5'i aşınca kapanır
+    'macd': 0.01,        # MACD histogramı fiyatın %0.01'lik bandı dışına çıkınca yön değişmiş sayılır
+}
+
+SEVERITY_ORDER = {'danger': 0, 'warning': 1, 'info': 2, 'success': 3}
+
+
+class AlertRule:
+    """Tek bir uyarı koşulu: ölçüm, giriş/çıkış eşikleri ve mesaj"""
+
+    def __init__(self, alert_type: str, severity: str,
+                 measure: Callable[[Dict], Optional[float]],
+                 enter: Callable[[float], bool],
+                 exit: Callable[[float], bool],
+                 describe: Callable[[str, Dict], tuple]):
+        self.alert_type = alert_type
+        self.severity = severity
+        self.measure = measure
+        self.enter = enter
+        self.exit = exit
+        self.describe = describe  # (symbol, göstergeler) -> (mesaj, değer)
+
+
+def _support_distance(indicators: Dict) -> Optional[float]:
+    if not indicators['support_levels']:
+        return None
+    nearest = max(indicators['support_levels'])
+    return (indicators['current_price'] - nearest) / indicators['current_price'] * 100
+
+
+def _resistance_distance(indicators: Dict) -> Optional[float]:
+    if not indicators['resistance_levels']:
+        return None
+    nearest = min(indicators['resistance_levels'])
+    return (nearest - indicators['current_price']) / indicators['current_price'] * 100
+
+
+class AlertEngine:
+    """Coin başına aktif uyarıları tutar, geçişlerde olay üretir"""
+
+    def __init__(self, thresholds: Dict, hysteresis: Optional[Dict] = None, log_size: int = 500):
+        self.thresholds = thresholds  # Motorun alert_thresholds sözlüğü (canlı referans)
+        self.hysteresis = {**DEFAULT_HYSTERESIS, **(hysteresis or {})}
+        self.active = {}  # (coin, tip) -> uyarı
+        self.log = deque(maxlen=log_size)  # Son olaylar (new / cleared)
+        self.listeners = []  # Her olayda çağrılacak fonksiyonlar
+        self.stats = {'evaluations': 0, 'new': 0, 'cleared': 0}
+        self.rules = self._build_rules()
+
+    def _build_rules(self) -> List[AlertRule]:
+        t = self.thresholds
+        h = self.hysteresis
+
+        # MACD histogramı fiyat ölçeğindedir; bant her coinde anlamlı olsun diye fiyata oranlanır (%)
+        def macd_percent(i):
+            return i['macd']['histogram'] / i['current_price'] * 100 if i['current_price'] else None
+
+        return [
+            AlertRule(
+                'HIGH_VOLATILITY', 'warning',
+                lambda i: i['volatility_percent'],
+                lambda v: v > t['volatility'] * 100,
+                lambda v: v < t['volatility'] * 100 * h['volatility'],
+                lambda s, i: (f"⚠️ {s} çok yüksek volatilitede! (%{i['volatility_percent']:.2f})",
+                              i['volatility_percent'])
+            ),
+            AlertRule(
+                'RAPID_DECLINE', 'danger',
+                lambda i: i['changes']['5m'],
+                lambda v: v < t['rapid_decline'],
+                lambda v: v > t['rapid_decline'] + h['change'],
+                lambda s, i: (f"🚨 {s} hızlı düşüşte! ({i['changes']['5m']:.2f}%)", i['changes']['5m'])
+            ),
+            AlertRule(
+                'RAPID_INCREASE', 'info',
+                lambda i: i['changes']['5m'],
+                lambda v: v > t['rapid_increase'],
+                lambda v: v < t['rapid_increase'] - h['change'],
+                lambda s, i: (f"🚀 {s} hızlı yükselişte! (+{i['changes']['5m']:.2f}%)", i['changes']['5m'])
+            ),
+            AlertRule(
+                'OVERBOUGHT', 'warning',
+                lambda i: i['rsi'],
+                lambda v: v > t['rsi_overbought'],
+                lambda v: v < t['rsi_overbought'] - h['rsi'],
+                lambda s, i: (f"📊 {s} aşırı alım bölgesinde! (RSI: {i['rsi']:.1f})", i['rsi'])
+            ),
+            AlertRule(
+                'OVERSOLD', 'success',
+                lambda i: i['rsi'],
+                lambda v: v < t['rsi_oversold'],
+                lambda v: v > t['rsi_oversold'] + h['rsi'],
+                lambda s, i: (f"💰 {s} aşırı satım bölgesinde! (RSI: {i['rsi']:.1f})", i['rsi'])
+            ),
+            AlertRule(
+                'MACD_BULLISH_CROSS', 'success',
+                macd_percent,
+                lambda v: v > h['macd'],
+                lambda v: v < -h['macd'],
+                lambda s, i: (f"✅ {s} MACD yükseliş kesişimi!", i['macd']['histogram'])
+            ),
+            AlertRule(
+                'MACD_BEARISH_CROSS', 'warning',
+                macd_percent,
+                lambda v: v < -h['macd'],
+                lambda v: v > h['macd'],
+                lambda s, i: (f"🔻 {s} MACD düşüş kesişimi!", i['macd']['histogram'])
+            ),
+            AlertRule(
+                'NEAR_SUPPORT', 'info',
+                _support_distance,
+                lambda v: v < 1,
+                lambda v: v > h['proximity'],
+                lambda s, i: (f"💪 {s} destek seviyesinde! (${max(i['support_levels']):.2f})",
+                              max(i['support_levels']))
+            ),
+            AlertRule(
+                'NEAR_RESISTANCE', 'warning',
+                _resistance_distance,
+                lambda v: v < 1,
+                lambda v: v > h['proximity'],
+                lambda s, i: (f"⚠️ {s} direnç seviyesinde! (${min(i['resistance_levels']):.2f})",
+                              min(i['resistance_levels']))
+            ),
+        ]
+
+    def add_listener(self, callback: Callable[[Dict], None]) -> None:
+        """Yeni/kapanan uyarı olaylarını dinle (tick yolunda, motor kilidi altında çağrılır: G/Ç yapmamalı)"""
+        self.listeners.append(callback)
+
+    def evaluate(self, symbol: str, indicators: Optional[Dict]) -> List[Dict]:
+        """Göstergeleri kurallara uygula; sadece durum değiştiren uyarıları olay olarak döndür"""
+        if not indicators:
+            return []
+
+        self.stats['evaluations'] += 1
+        events = []
+
+        for rule in self.rules:
+            key = (symbol, rule.alert_type)
+            measured = rule.measure(indicators)
+            active = self.active.get(key)
+
+            if active is None:
+                if measured is not None and rule.enter(measured):
+                    message, value = rule.describe(symbol, indicators)
+                    alert = {
+                        'symbol': symbol,
+                        'type': rule.alert_type,
+                        'message': message,
+                        'severity': rule.severity,
+                        'value': value,
+                        'since': datetime.now().isoformat()
+                    }
+                    self.active[key] = alert
+                    events.append({'event': 'new', 'alert': alert})
+            elif measured is None or rule.exit(measured):
+                del self.active[key]
+                events.append({'event': 'cleared', 'alert': active})
+            else:
+                # Uyarı sürüyor: değeri güncel tut (olay üretmez). Yerinde değiştirilmez,
+                # yeni sözlük yazılır: önceki hali tutan yayıncı değişikliği görebilsin
+                message, value = rule.describe(symbol, indicators)
+                if message != active['message'] or value != active['value']:
+                    self.active[key] = {**active, 'message': message, 'value': value}
+
+        for event in events:
+            event['timestamp'] = datetime.now().isoformat()
+            self.log.append(event)
+            self.stats[event['event']] += 1
+            for callback in self.listeners:
+                try:
+                    callback(event)
+                except Exception as e:
+                    print(f"❌ Uyarı dinleyici hatası: {e}")
+
+        return events
+
+    def get_active_alerts(self) -> List[Dict]:
+        """Şu an aktif uyarılar (önem sırasına göre, kopya)"""
+        alerts = [dict(alert) for alert in self.active.values()]
+        alerts.sort(key=lambda x: SEVERITY_ORDER.get(x['severity'], 4))
+        return alerts
+
+    def get_log(self, limit: int = 100) -> List[Dict]:
+        """Son uyarı olayları (yeniden eskiye)"""
+        return list(self.log)[-limit:][::-1]
+
+    def clear_symbol(self, symbol: str) -> None:
+        """Bir coinin aktif uyarılarını olay üretmeden temizle"""
+        for key in [key for key in self.active if key[0] == symbol]:
+            del self.active[key]
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'active': len(self.active), 'log_size': len(self.log)}
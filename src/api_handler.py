@@ -7,9 +7,66 @@ Web Search (Tavily) eklendi! 🔍
 
 from config.settings import Settings
 import requests
+import threading
+
+# Provider API adresleri (OpenAI uyumlu olanlar için)
+PROVIDER_BASE_URLS = {
+    "cerebras": "https://api.cerebras.ai/v1"
+}
+
+# Süreç genelinde paylaşılan SDK client'ları: (provider, base_url) -> client
+# Her sohbet aynı client'ı (ve onun keep-alive bağlantı havuzunu) kullanır,
+# böylece yeni sohbette TLS el sıkışması ve ayrı bağlantı havuzu maliyeti olmaz
+_client_pool = {}
+_client_pool_lock = threading.Lock()
+_client_pool_stats = {"created": 0, "reused": 0}
+
+
+def _create_client(provider, base_url):
+    if provider == "google":
+        import google.generativeai as genai
+        genai.configure(api_key=Settings.GOOGLE_API_KEY)
+        return genai
+
+    elif provider == "cerebras":
+        from openai import OpenAI
+        return OpenAI(
+            api_key=Settings.CEREBRAS_API_KEY,
+            base_url=base_url
+        )
+
+    else:
+        raise ValueError(f"Desteklenmeyen provider: {provider}")
+
+
+def get_shared_client(provider):
+    """Provider için paylaşılan client'ı döndür (yoksa bir kez oluştur)"""
+    key = (provider, PROVIDER_BASE_URLS.get(provider))
+    client = _client_pool.get(key)
+    if client is not None:
+        _client_pool_stats["reused"] += 1
+        return client
+
+    with _client_pool_lock:
+        client = _client_pool.get(key)
+        if client is None:
+            client = _create_client(*key)
+            _client_pool[key] = client
+            _client_pool_stats["created"] += 1
+        else:
+            _client_pool_stats["reused"] += 1
+        return client
+
+
+def get_client_pool_stats():
+    return {
+        **_client_pool_stats,
+        "clients": [f"{provider}@{base_url}" if base_url else provider for provider, base_url in _client_pool]
+    }
+
 
 class MultiProviderAPIHandler:
-    """Çoklu AI provider'ı destekler"""
+    """Çoklu AI provider'ı destekler (client'lar paylaşılır, handler sadece provider/model tutar)"""
     
     def __init__(self, provider=None, model=None):
         self.provider = provider or Settings.DEFAULT_PROVIDER
@@ -37,22 +94,8 @@ class MultiProviderAPIHandler:
         self.client = self._init_client()
     
     def _init_client(self):
-        """Provider'a göre client oluştur"""
-
-        if self.provider == "google":
-            import google.generativeai as genai
-            genai.configure(api_key=Settings.GOOGLE_API_KEY)
-            return genai
-
-        elif self.provider == "cerebras":
-            from openai import OpenAI
-            return OpenAI(
-                api_key=Settings.CEREBRAS_API_KEY,
-                base_url="https://api.cerebras.ai/v1"
-            )
-
-        else:
-            raise ValueError(f"Desteklenmeyen provider: {self.provider}")
+        """Provider'ın paylaşılan client'ını al"""
+        return get_shared_client(self.provider)
 
     
     # ═══════════════════════════════════════════════════════════
@@ -0,0 +1,394 @@
+"""
+GEÇMİŞ VERİ BACKTEST MOTORU 🧪📈
+Kaydedilmiş tick / mum dosyalarını tahmin motorundan geçirir ve her AL/SAT kararını
+belirlenen ufuklardaki gerçek getiriyle puanlar (isabet oranı, PnL, drawdown)
+
+Kullanım:
+    python -m src.backtester veri.csv --horizons 1m,5m,15m --workers 4
+    python -m src.backtester veri.csv --convert veri.npz   # CSV -> ikili format
+    python -m src.backtester data/ticks                    # Canlı sistemin tick kaydı dizini
+"""
+
+import argparse
+import csv
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from src.candles import TIMEFRAMES
+from src.prediction_engine import AdvancedPredictionEngine
+from src.scoring_profile import ScoringProfile
+from src.tick_buffer import TICK_DTYPE, candles_to_ticks, compress_ticks
+from src.tick_log import TickLog
+
+# Ufuk etiketi -> milisaniye
+DEFAULT_HORIZONS = {
+    '1m': 60_000,
+    '5m': 300_000,
+    '15m': 900_000,
+}
+
+HORIZON_UNITS = {'s': 1_000, 'm': 60_000, 'h': 3_600_000}
+
+
+def parse_horizons(text: str) -> Dict[str, int]:
+    """'30s,5m,1h' -> {'30s': 30000, '5m': 300000, '1h': 3600000}"""
+    horizons = {}
+    for label in text.split(','):
+        label = label.strip()
+        if not label:
+            continue
+        if label[-1] not in HORIZON_UNITS or not label[:-1].isdigit():
+            raise ValueError(f"Geçersiz ufuk: {label}")
+        horizons[label] = int(label[:-1]) * HORIZON_UNITS[label[-1]]
+    return horizons
+
+
+# ═══════════════════════════════════════════════════════════
+# VERİ OKUMA / YAZMA
+# ═══════════════════════════════════════════════════════════
+
+def _parse_timestamp(value: str) -> int:
+    """Epoch-ms (veya epoch-s) sayı ya da ISO tarih -> epoch-ms"""
+    try:
+        number = float(value)
+    except ValueError:
+        return int(datetime.fromisoformat(value).timestamp() * 1000)
+    # 10 haneli değerler saniye cinsindendir
+    return int(number * 1000) if number < 1e11 else int(number)
+
+
+def load_ticks_csv(path: str) -> Dict[str, np.ndarray]:
+    """
+    CSV oku -> {coin: TICK_DTYPE dizisi (zaman sıralı)}
+
+    Tick dosyası sütunları:  symbol, timestamp, price[, volume]
+    Mum dosyası sütunları:   symbol, open_time, open, high, low, close[, volume]
+    """
+    rows = {}
+    with open(path, newline='', encoding='utf-8') as f:
+        reader = csv.DictReader(f)
+        fields = {name.strip().lower(): name for name in reader.fieldnames or []}
+        is_candle = 'close' in fields
+
+        if 'symbol' not in fields:
+            raise ValueError("CSV'de 'symbol' sütunu yok")
+
+        time_field = fields.get('open_time') or fields.get('timestamp') or fields.get('time')
+        if time_field is None:
+            raise ValueError("CSV'de zaman sütunu yok (timestamp / open_time)")
+
+        value_fields = ['open', 'high', 'low', 'close'] if is_candle else ['price']
+        volume_field = fields.get('volume')
+
+        for row in reader:
+            symbol = row[fields['symbol']].strip().upper()
+            values = [_parse_timestamp(row[time_field])]
+            values.extend(float(row[fields[name]]) for name in value_fields)
+            values.append(float(row[volume_field]) if volume_field and row[volume_field] else 0.0)
+            rows.setdefault(symbol, []).append(values)
+
+    data = {}
+    for symbol, values in rows.items():
+        table = np.array(values, dtype=np.float64)
+        table = table[np.argsort(table[:, 0], kind='stable')]
+        timestamps = table[:, 0].astype(np.int64)
+
+        if is_candle:
+            data[symbol] = candles_to_ticks(timestamps, *table[:, 1:].T)
+        else:
+            ticks = np.zeros(len(table), dtype=TICK_DTYPE)
+            ticks['timestamp'] = timestamps
+            ticks['price'] = table[:, 1]
+            ticks['volume'] = table[:, 2]
+            data[symbol] = ticks
+
+    return data
+
+
+def save_ticks_binary(path: str, data: Dict[str, np.ndarray]) -> None:
+    """Tick'leri sıkıştırılmamış .npz olarak kaydet (coin başına bir TICK_DTYPE dizisi)"""
+    np.savez(path, **{symbol: np.asarray(ticks, dtype=TICK_DTYPE) for symbol, ticks in data.items()})
+
+
+def load_ticks_binary(path: str) -> Dict[str, np.ndarray]:
+    with np.load(path) as archive:
+        return {symbol: archive[symbol] for symbol in archive.files}
+
+
+def load_ticks(path: str) -> Dict[str, np.ndarray]:
+    """Tick kaydı dizini (TickLog), ikili (.npz) veya CSV tick dosyası oku"""
+    if os.path.isdir(path):
+        return TickLog(path).read_all()
+    if path.lower().endswith('.npz'):
+        return load_ticks_binary(path)
+    return load_ticks_csv(path)
+
+
+# ═══════════════════════════════════════════════════════════
+# TEKRAR OYNATMA (REPLAY)
+# ═══════════════════════════════════════════════════════════
+
+def replay_symbol(symbol: str, ticks: np.ndarray, decision_interval_ms: int = 1_000,
+                  indicator_timeframe: Optional[str] = '1s', history_size: int = 200) -> Dict:
+    """
+    Tek coinin tick'lerini yeni bir motordan geçir ve her `decision_interval_ms`'de
+    gösterge anlık görüntüsü al
+
+    Returns:
+        {'timestamps': karar zamanları, 'prices': giriş fiyatları, 'indicators': gösterge listesi}
+    """
+    engine = AdvancedPredictionEngine(
+        history_size=history_size,
+        streaming=True,
+        indicator_timeframe=indicator_timeframe,
+        event_alerts=False
+    )
+
+    decision_times = []
+    decision_prices = []
+    snapshots = []
+    next_decision = None
+
+    timestamps = ticks['timestamp'].tolist()
+    prices = ticks['price'].tolist()
+    volumes = ticks['volume'].tolist()
+
+    for timestamp, price, volume in zip(timestamps, prices, volumes):
+        engine.add_price_data(symbol, price, volume, timestamp)
+
+        if next_decision is not None and timestamp < next_decision:
+            continue
+
+        indicators = engine._compute_indicators(symbol)
+        if indicators is None:
+            continue
+
+        decision_times.append(timestamp)
+        decision_prices.append(price)
+        snapshots.append(indicators)
+        next_decision = timestamp + decision_interval_ms
+
+    return {
+        'timestamps': np.array(decision_times, dtype=np.int64),
+        'prices': np.array(decision_prices, dtype=np.float64),
+        'indicators': snapshots
+    }
+
+
+def _replay_worker(args):
+    symbol, ticks, decision_interval_ms, indicator_timeframe, history_size = args
+    return symbol, replay_symbol(symbol, ticks, decision_interval_ms, indicator_timeframe, history_size)
+
+
+# ═══════════════════════════════════════════════════════════
+# PUANLAMA
+# ═══════════════════════════════════════════════════════════
+
+def score_returns(returns: np.ndarray) -> Dict:
+    """İşlem getirilerinden (oran) isabet, PnL ve maksimum drawdown"""
+    if len(returns) == 0:
+        return {'trades': 0, 'hit_rate': 0, 'pnl_percent': 0, 'avg_return_percent': 0, 'max_drawdown_percent': 0}
+
+    # Her işlem sabit tutarla açılır: sermaye eğrisi getirilerin kümülatif toplamı
+    equity = np.cumsum(returns)
+    peak = np.maximum.accumulate(np.r_[0.0, equity])[1:]
+    drawdown = float((peak - equity).max())
+
+    return {
+        'trades': len(returns),
+        'hit_rate': round(float((returns > 0).mean()) * 100, 2),
+        'pnl_percent': round(float(returns.sum()) * 100, 4),
+        'avg_return_percent': round(float(returns.mean()) * 100, 4),
+        'max_drawdown_percent': round(drawdown * 100, 4)
+    }
+
+
+def forward_returns(ticks: np.ndarray, decision_times: np.ndarray, entry_prices: np.ndarray,
+                    horizon_ms: int) -> np.ndarray:
+    """
+    Her karar anından `horizon_ms` sonraki fiyat getirisi (oran)
+    Ufku veri sonunu aşan kararlar için NaN
+    """
+    exits = np.searchsorted(ticks['timestamp'], decision_times + horizon_ms, side='left')
+    valid = exits < len(ticks)
+
+    returns = np.full(len(decision_times), np.nan)
+    future = ticks['price'][exits[valid]]
+    returns[valid] = (future - entry_prices[valid]) / entry_prices[valid]
+    return returns
+
+
+class Backtester:
+    """Kaydedilmiş veriyi motordan geçirip AL/SAT kararlarını puanlar"""
+
+    ACTION_DIRECTIONS = {'BUY': 1, 'SELL': -1}
+
+    def __init__(self, horizons: Optional[Dict[str, int]] = None, decision_interval_ms: int = 1_000,
+                 indicator_timeframe: Optional[str] = '1s', history_size: int = 200,
+                 fee: float = 0.0, min_confidence: float = 0, workers: Optional[int] = None):
+        if indicator_timeframe is not None and indicator_timeframe not in TIMEFRAMES:
+            raise ValueError(f"Geçersiz zaman dilimi: {indicator_timeframe}")
+
+        self.horizons = horizons or dict(DEFAULT_HORIZONS)
+        self.decision_interval_ms = decision_interval_ms
+        self.indicator_timeframe = indicator_timeframe
+        self.history_size = history_size
+        self.fee = fee  # İşlem başına komisyon (oran, örn. 0.001 = %0.1)
+        self.min_confidence = min_confidence
+        self.workers = workers or os.cpu_count() or 1
+
+    def prepare(self, data: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        """Bar modunda tick'leri en ince zaman dilimi kovalarına indir (sonuç aynı, replay hızlı)"""
+        if self.indicator_timeframe is None:
+            return data
+        interval = TIMEFRAMES['1s']
+        return {symbol: compress_ticks(ticks, interval) for symbol, ticks in data.items()}
+
+    def replay(self, data: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+        """Tüm coinleri (çok çekirdekte) tekrar oynat -> {coin: anlık görüntüler}"""
+        jobs = [
+            (symbol, ticks, self.decision_interval_ms, self.indicator_timeframe, self.history_size)
+            for symbol, ticks in data.items()
+        ]
+
+        if self.workers <= 1 or len(jobs) <= 1:
+            return dict(_replay_worker(job) for job in jobs)
+
+        with ProcessPoolExecutor(max_workers=min(self.workers, len(jobs))) as pool:
+            return dict(pool.map(_replay_worker, jobs))
+
+    def decide(self, snapshots: Dict, engine: Optional[AdvancedPredictionEngine] = None) -> np.ndarray:
+        """Anlık görüntülerden karar yönleri (+1 AL, -1 SAT, 0 BEKLE) - motorun puanlama profiliyle"""
+        engine = engine or AdvancedPredictionEngine(streaming=False, event_alerts=False)
+        scores, risks = engine.signal_matrix(snapshots['indicators'])
+        return engine.profile.directions(scores, risks, self.min_confidence)
+
+    def forward_returns(self, data: Dict[str, np.ndarray], replayed: Dict[str, Dict]) -> Dict[str, Dict[str, np.ndarray]]:
+        """{coin: {ufuk: karar başına ileri getiri}} - karardan bağımsızdır, bir kez hesaplanır"""
+        return {
+            symbol: {
+                label: forward_returns(data[symbol], snapshots['timestamps'], snapshots['prices'], horizon_ms)
+                for label, horizon_ms in self.horizons.items()
+            }
+            for symbol, snapshots in replayed.items()
+        }
+
+    def score(self, decision_times: Dict[str, np.ndarray], directions: Dict[str, np.ndarray],
+              forward: Dict[str, Dict[str, np.ndarray]]) -> Dict:
+        """Karar yönlerini ileri getirilerle puanla (coin bazında ve toplam)"""
+        symbols = {}
+        combined = {label: [] for label in self.horizons}
+
+        for symbol, symbol_directions in directions.items():
+            horizons = {}
+
+            for label in self.horizons:
+                future = forward[symbol][label]
+                mask = (symbol_directions != 0) & ~np.isnan(future)
+                returns = symbol_directions[mask] * future[mask] - self.fee
+
+                horizons[label] = score_returns(returns)
+                combined[label].append((decision_times[symbol][mask], returns))
+
+            symbols[symbol] = {
+                'decisions': len(symbol_directions),
+                'buys': int((symbol_directions == 1).sum()),
+                'sells': int((symbol_directions == -1).sum()),
+                'horizons': horizons
+            }
+
+        overall = {}
+        for label, parts in combined.items():
+            if not parts:
+                overall[label] = score_returns(np.zeros(0))
+                continue
+            times = np.concatenate([p[0] for p in parts])
+            returns = np.concatenate([p[1] for p in parts])
+            overall[label] = score_returns(returns[np.argsort(times, kind='stable')])
+
+        return {'symbols': symbols, 'overall': overall}
+
+    def evaluate(self, data: Dict[str, np.ndarray], replayed: Dict[str, Dict],
+                 engine: Optional[AdvancedPredictionEngine] = None) -> Dict:
+        """Tekrar oynatılmış veriyi puanla (aynı replay farklı profillerle tekrar puanlanabilir)"""
+        directions = {symbol: self.decide(snapshots, engine) for symbol, snapshots in replayed.items()}
+        decision_times = {symbol: snapshots['timestamps'] for symbol, snapshots in replayed.items()}
+
+        report = self.score(decision_times, directions, self.forward_returns(data, replayed))
+        for symbol, result in report['symbols'].items():
+            result['ticks'] = len(data[symbol])
+        return report
+
+    def run(self, source, engine: Optional[AdvancedPredictionEngine] = None) -> Dict:
+        """Dosya yolu veya {coin: tick dizisi} verisiyle uçtan uca backtest"""
+        started = time.perf_counter()
+        data = load_ticks(source) if isinstance(source, str) else source
+        total_ticks = sum(len(ticks) for ticks in data.values())
+
+        replayed = self.replay(self.prepare(data))
+        report = self.evaluate(data, replayed, engine)
+
+        elapsed = time.perf_counter() - started
+        report['ticks'] = total_ticks
+        report['elapsed_seconds'] = round(elapsed, 3)
+        report['ticks_per_second'] = round(total_ticks / elapsed) if elapsed > 0 else 0
+        return report
+
+
+def print_report(report: Dict) -> None:
+    print(f"\n🧪 Backtest: {report['ticks']:,} tick, {report['elapsed_seconds']}s "
+          f"({report['ticks_per_second']:,} tick/s)\n")
+
+    header = f"{'COIN':<12}{'UFUK':>6}{'İŞLEM':>8}{'İSABET%':>10}{'PNL%':>12}{'DD%':>10}"
+    print(header)
+    print('─' * len(header))
+
+    rows = [(symbol, result['horizons']) for symbol, result in sorted(report['symbols'].items())]
+    rows.append(('TOPLAM', report['overall']))
+
+    for name, horizons in rows:
+        for label, stats in horizons.items():
+            print(f"{name:<12}{label:>6}{stats['trades']:>8}{stats['hit_rate']:>10.2f}"
+                  f"{stats['pnl_percent']:>12.4f}{stats['max_drawdown_percent']:>10.4f}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Tahmin motoru backtest')
+    parser.add_argument('source', help='Tick/mum CSV dosyası, .npz ikili dosya veya tick kaydı dizini')
+    parser.add_argument('--horizons', default=','.join(DEFAULT_HORIZONS), help='Örn: 30s,1m,5m,1h')
+    parser.add_argument('--interval', type=int, default=1_000, help='Kararlar arası süre (ms)')
+    parser.add_argument('--timeframe', default='1s', help="Gösterge zaman dilimi ('tick' = tick modu)")
+    parser.add_argument('--fee', type=float, default=0.0, help='İşlem başına komisyon (oran)')
+    parser.add_argument('--min-confidence', type=float, default=0)
+    parser.add_argument('--profile', help='Puanlama profili JSON dosyası')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--convert', help='Sadece CSV\'yi bu .npz dosyasına çevir')
+    args = parser.parse_args(argv)
+
+    if args.convert:
+        data = load_ticks(args.source)
+        save_ticks_binary(args.convert, data)
+        print(f"✅ {sum(len(t) for t in data.values()):,} tick -> {args.convert}")
+        return
+
+    backtester = Backtester(
+        horizons=parse_horizons(args.horizons),
+        decision_interval_ms=args.interval,
+        indicator_timeframe=None if args.timeframe == 'tick' else args.timeframe,
+        fee=args.fee,
+        min_confidence=args.min_confidence,
+        workers=args.workers
+    )
+    engine = None
+    if args.profile:
+        engine = AdvancedPredictionEngine(streaming=False, event_alerts=False, profile=ScoringProfile.load(args.profile))
+    print_report(backtester.run(args.source, engine))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,216 @@
+"""
+TOPLU (BATCH) GÖSTERGE HESAPLAYICI 🧮
+Tüm coinlerin göstergelerini (coin x pencere) boyutlu NumPy matrisleri üzerinde tek geçişte hesaplar
+Her fonksiyon satır başına bir değer içeren 1-D dizi döndürür
+"""
+
+from typing import Dict, Optional
+
+import numpy as np
+
+from src.streaming_indicators import FLAT_RANGE
+
+def moving_average(prices: np.ndarray, period: int) -> np.ndarray:
+    """Basit hareketli ortalama"""
+    return prices[:, -period:].mean(axis=1)
+
+
+def exponential_moving_average(prices: np.ndarray, period: int) -> np.ndarray:
+    """EMA - ilk `period` değerle tohumlanır, kalanlar tek matris-vektör çarpımıyla uygulanır"""
+    if prices.shape[1] < period:
+        return prices.mean(axis=1)
+
+    multiplier = 2 / (period + 1)
+    seed = prices[:, :period].mean(axis=1)
+    rest = prices[:, period:]
+
+    decay = (1 - multiplier) ** np.arange(rest.shape[1] - 1, -1, -1)
+    return seed * (1 - multiplier) ** rest.shape[1] + multiplier * (rest @ decay)
+
+
+def ema_series(prices: np.ndarray, period: int) -> np.ndarray:
+    """
+    Her adımdaki EMA (coin x pencere); tohumdan önceki sütunlar NaN
+    Akış EMA'sıyla (StreamingEMA) aynı tohum ve aynı güncelleme sırası
+    """
+    series = np.full(prices.shape, np.nan)
+    if prices.shape[1] < period:
+        return series
+
+    multiplier = 2 / (period + 1)
+    value = prices[:, :period].mean(axis=1)
+    series[:, period - 1] = value
+    for t in range(period, prices.shape[1]):
+        value = (prices[:, t] * multiplier) + (value * (1 - multiplier))
+        series[:, t] = value
+    return series
+
+
+def macd(prices: np.ndarray, fast: int = 12, slow: int = 26, signal: int = 9):
+    """
+    (MACD, sinyal, histogram) dizileri - sinyal, MACD serisinin `signal` EMA'sıdır
+    Seri `signal` değerden kısaysa sinyal serinin ortalaması, hiç yoksa MACD'nin kendisi
+    """
+    if prices.shape[1] < slow:
+        line = exponential_moving_average(prices, fast) - exponential_moving_average(prices, slow)
+        return line, line, np.zeros(prices.shape[0])
+
+    series = ema_series(prices, fast)[:, slow - 1:] - ema_series(prices, slow)[:, slow - 1:]
+    line = series[:, -1]
+    if series.shape[1] < signal:
+        signal_line = series.mean(axis=1)
+    else:
+        signal_line = ema_series(series, signal)[:, -1]
+    return line, signal_line, line - signal_line
+
+
+def _rsi_from_sums(gains: np.ndarray, losses: np.ndarray) -> np.ndarray:
+    with np.errstate(divide='ignore', invalid='ignore'):
+        rsi = 100 - (100 / (1 + gains / losses))
+    return np.where(losses == 0, 100.0, rsi)
+
+
+def wilder_average(values: np.ndarray, period: int, count: int = 1) -> np.ndarray:
+    """
+    Wilder yumuşatmalı ortalamanın son `count` değeri (coin x count)
+    İlk `period` değerin ortalamasıyla tohumlanır; akış RSI'ı (WilderRSI) ile aynı tohum ve güncelleme
+    """
+    alpha = 1 / period
+    first = values.shape[1] - count  # İstenen ilk değerin sütunu
+    seed = values[:, :period].mean(axis=1)
+    rest = values[:, period:first + 1]
+
+    decay = (1 - alpha) ** np.arange(rest.shape[1] - 1, -1, -1)
+    value = seed * (1 - alpha) ** rest.shape[1] + alpha * (rest @ decay)
+
+    series = np.empty((values.shape[0], count))
+    series[:, 0] = value
+    for t in range(1, count):
+        value = (value * (period - 1) + values[:, first + t]) / period
+        series[:, t] = value
+    return series
+
+
+def rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """Wilder RSI (tüm pencere üzerinden)"""
+    if prices.shape[1] < period + 1:
+        return np.full(prices.shape[0], 50.0)
+    return rsi_series(prices, period, count=1)[:, 0]
+
+
+def rsi_series(prices: np.ndarray, period: int = 14, count: Optional[int] = None) -> np.ndarray:
+    """
+    Her satır için Wilder RSI serisinin son `count` değeri (coin x count; None: tüm seri)
+    Son değerden önceki geçmiş tek matris-vektör çarpımıyla katlanır, sadece istenen kuyruk adım adım yürür
+    """
+    deltas = np.diff(prices, axis=1)
+    if count is None:
+        count = deltas.shape[1] - period + 1
+    gains = np.where(deltas > 0, deltas, 0.0)
+    losses = np.where(deltas < 0, -deltas, 0.0)
+    return _rsi_from_sums(wilder_average(gains, period, count), wilder_average(losses, period, count))
+
+
+def stochastic_rsi(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """Son `period` RSI değeri üzerinden Stochastic RSI"""
+    if prices.shape[1] < period * 2:
+        return np.full(prices.shape[0], 50.0)
+
+    recent = rsi_series(prices, period, count=period)
+    low = recent.min(axis=1)
+    high = recent.max(axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        stoch = (recent[:, -1] - low) / (high - low) * 100
+    return np.where(high - low <= FLAT_RANGE, 50.0, stoch)
+
+
+def bollinger_bands(prices: np.ndarray, period: int = 20, std_dev: int = 2):
+    """(üst, orta, alt) bant dizileri"""
+    if prices.shape[1] < period:
+        avg = prices.mean(axis=1)
+        return avg, avg, avg
+
+    recent = prices[:, -period:]
+    middle = recent.mean(axis=1)
+    std = recent.std(axis=1, ddof=1)
+    return middle + std_dev * std, middle, middle - std_dev * std
+
+
+def atr(prices: np.ndarray, period: int = 14,
+        highs: Optional[np.ndarray] = None, lows: Optional[np.ndarray] = None) -> np.ndarray:
+    """Average True Range - yüksek/düşük verilirse gerçek bar true range'i"""
+    if prices.shape[1] < period + 1:
+        if prices.shape[1] < 2:
+            return np.zeros(prices.shape[0])
+        return prices.std(axis=1, ddof=1)
+
+    if highs is None or lows is None:
+        return np.abs(np.diff(prices[:, -(period + 1):], axis=1)).mean(axis=1)
+
+    previous_close = prices[:, -(period + 1):-1]
+    high = highs[:, -period:]
+    low = lows[:, -period:]
+    true_ranges = np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+    return true_ranges.mean(axis=1)
+
+
+def trend_strength(prices: np.ndarray, period: int = 14) -> np.ndarray:
+    """Trend gücü (ADX benzeri, son delta hariç)"""
+    if prices.shape[1] < period + 1:
+        return np.full(prices.shape[0], 50.0)
+
+    changes = np.diff(prices[:, -(period + 1):], axis=1)[:, :-1]
+    positive = np.where(changes > 0, changes, 0.0).sum(axis=1)
+    negative = np.where(changes < 0, -changes, 0.0).sum(axis=1)
+    total = positive + negative
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        strength = np.abs(positive - negative) / total * 100
+    return np.where(total == 0, 50.0, strength)
+
+
+def momentum(prices: np.ndarray, period: int = 10) -> np.ndarray:
+    if prices.shape[1] <= period:
+        return np.zeros(prices.shape[0])
+    return prices[:, -1] - prices[:, -period - 1]
+
+
+def rate_of_change(prices: np.ndarray, period: int = 10) -> np.ndarray:
+    if prices.shape[1] <= period:
+        return np.zeros(prices.shape[0])
+    return (prices[:, -1] - prices[:, -period - 1]) / prices[:, -period - 1] * 100
+
+
+def volume_ratio(volumes: np.ndarray, period: int = 20) -> np.ndarray:
+    """Son hacmin kayan hacim ortalamasına oranı"""
+    volume_ma = volumes[:, -period:].mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = volumes[:, -1] / volume_ma
+    return np.where(volume_ma > 0, ratio, 1.0)
+
+
+def compute_batch(prices: np.ndarray, volumes: np.ndarray,
+                  highs: Optional[np.ndarray] = None, lows: Optional[np.ndarray] = None) -> Dict:
+    """Tüm ham göstergeleri (coin x pencere) matrisleri için hesapla"""
+    bb_upper, bb_middle, bb_lower = bollinger_bands(prices)
+
+    return {
+        'ma_5': moving_average(prices, 5),
+        'ma_10': moving_average(prices, 10),
+        'ma_20': moving_average(prices, 20),
+        'ma_50': moving_average(prices, 50),
+        'ema_12': exponential_moving_average(prices, 12),
+        'ema_26': exponential_moving_average(prices, 26),
+        **dict(zip(('macd_line', 'macd_signal', 'macd_histogram'), macd(prices))),
+        'rsi': rsi(prices),
+        'stoch_rsi': stochastic_rsi(prices),
+        'bb_upper': bb_upper,
+        'bb_middle': bb_middle,
+        'bb_lower': bb_lower,
+        'atr': atr(prices, highs=highs, lows=lows),
+        'volume_ratio': volume_ratio(volumes),
+        'trend_strength': trend_strength(prices),
+        'momentum': momentum(prices),
+        'roc': rate_of_change(prices)
+    }
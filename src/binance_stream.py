@@ -0,0 +1,323 @@
+"""
+BINANCE BAĞLANTI YÖNETİCİSİ 🔌
+Stream'leri birden fazla combined-stream bağlantısına böler (bağlantı başına stream sınırı),
+kopan bağlantıyı jitter'lı üstel bekleme ile yeniden kurar ve çalışırken
+abone ol / abonelikten çık işlemlerini diğer bağlantılara dokunmadan yapar
+
+Abonelik listesi her bağlantının kendi kümesidir: yeniden bağlanırken URL bu kümeden kurulur,
+bu yüzden bağlantı koptuğu sırada yapılan değişiklikler de kaybolmaz
+"""
+
+import json
+import random
+import threading
+import time
+from typing import Callable, Dict, Iterable, List
+from urllib.parse import urlsplit
+
+import websocket
+
+BINANCE_STREAM_URL = 'wss://stream.binance.com:9443/stream'
+
+# Binance sınırları: bağlantı başına en fazla 1024 stream, saniyede en fazla 5 gelen (kontrol) mesajı
+MAX_STREAMS_PER_CONNECTION = 1024
+CONTROL_MESSAGE_INTERVAL = 0.25
+
+
+def reconnect_delay(attempt: int, base: float, maximum: float) -> float:
+    """Tam jitter'lı üstel bekleme: [0, min(maximum, base * 2^attempt)] aralığında rastgele"""
+    return random.uniform(0, min(maximum, base * (2 ** attempt)))
+
+
+class StreamConnection:
+    """Tek bir combined-stream bağlantısı (kendi thread'inde, koptukça yeniden bağlanır)"""
+
+    def __init__(self, name: str, base_url: str, on_message: Callable[[str], None],
+                 backoff_base: float = 1.0, backoff_max: float = 60.0, ping_interval: float = 20.0):
+        self.name = name
+        self.base_url = base_url
+        self.on_message = on_message
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.ping_interval = ping_interval
+
+        self.streams = set()
+        self.running = False
+        self.connected = False
+        self._ws = None
+        self._thread = None
+        self._wakeup = threading.Event()  # Yeniden bağlanma beklemesini stop() ile kesmek için
+        self._lock = threading.Lock()
+        self._next_id = 1
+        self._last_control = 0.0
+        self._attempt = 0
+
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self.stats = {
+            'messages': 0,
+            'rate': 0.0,
+            'connects': 0,
+            'reconnects': 0,
+            'errors': 0,
+            'control_sent': 0,
+            'last_message_at': None,
+            'connected_since': None
+        }
+
+    def url(self) -> str:
+        with self._lock:
+            streams = sorted(self.streams)
+        return f"{self.base_url}?streams={'/'.join(streams)}"
+
+    # ─────────────────────────── Yaşam döngüsü ───────────────────────────
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self.running = True
+        self._wakeup.clear()
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self.running = False
+        self._wakeup.set()
+        ws = self._ws
+        if ws is not None:
+            ws.close()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=5)
+        self._thread = None
+
+    def _run(self) -> None:
+        while self.running:
+            self._ws = websocket.WebSocketApp(
+                self.url(),
+                on_open=self._on_open,
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close
+            )
+            try:
+                self._ws.run_forever(ping_interval=self.ping_interval, ping_timeout=self.ping_interval / 2)
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"❌ Binance bağlantı hatası ({self.name}): {e}")
+
+            self.connected = False
+            if not self.running:
+                break
+
+            delay = reconnect_delay(self._attempt, self.backoff_base, self.backoff_max)
+            self._attempt += 1
+            self.stats['reconnects'] += 1
+            print(f"🔄 {self.name} {delay:.1f} sn sonra yeniden bağlanacak (deneme {self._attempt})")
+            self._wakeup.wait(delay)
+
+        self._ws = None
+
+    # ─────────────────────────── WebSocket olayları ───────────────────────────
+
+    def _on_open(self, ws) -> None:
+        if not self.running:
+            # stop() bağlantı kurulurken çağrıldı
+            ws.close()
+            return
+        self.connected = True
+        self._attempt = 0
+        self.stats['connects'] += 1
+        self.stats['connected_since'] = time.time()
+        print(f"✅ {self.name} bağlandı ({len(self.streams)} stream)")
+
+    def _on_message(self, ws, message) -> None:
+        now = time.monotonic()
+        self.stats['messages'] += 1
+        self.stats['last_message_at'] = time.time()
+        self._window_count += 1
+        elapsed = now - self._window_start
+        if elapsed >= 1.0:
+            self.stats['rate'] = self._window_count / elapsed
+            self._window_start, self._window_count = now, 0
+
+        # Abonelik yanıtları ({"result": null, "id": 1}) veri hattına gitmez
+        if message[:9] in ('{"result"', b'{"result"'):
+            return
+        self.on_message(message)
+
+    def _on_error(self, ws, error) -> None:
+        self.stats['errors'] += 1
+        print(f"❌ Binance WebSocket hatası ({self.name}): {error}")
+
+    def _on_close(self, ws, close_status_code, close_msg) -> None:
+        self.connected = False
+        print(f"🔴 {self.name} bağlantısı kapandı")
+
+    # ─────────────────────────── Abonelik ───────────────────────────
+
+    def send_control(self, method: str, streams: List[str]) -> None:
+        """SUBSCRIBE / UNSUBSCRIBE gönder (bağlı değilse yeni liste bir sonraki bağlantıda URL'den gelir)"""
+        ws = self._ws
+        if not self.connected or ws is None:
+            return
+
+        with self._lock:
+            # Binance gelen mesaj sınırını aşma: gönderim zamanı kilitte ayrılır, bekleme kilit dışında
+            send_at = max(time.monotonic(), self._last_control + CONTROL_MESSAGE_INTERVAL)
+            request_id, self._next_id = self._next_id, self._next_id + 1
+            self._last_control = send_at
+
+        wait = send_at - time.monotonic()
+        if wait > 0:
+            time.sleep(wait)
+
+        try:
+            ws.send(json.dumps({'method': method, 'params': streams, 'id': request_id}))
+            self.stats['control_sent'] += 1
+        except Exception as e:
+            # Bağlantı kopuyor demektir; yeniden bağlanınca URL güncel listeyi içerir
+            self.stats['errors'] += 1
+            print(f"⚠️ {self.name} {method} gönderilemedi: {e}")
+
+    def subscribe(self, streams: List[str]) -> None:
+        with self._lock:
+            streams = [stream for stream in streams if stream not in self.streams]
+            self.streams.update(streams)
+        if streams:
+            self.send_control('SUBSCRIBE', streams)
+
+    def remove(self, streams: List[str]) -> List[str]:
+        """Stream'leri listeden çıkar (mesaj göndermez); çıkarılanlar"""
+        with self._lock:
+            streams = [stream for stream in streams if stream in self.streams]
+            self.streams.difference_update(streams)
+        return streams
+
+    def unsubscribe(self, streams: List[str]) -> None:
+        streams = self.remove(streams)
+        if streams:
+            self.send_control('UNSUBSCRIBE', streams)
+
+    def get_stats(self) -> Dict:
+        rate = self.stats['rate']
+        elapsed = time.monotonic() - self._window_start
+        if elapsed >= 2.0:
+            # Mesaj gelmiyorsa oran eskimiş değerde kalmasın
+            rate = self._window_count / elapsed
+
+        return {
+            **self.stats,
+            'name': self.name,
+            'connected': self.connected,
+            'streams': len(self.streams),
+            'rate': round(rate, 2)
+        }
+
+
+class BinanceStreamManager:
+    """Stream'leri bağlantılara dağıtan (sharding) yönetici"""
+
+    def __init__(self, on_message: Callable[[str], None], base_url: str = BINANCE_STREAM_URL,
+                 streams_per_connection: int = 200, backoff_base: float = 1.0, backoff_max: float = 60.0):
+        if not 0 < streams_per_connection <= MAX_STREAMS_PER_CONNECTION:
+            raise ValueError(f"streams_per_connection 1-{MAX_STREAMS_PER_CONNECTION} arasında olmalı")
+
+        self.on_message = on_message
+        self.base_url = base_url
+        self.streams_per_connection = streams_per_connection
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+
+        self.connections = []  # StreamConnection listesi
+        self._lock = threading.Lock()
+        self._created = 0
+
+    @property
+    def running(self) -> bool:
+        return any(connection.running for connection in self.connections)
+
+    def streams(self) -> List[str]:
+        return sorted(stream for connection in self.connections for stream in connection.streams)
+
+    def _new_connection(self) -> StreamConnection:
+        self._created += 1
+        connection = StreamConnection(
+            f"binance-ws-{self._created}",
+            self.base_url,
+            self.on_message,
+            backoff_base=self.backoff_base,
+            backoff_max=self.backoff_max
+        )
+        self.connections.append(connection)
+        return connection
+
+    def subscribe(self, streams: Iterable[str]) -> List[str]:
+        """Stream'lere abone ol (boş yeri olan bağlantılara, gerekirse yeni bağlantı açarak); eklenenler"""
+        with self._lock:
+            existing = set(self.streams())
+            pending = []
+            for stream in streams:
+                stream = stream.lower()
+                if stream not in existing:
+                    existing.add(stream)
+                    pending.append(stream)
+
+            added = list(pending)
+            assignments = []
+            for connection in self.connections:
+                free = self.streams_per_connection - len(connection.streams)
+                if free > 0 and pending:
+                    assignments.append((connection, pending[:free]))
+                    pending = pending[free:]
+
+            while pending:
+                connection = self._new_connection()
+                assignments.append((connection, pending[:self.streams_per_connection]))
+                pending = pending[self.streams_per_connection:]
+
+        for connection, chunk in assignments:
+            connection.subscribe(chunk)
+            connection.start()
+        return added
+
+    def unsubscribe(self, streams: Iterable[str]) -> List[str]:
+        """Abonelikten çık; boşalan bağlantılar kapatılır. Çıkarılanlar"""
+        streams = {stream.lower() for stream in streams}
+        removed = []
+        changed = []  # (bağlantı, çıkarılan stream'ler) - açık kalan bağlantılar
+        emptied = []
+
+        # Listeler kilitte güncellenir; UNSUBSCRIBE mesajları (hız sınırı beklemesi dahil) kilit dışında gider
+        with self._lock:
+            for connection in self.connections:
+                chunk = connection.remove([stream for stream in connection.streams if stream in streams])
+                if not connection.streams:
+                    emptied.append(connection)
+                elif chunk:
+                    changed.append((connection, chunk))
+                removed.extend(chunk)
+            self.connections = [connection for connection in self.connections if connection not in emptied]
+
+        for connection, chunk in changed:
+            connection.send_control('UNSUBSCRIBE', chunk)
+        for connection in emptied:
+            connection.stop()
+        return removed
+
+    def stop(self) -> None:
+        with self._lock:
+            connections, self.connections = self.connections, []
+        for connection in connections:
+            connection.stop()
+
+    def get_stats(self) -> Dict:
+        connections = [connection.get_stats() for connection in self.connections]
+        return {
+            'running': self.running,
+            'base_host': urlsplit(self.base_url).netloc,
+            'streams': sum(item['streams'] for item in connections),
+            'connections': connections,
+            'connected': sum(1 for item in connections if item['connected']),
+            'messages': sum(item['messages'] for item in connections),
+            'rate': round(sum(item['rate'] for item in connections), 2)
+        }
@@ -0,0 +1,175 @@
+"""
+MUM (CANDLE) OLUŞTURUCU 🕯️
+Tick akışından gerçek zaman dilimli OHLCV barları üretir (1s/1m/5m/15m/1h)
+"""
+
+from collections import deque
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# Zaman dilimi -> milisaniye
+TIMEFRAMES = {
+    '1s': 1_000,
+    '1m': 60_000,
+    '5m': 300_000,
+    '15m': 900_000,
+    '1h': 3_600_000,
+}
+
+# Zaman dilimi başına saklanacak kapanmış bar sayısı
+DEFAULT_MAX_BARS = {
+    '1s': 600,   # 10 dakika
+    '1m': 240,   # 4 saat
+    '5m': 288,   # 1 gün
+    '15m': 192,  # 2 gün
+    '1h': 168,   # 1 hafta
+}
+
+
+class Candle:
+    """Tek bir OHLCV barı"""
+
+    __slots__ = ('open_time', 'open', 'high', 'low', 'close', 'volume', 'trades')
+
+    def __init__(self, open_time: int, price: float, volume: float):
+        self.open_time = open_time
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+        self.trades = 1
+
+    def add(self, price: float, volume: float) -> None:
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+        self.trades += 1
+
+    def to_dict(self) -> Dict:
+        return {
+            'open_time': self.open_time,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume,
+            'trades': self.trades
+        }
+
+
+class CandleSeries:
+    """Tek zaman dilimi için sınırlı bar tamponu"""
+
+    def __init__(self, interval_ms: int, max_bars: int):
+        self.interval_ms = interval_ms
+        self.bars = deque(maxlen=max_bars)  # Kapanmış barlar (eskiden yeniye)
+        self.current = None  # Açık (henüz kapanmamış) bar
+
+    def update(self, price: float, volume: float, timestamp_ms: int) -> Optional[Candle]:
+        """Tick'i bara işle; bir bar kapandıysa onu döndür"""
+        open_time = timestamp_ms - timestamp_ms % self.interval_ms
+
+        if self.current is None:
+            self.current = Candle(open_time, price, volume)
+            return None
+
+        # Geç gelen tick'ler açık bara katılır (kapanmış barlar değişmez)
+        if open_time <= self.current.open_time:
+            self.current.add(price, volume)
+            return None
+
+        closed = self.current
+        self.bars.append(closed)
+        self.current = Candle(open_time, price, volume)
+        return closed
+
+    def close_before(self, timestamp_ms: int) -> Optional[float]:
+        """`timestamp_ms` anında veya öncesinde biten son barın kapanışı (yetersizse None)"""
+        bars = self.bars
+        if not bars or bars[0].open_time + self.interval_ms > timestamp_ms:
+            return None
+
+        # Barlar zaman sıralı: ikili arama
+        low, high = 0, len(bars) - 1
+        while low < high:
+            mid = (low + high + 1) // 2
+            if bars[mid].open_time + self.interval_ms <= timestamp_ms:
+                low = mid
+            else:
+                high = mid - 1
+
+        return bars[low].close
+
+    def arrays(self) -> Dict[str, np.ndarray]:
+        """Kapanmış barları sütun dizileri olarak döndür"""
+        n = len(self.bars)
+        return {
+            'open_time': np.fromiter((b.open_time for b in self.bars), dtype=np.int64, count=n),
+            'open': np.fromiter((b.open for b in self.bars), dtype=np.float64, count=n),
+            'high': np.fromiter((b.high for b in self.bars), dtype=np.float64, count=n),
+            'low': np.fromiter((b.low for b in self.bars), dtype=np.float64, count=n),
+            'close': np.fromiter((b.close for b in self.bars), dtype=np.float64, count=n),
+            'volume': np.fromiter((b.volume for b in self.bars), dtype=np.float64, count=n),
+        }
+
+    def __len__(self) -> int:
+        return len(self.bars)
+
+
+class CandleBuilder:
+    """Bir coin için tüm zaman dilimlerindeki barları tutar"""
+
+    def __init__(self, max_bars: Optional[Dict[str, int]] = None):
+        max_bars = {**DEFAULT_MAX_BARS, **(max_bars or {})}
+        self.series = {
+            timeframe: CandleSeries(interval, max_bars[timeframe])
+            for timeframe, interval in TIMEFRAMES.items()
+        }
+        self.last_price = None
+        self.last_timestamp = None
+
+    def update(self, price: float, volume: float, timestamp_ms: int) -> Dict[str, Candle]:
+        """Tick'i tüm zaman dilimlerine işle; kapanan barları {zaman dilimi: bar} olarak döndür"""
+        closed = {}
+        for timeframe, series in self.series.items():
+            candle = series.update(price, volume, timestamp_ms)
+            if candle is not None:
+                closed[timeframe] = candle
+
+        self.last_price = price
+        self.last_timestamp = timestamp_ms
+        return closed
+
+    def price_ago(self, lookback_ms: int) -> Optional[float]:
+        """
+        `lookback_ms` önceki fiyat - geçmişi kapsayan en ince zaman dilimi kullanılır
+        Hata payı seçilen zaman diliminin bir bar süresi kadardır
+        """
+        if self.last_timestamp is None:
+            return None
+
+        target = self.last_timestamp - lookback_ms
+        for series in self.series.values():
+            price = series.close_before(target)
+            if price is not None:
+                return price
+        return None
+
+    def change_percent(self, lookback_ms: int) -> float:
+        """Son `lookback_ms` içindeki fiyat değişimi (%)"""
+        past = self.price_ago(lookback_ms)
+        if not past:
+            return 0
+        return (self.last_price - past) / past * 100
+
+    def get_candles(self, timeframe: str, limit: Optional[int] = None, include_current: bool = True) -> List[Dict]:
+        """Barları sözlük listesi olarak döndür (grafik/API için)"""
+        series = self.series[timeframe]
+        bars = list(series.bars)
+        if include_current and series.current is not None:
+            bars.append(series.current)
+        if limit:
+            bars = bars[-limit:]
+        return [bar.to_dict() for bar in bars]
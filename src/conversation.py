@@ -5,6 +5,7 @@ Sohbet geçmişini burada saklıyoruz ve yönetiyoruz
 
 from config.settings import Settings
 from src.personality import Personality
+from src.token_budget import CHARS_PER_TOKEN, MESSAGE_OVERHEAD_TOKENS, estimate_tokens, context_budget, truncate_to_tokens
 
 class ConversationManager:
     """Sohbet geçmişini yönetir"""
@@ -13,21 +14,39 @@ class ConversationManager:
         """Yeni sohbet başlatır"""
         self.messages = []
         self.message_count = 0
+        self.token_counts = []  # Geçmiş mesajların (system hariç) önbelleklenmiş token sayıları
+        self.history_tokens = 0
+        self.token_budget = Settings.CONTEXT_MAX_PROMPT_TOKENS
+        self.dropped_messages = 0
+        self.summary = ""  # Düşen eski mesajların kümülatif özeti
+        self.summary_tokens = 0
+        self.summarized_messages = 0
+        self.evicted = []  # Özetlenmeyi bekleyen düşen mesajlar
+        self.summary_in_prompt = False  # Özet bütçeye sığdıysa prompt'a eklenir
         self._add_system_message()
     
     def _add_system_message(self):
         """Sistem mesajını ekler (yapay zekanın kişiliği)"""
+        # Zenginleştirme (öğrenme / piyasa bağlamı) her turda bu temel prompt'tan yeniden kurulur
+        self.base_system_prompt = Personality.get_system_prompt()
         self.messages.append({
             "role": "system",
-            "content": Personality.get_system_prompt()
+            "content": self.base_system_prompt
         })
     
-    def add_user_message(self, message):
-        """Kullanıcı mesajını ekler"""
+    def _append(self, role, content):
+        """Mesajı ekler ve token sayısını bir kez hesaplayıp saklar"""
         self.messages.append({
-            "role": "user",
-            "content": message
+            "role": role,
+            "content": content
         })
+        tokens = estimate_tokens(content)
+        self.token_counts.append(tokens)
+        self.history_tokens += tokens
+    
+    def add_user_message(self, message):
+        """Kullanıcı mesajını ekler"""
+        self._append("user", message)
         self.message_count += 1
         self._manage_context()
     
@@ -36,10 +55,7 @@ class ConversationManager:
         # Kimlik karışıklığı kontrolü
         message = self._fix_identity_confusion(message)
         
-        self.messages.append({
-            "role": "assistant",
-            "content": message
-        })
+        self._append("assistant", message)
         self._manage_context()
     
     def _fix_identity_confusion(self, message):
@@ -65,14 +81,119 @@ class ConversationManager:
         """
         Akıllı bağlam yönetimi
         - System prompt'u her zaman tutar
-        - Önemli mesajları önceliklendirir
-        - Context window'u optimize eder
+        - En fazla MAX_HISTORY mesaj ve token bütçesi kadar geçmiş tutar (en eskiler önce atılır)
+        - Son mesaja en az CONTEXT_MIN_MESSAGE_TOKENS yer ayrılır; yer yoksa önce özet prompt'tan
+          çıkarılır, sonra system prompt'un zenginleştirme kısmı sondan kısaltılır (temel prompt kalır)
+        - Tek başına bütçeyi aşan son mesaj (ör. yapıştırılmış dosya) kısaltılır
+        Token sayıları önbellekte olduğu için her çağrı sadece toplam üzerinden ilerler
         """
-        if len(self.messages) > Settings.MAX_HISTORY + 1:
-            # System prompt + en son N mesaj
-            system_msg = self.messages[0]
-            recent_messages = self.messages[-(Settings.MAX_HISTORY):]
-            self.messages = [system_msg] + recent_messages
+        latest = min(self.token_counts[-1], Settings.CONTEXT_MIN_MESSAGE_TOKENS) if self.token_counts else 0
+        
+        # System prompt her turda zenginleştirilebildiği için her seferinde yeniden sayılır
+        system_tokens = estimate_tokens(self.messages[0]['content'])
+        self.summary_in_prompt = bool(self.summary) and \
+            self.token_budget - system_tokens - self.summary_tokens >= latest
+        if self.token_budget - system_tokens < latest:
+            system_tokens = self._shrink_system_prompt(self.token_budget - latest)
+        
+        budget = self.token_budget - system_tokens - (self.summary_tokens if self.summary_in_prompt else 0)
+        
+        drop = max(len(self.token_counts) - Settings.MAX_HISTORY, 0)
+        remaining = self.history_tokens - sum(self.token_counts[:drop])
+        while remaining > budget and len(self.token_counts) - drop > 1:
+            remaining -= self.token_counts[drop]
+            drop += 1
+        
+        if drop:
+            self._drop_oldest(drop)
+        
+        if self.history_tokens > budget and self.token_counts:
+            last = self.messages[-1]
+            last['content'] = truncate_to_tokens(last['content'], max(budget, latest))
+            tokens = estimate_tokens(last['content'])
+            self.history_tokens += tokens - self.token_counts[-1]
+            self.token_counts[-1] = tokens
+    
+    def _shrink_system_prompt(self, tokens):
+        """Zenginleştirilmiş system prompt'u sondan ~`tokens` tokene kısaltır (temel prompt korunur)"""
+        content = self.messages[0]['content']
+        limit = max(len(self.base_system_prompt), (tokens - MESSAGE_OVERHEAD_TOKENS) * CHARS_PER_TOKEN)
+        if len(content) > limit:
+            self.messages[0]['content'] = content[:limit]
+        return estimate_tokens(self.messages[0]['content'])
+    
+    def _drop_oldest(self, count):
+        """System prompt'tan sonraki en eski `count` mesajı atar"""
+        self.history_tokens -= sum(self.token_counts[:count])
+        del self.token_counts[:count]
+        if Settings.SUMMARY_ENABLED:
+            self.evicted.extend(self.messages[1:count + 1])
+        del self.messages[1:count + 1]
+        self.dropped_messages += count
+    
+    def set_summary(self, summary, summarized_messages):
+        """Düşen mesajların özetini ayarlar (prompt'ta system mesajına eklenir)"""
+        self.summary = summary
+        self.summary_tokens = estimate_tokens(summary) if summary else 0
+        self.summarized_messages = summarized_messages
+    
+    def take_evicted(self):
+        """Özetlenecek düşen mesajları alır ve kuyruğu boşaltır"""
+        evicted, self.evicted = self.evicted, []
+        return evicted
+    
+    def restore_evicted(self, evicted):
+        """Özetleme başarısız olursa mesajları kuyruğun başına geri koyar"""
+        self.evicted[:0] = evicted
+    
+    def get_prompt_messages(self):
+        """API'ye gidecek mesajlar: özet bütçeye sığdıysa system mesajına eklenir (saklanan mesajlar değişmez)"""
+        if not self.summary_in_prompt:
+            return self.messages
+        system = {
+            "role": "system",
+            "content": f"{self.messages[0]['content']}\n\n📝 ÖNCEKİ KONUŞMANIN ÖZETİ:\n{self.summary}"
+        }
+        return [system] + self.messages[1:]
+    
+    def fit_to_model(self, model):
+        """Bütçeyi modelin bağlam penceresine göre ayarlar ve geçmişi sığdırır"""
+        self.token_budget = context_budget(model)
+        self._manage_context()
+    
+    def get_context_stats(self):
+        """Bağlam penceresinin token durumu"""
+        system_tokens = estimate_tokens(self.messages[0]['content'])
+        return {
+            "messages": len(self.token_counts),
+            "history_tokens": self.history_tokens,
+            "system_tokens": system_tokens,
+            "summary_tokens": self.summary_tokens,
+            "summary_in_prompt": self.summary_in_prompt,
+            "prompt_tokens": system_tokens + (self.summary_tokens if self.summary_in_prompt else 0) + self.history_tokens,
+            "token_budget": self.token_budget,
+            "dropped_messages": self.dropped_messages,
+            "summarized_messages": self.summarized_messages,
+            "pending_summary": len(self.evicted)
+        }
+    
+    def load_messages(self, old_messages):
+        """
+        Veritabanındaki eski mesajları tek adımda yükler (sohbet yeniden açıldığında)
+        Sadece son MAX_HISTORY mesaj tutulacağı için kimlik düzeltmesi de sadece onlara uygulanır
+        """
+        recent = [msg for msg in old_messages if msg['role'] in ('user', 'assistant')][-Settings.MAX_HISTORY:]
+        
+        self.messages = self.messages[:1]
+        self.token_counts = []
+        self.history_tokens = 0
+        for msg in recent:
+            content = self._fix_identity_confusion(msg['content']) if msg['role'] == 'assistant' else msg['content']
+            self._append(msg['role'], content)
+        self.message_count += sum(1 for msg in recent if msg['role'] == 'user')
+        self._manage_context()
+        # Yüklemede düşenler önceki oturumlarda zaten özetlendi
+        self.evicted = []
     
     def get_messages(self):
         """Tüm mesajları döndürür"""
@@ -82,6 +203,10 @@ class ConversationManager:
         """Sohbet geçmişini temizler"""
         self.messages = []
         self.message_count = 0
+        self.token_counts = []
+        self.history_tokens = 0
+        self.evicted = []
+        self.set_summary("", 0)
         self._add_system_message()
     
     def get_message_count(self):
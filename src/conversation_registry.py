@@ -0,0 +1,173 @@
+"""
+AKTİF SOHBET KAYDI 🗂️
+Bellekteki sohbetleri (ConversationManager + API handler) sınırlı tutar
+- LRU: en uzun süredir kullanılmayan sohbet önce çıkarılır
+- Boşta kalma süresi (idle TTL) dolan sohbetler çıkarılır
+- Toplam bellek bütçesi (mesaj içerikleri üzerinden tahmini) aşılınca LRU ile küçültülür
+Çıkarılan sohbet bir sonraki istekte veritabanından tembel (lazy) olarak yeniden yüklenir
+"""
+
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.conversation import ConversationManager
+
+# Mesaj başına sözlük/liste ek yükü (byte, yaklaşık)
+MESSAGE_OVERHEAD = 240
+
+
+def estimate_size(messages: List[Dict]) -> int:
+    """Mesaj listesinin yaklaşık bellek kullanımı (içerik metinleri + sözlük ek yükü)"""
+    return sum(sys.getsizeof(message['content']) + MESSAGE_OVERHEAD for message in messages)
+
+
+class ConversationRegistry:
+    """Thread-safe, sınırlı sohbet önbelleği"""
+
+    def __init__(self, loader: Callable[[int], List[Dict]], handler_factory: Callable,
+                 max_entries: int = 200, idle_ttl: float = 1800, memory_budget: int = 64 * 1024 * 1024,
+                 summary_loader: Optional[Callable[[int], Optional[Dict]]] = None):
+        if max_entries <= 0 or memory_budget <= 0:
+            raise ValueError("max_entries ve memory_budget pozitif olmalı")
+
+        self.loader = loader  # conv_id -> veritabanındaki mesajlar
+        self.handler_factory = handler_factory  # (provider, model) -> API handler
+        self.summary_loader = summary_loader  # conv_id -> kayıtlı özet (varsa)
+        self.max_entries = max_entries
+        self.idle_ttl = idle_ttl  # Saniye (None/0: kapalı)
+        self.memory_budget = memory_budget  # Byte
+
+        self._entries = OrderedDict()  # conv_id -> {'manager', 'handler', 'last_access', 'size'} (eskiden yeniye)
+        self._lock = threading.RLock()
+        self._bytes = 0
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'rehydrated_messages': 0,
+            'evicted_lru': 0,
+            'evicted_idle': 0,
+            'evicted_memory': 0
+        }
+
+    def get(self, conv_id: int, provider: str, model: Optional[str] = None) -> Tuple[ConversationManager, object]:
+        """
+        Sohbeti getir; bellekte yoksa veritabanından yükle
+        Provider/model değiştiyse sohbet korunur, sadece handler yenilenir
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._evict_idle(now)
+
+            entry = self._entries.get(conv_id)
+            if entry is not None:
+                self.stats['hits'] += 1
+                self._entries.move_to_end(conv_id)
+                entry['last_access'] = now
+
+                handler = entry['handler']
+                if provider != handler.provider or (model and model != handler.model):
+                    entry['handler'] = self.handler_factory(provider, model)
+                return entry['manager'], entry['handler']
+
+            self.stats['misses'] += 1
+
+        # Veritabanı okuması kilit dışında (diğer sohbetleri bekletmez)
+        manager = ConversationManager()
+        history = self.loader(conv_id)
+        manager.load_messages(history)
+        if self.summary_loader is not None:
+            saved = self.summary_loader(conv_id)
+            if saved:
+                manager.set_summary(saved['summary'], saved['summarized_messages'])
+        handler = self.handler_factory(provider, model)
+
+        with self._lock:
+            entry = self._entries.get(conv_id)
+            if entry is not None:
+                # Aynı sohbet paralel yüklendi: mevcut olanı kullan
+                self._entries.move_to_end(conv_id)
+                return entry['manager'], entry['handler']
+
+            self.stats['rehydrated_messages'] += len(history)
+            size = estimate_size(manager.get_messages())
+            self._entries[conv_id] = {'manager': manager, 'handler': handler, 'last_access': time.monotonic(), 'size': size}
+            self._bytes += size
+            self._enforce_limits()
+            return manager, handler
+
+    def touch(self, conv_id: int) -> None:
+        """Sohbete mesaj eklendikten sonra boyutu güncelle (bütçe aşılırsa LRU çıkarma)"""
+        with self._lock:
+            entry = self._entries.get(conv_id)
+            if entry is None:
+                return
+            size = estimate_size(entry['manager'].get_messages())
+            self._bytes += size - entry['size']
+            entry['size'] = size
+            entry['last_access'] = time.monotonic()
+            self._enforce_limits()
+
+    def remove(self, conv_id: int) -> bool:
+        with self._lock:
+            entry = self._entries.pop(conv_id, None)
+            if entry is None:
+                return False
+            self._bytes -= entry['size']
+            return True
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _drop_oldest(self, reason: str) -> None:
+        _, entry = self._entries.popitem(last=False)
+        self._bytes -= entry['size']
+        self.stats[reason] += 1
+
+    def _evict_idle(self, now: float) -> None:
+        """En eski erişimli olanlar başta olduğu için sadece baştan bakmak yeterli"""
+        if not self.idle_ttl:
+            return
+        while self._entries:
+            oldest = next(iter(self._entries.values()))
+            if now - oldest['last_access'] < self.idle_ttl:
+                break
+            self._drop_oldest('evicted_idle')
+
+    def _enforce_limits(self) -> None:
+        while len(self._entries) > self.max_entries:
+            self._drop_oldest('evicted_lru')
+        # En son kullanılan sohbet bütçeyi tek başına aşsa da tutulur
+        while self._bytes > self.memory_budget and len(self._entries) > 1:
+            self._drop_oldest('evicted_memory')
+
+    def sweep(self) -> int:
+        """Boşta kalanları çıkar (periyodik çağrı için); çıkarılan sayısı"""
+        with self._lock:
+            before = len(self._entries)
+            self._evict_idle(time.monotonic())
+            return before - len(self._entries)
+
+    def __contains__(self, conv_id: int) -> bool:
+        return conv_id in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'bytes': self._bytes,
+                'memory_budget': self.memory_budget,
+                'memory_percent': round(self._bytes / self.memory_budget * 100, 2),
+                'idle_ttl': self.idle_ttl,
+                'hit_rate': round(self.stats['hits'] / lookups * 100, 1) if lookups else 0
+            }
@@ -0,0 +1,169 @@
+"""
+SOHBET ÖZETLEYİCİ 📝
+Bağlam penceresinden düşen eski mesajları ucuz bir model çağrısıyla kümülatif özete katar
+- Cevap akışı bittikten sonra arka planda çalışır (ilk token gecikmesini etkilemez)
+- Sonuç sohbetin bir sonraki isteğinde istek thread'inde uygulanır (ConversationManager tek thread'den değişir)
+- Özet veritabanında sohbetle birlikte saklanır, sohbet yeniden açılınca geri yüklenir
+- Özet system prompt'a eklenir: uzun sohbetler tutarlı kalır, her turda giden prompt küçük kalır
+"""
+
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+# Özetlenen mesaj başına en fazla karakter (çok uzun yapıştırmalar özeti pahalılaştırmasın)
+MESSAGE_CHAR_LIMIT = 1500
+
+SUMMARY_SYSTEM_PROMPT = (
+    "Sen bir sohbet özetleyicisisin. Kullanıcı ile asistan arasındaki sohbetin kalıcı özetini tutuyorsun. "
+    "Önemli bilgileri, kullanıcının tercihlerini, verilen kararları ve açık kalan konuları koru; "
+    "selamlaşma ve tekrarları at. Sadece özeti yaz."
+)
+
+
+def build_summary_prompt(previous: str, messages: List[Dict], max_chars: int) -> List[Dict]:
+    """Önceki özet + yeni düşen mesajlardan özetleme isteği"""
+    lines = []
+    for msg in messages:
+        speaker = "Kullanıcı" if msg['role'] == 'user' else "Asistan"
+        content = msg['content']
+        if len(content) > MESSAGE_CHAR_LIMIT:
+            content = content[:MESSAGE_CHAR_LIMIT] + " [...]"
+        lines.append(f"{speaker}: {content}")
+
+    prompt = (
+        f"Mevcut özet:\n{previous or '(yok)'}\n\n"
+        f"Özete eklenecek yeni mesajlar:\n" + "\n\n".join(lines) + "\n\n"
+        f"Güncel özeti yaz ({max_chars} karakteri geçmesin)."
+    )
+    return [
+        {"role": "system", "content": SUMMARY_SYSTEM_PROMPT},
+        {"role": "user", "content": prompt}
+    ]
+
+
+class ConversationSummarizer:
+    """
+    Düşen mesajları sohbet başına sırayla, tek arka plan thread'inde özetler
+    Arka plan thread'i ConversationManager'a dokunmaz: sonuç bekletilir ve sohbetin bir
+    sonraki isteğinde (istek thread'inde) `apply` ile uygulanır. Sonuç sadece sohbetin özeti
+    hala hesaplamaya başlanan özetse uygulanır (bellekten çıkıp aynı özetle yeniden yüklenen
+    sohbet dahil); özet bu arada değiştiyse sonuç atılır, düşen mesajlar iki kez sayılmaz
+    """
+
+    # Uygulanmayı bekleyen en fazla sonuç (hiç geri dönülmeyen sohbetler birikmesin)
+    MAX_PENDING_RESULTS = 1000
+
+    def __init__(self, db, handler_factory: Callable, min_messages: int = 4, max_chars: int = 2000):
+        self.db = db
+        self.handler_factory = handler_factory  # () -> get_response(messages) sağlayan handler
+        self.min_messages = min_messages  # Bu kadar mesaj birikmeden model çağrılmaz
+        self.max_chars = max_chars
+
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='summarizer')
+        self._lock = threading.Lock()
+        self._running = set()  # Özeti hesaplanan veya sonucu uygulanmayı bekleyen sohbetler
+        self._results = {}  # conv_id -> tamamlanan iş (uygulanmayı bekler)
+        self._forgotten = set()  # İşi sürerken silinen sohbetler (sonuçları saklanmaz)
+        self.stats = {'scheduled': 0, 'completed': 0, 'failed': 0, 'applied': 0, 'discarded': 0,
+                      'summarized_messages': 0}
+
+    def schedule(self, conv_id: int, conv_manager) -> bool:
+        """İstek thread'inden: bekleyen sonucu uygula, yeterli düşen mesaj biriktiyse yenisini kuyruğa ekle"""
+        self.apply(conv_id, conv_manager)
+
+        with self._lock:
+            if conv_id in self._running or len(conv_manager.evicted) < self.min_messages:
+                return False
+            self._running.add(conv_id)
+            self.stats['scheduled'] += 1
+
+        job = {
+            'manager': weakref.ref(conv_manager),
+            'base_summary': conv_manager.summary,
+            'base_count': conv_manager.summarized_messages,
+            'evicted': conv_manager.take_evicted()
+        }
+        self._executor.submit(self._summarize, conv_id, job)
+        return True
+
+    def _summarize(self, conv_id: int, job: Dict) -> None:
+        """Arka plan thread'i: sadece model çağrısı; sonuç `apply` için saklanır"""
+        with self._lock:
+            if self._drop_forgotten(conv_id):
+                return  # Sıradayken silindi: model çağrılmaz
+
+        try:
+            messages = build_summary_prompt(job['base_summary'], job['evicted'], self.max_chars)
+            summary = self.handler_factory().get_response(messages)
+            if not summary or summary.startswith("❌"):
+                raise RuntimeError(summary or "boş yanıt")
+            job['summary'] = summary.strip()[:self.max_chars]
+            self.stats['completed'] += 1
+        except Exception as e:
+            job['summary'] = None
+            self.stats['failed'] += 1
+            print(f"❌ Sohbet özeti hatası (#{conv_id}): {e}")
+
+        with self._lock:
+            if self._drop_forgotten(conv_id):
+                return
+            if len(self._results) >= self.MAX_PENDING_RESULTS:
+                stale = next(iter(self._results))
+                del self._results[stale]
+                self._running.discard(stale)
+            self._results[conv_id] = job
+
+    def apply(self, conv_id: int, conv_manager) -> bool:
+        """İstek thread'inden: tamamlanan özeti sohbete uygula ve kaydet; uygulandıysa True"""
+        with self._lock:
+            job = self._results.pop(conv_id, None)
+            if job is None:
+                return False
+            self._running.discard(conv_id)
+
+        # Özetlemeye başlanan özet hala geçerli mi? (Yeniden yüklenen sohbet de veritabanındaki
+        # aynı özetle başlar; özet değiştiyse bu mesajlar zaten başka bir sonuca katılmıştır)
+        current = conv_manager.summary == job['base_summary']
+
+        if job['summary'] is None:
+            # Başarısız: mesajlar kaybolmasın, aynı sohbet nesnesinde bir sonraki turda yeniden denenir
+            if current and job['manager']() is conv_manager:
+                conv_manager.restore_evicted(job['evicted'])
+            return False
+
+        if not current:
+            self.stats['discarded'] += 1
+            return False
+
+        summarized = job['base_count'] + len(job['evicted'])
+        conv_manager.set_summary(job['summary'], summarized)
+        self.db.save_summary(conv_id, job['summary'], summarized)
+        self.stats['applied'] += 1
+        self.stats['summarized_messages'] += len(job['evicted'])
+        return True
+
+    def _drop_forgotten(self, conv_id: int) -> bool:
+        """Kilit altında çağrılır. Sohbet işi sürerken silindiyse işi bitmiş say; silindiyse True"""
+        if conv_id not in self._forgotten:
+            return False
+        self._forgotten.discard(conv_id)
+        self._running.discard(conv_id)
+        self.stats['discarded'] += 1
+        return True
+
+    def forget(self, conv_id: int) -> None:
+        """Sohbet silindiğinde bekleyen sonucu at; iş sürüyorsa sonucu saklanmaz"""
+        with self._lock:
+            if self._results.pop(conv_id, None) is not None:
+                self._running.discard(conv_id)
+            elif conv_id in self._running:
+                self._forgotten.add(conv_id)
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False)
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            return {**self.stats, 'running': len(self._running) - len(self._results), 'pending_results': len(self._results)}
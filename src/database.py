@@ -47,6 +47,23 @@ class Database:
             )
         """)
         
+        # Sohbet özetleri (bağlamdan düşen eski mesajların kümülatif özeti)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS conversation_summaries (
+                conversation_id INTEGER PRIMARY KEY,
+                summary TEXT NOT NULL,
+                summarized_messages INTEGER NOT NULL DEFAULT 0,
+                updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (conversation_id) REFERENCES conversations(id)
+            )
+        """)
+        
+        # Sohbetin son mesajlarını hızlı bulmak için
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_messages_conversation 
+            ON messages (conversation_id, id)
+        """)
+        
         conn.commit()
         conn.close()
     
@@ -102,6 +119,65 @@ class Database:
             for m in messages
         ]
     
+    def get_recent_messages(self, conversation_id, limit):
+        """
+        Bir sohbetin son `limit` kullanıcı/asistan mesajını getirir (eskiden yeniye)
+        Sohbet yeniden açılırken tüm geçmiş yerine sadece bağlam penceresi okunur
+        """
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT role, content, created_at 
+            FROM messages 
+            WHERE conversation_id = ? AND role IN ('user', 'assistant') 
+            ORDER BY id DESC 
+            LIMIT ?
+        """, (conversation_id, limit))
+        messages = cursor.fetchall()
+        conn.close()
+        return [
+            {
+                "role": m[0],
+                "content": m[1],
+                "created_at": m[2]
+            }
+            for m in reversed(messages)
+        ]
+    
+    def get_summary(self, conversation_id):
+        """Sohbet özetini getirir (yoksa None)"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            SELECT summary, summarized_messages, updated_at 
+            FROM conversation_summaries 
+            WHERE conversation_id = ?
+        """, (conversation_id,))
+        row = cursor.fetchone()
+        conn.close()
+        if row is None:
+            return None
+        return {
+            "summary": row[0],
+            "summarized_messages": row[1],
+            "updated_at": row[2]
+        }
+    
+    def save_summary(self, conversation_id, summary, summarized_messages):
+        """Sohbet özetini kaydeder (varsa günceller)"""
+        conn = self._get_connection()
+        cursor = conn.cursor()
+        cursor.execute("""
+            INSERT INTO conversation_summaries (conversation_id, summary, summarized_messages) 
+            VALUES (?, ?, ?) 
+            ON CONFLICT(conversation_id) DO UPDATE SET 
+                summary = excluded.summary, 
+                summarized_messages = excluded.summarized_messages, 
+                updated_at = CURRENT_TIMESTAMP
+        """, (conversation_id, summary, summarized_messages))
+        conn.commit()
+        conn.close()
+    
     def save_message(self, conversation_id, role, content):
         """Mesaj kaydeder"""
         conn = self._get_connection()
@@ -126,6 +202,7 @@ class Database:
         conn = self._get_connection()
         cursor = conn.cursor()
         cursor.execute("DELETE FROM messages WHERE conversation_id = ?", (conversation_id,))
+        cursor.execute("DELETE FROM conversation_summaries WHERE conversation_id = ?", (conversation_id,))
         cursor.execute("DELETE FROM conversations WHERE id = ?", (conversation_id,))
         conn.commit()
         conn.close()
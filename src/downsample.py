@@ -0,0 +1,77 @@
+"""
+GRAFİK SEYRELTME (DOWNSAMPLING) 📉
+Uzun fiyat serilerini grafiğin görsel şeklini koruyarak sabit nokta sayısına indirir
+- lttb:   Largest-Triangle-Three-Buckets (kova başına en büyük üçgen alanını veren nokta)
+- minmax: kova başına en düşük ve en yüksek nokta (tepe/dipler kesin korunur)
+İkisi de ilk ve son noktayı korur ve seçilen orijinal indeksleri (artan sırada) döndürür
+"""
+
+import numpy as np
+
+METHODS = ('lttb', 'minmax')
+
+
+def lttb(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """Largest-Triangle-Three-Buckets ile seçilen indeksler"""
+    n = len(x)
+    if points >= n or points < 3:
+        return np.arange(n) if points >= n else np.array([0, n - 1][:max(points, 0)], dtype=np.int64)
+
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+
+    # İlk ve son nokta hariç (points - 2) kova; kova sınırları ve ortalamaları tek seferde
+    edges = (np.arange(points - 1) * ((n - 2) / (points - 2))).astype(np.int64) + 1
+    edges[-1] = n - 1
+    sizes = np.diff(edges)
+    avg_x = np.add.reduceat(x[:n - 1], edges[:-1]) / sizes
+    avg_y = np.add.reduceat(y[:n - 1], edges[:-1]) / sizes
+    # Son kovanın "sonraki kova ortalaması" son noktadır
+    avg_x = np.append(avg_x, x[-1])
+    avg_y = np.append(avg_y, y[-1])
+
+    selected = np.empty(points, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    a = 0
+    for bucket in range(points - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        ax, ay = x[a], y[a]
+        cx, cy = avg_x[bucket + 1], avg_y[bucket + 1]
+        # Üçgen alanının iki katı (sabit çarpan seçimi değiştirmez)
+        area = np.abs((ax - cx) * (y[start:end] - ay) - (ax - x[start:end]) * (cy - ay))
+        a = start + int(np.argmax(area))
+        selected[bucket + 1] = a
+
+    return selected
+
+
+def minmax(x: np.ndarray, y: np.ndarray, points: int) -> np.ndarray:
+    """Kova başına en düşük ve en yüksek noktanın indeksleri (en fazla `points` nokta)"""
+    n = len(x)
+    if points >= n or points < 4:
+        return np.arange(n) if points >= n else np.array([0, n - 1][:max(points, 0)], dtype=np.int64)
+
+    y = np.asarray(y, dtype=np.float64)
+
+    # İlk ve son nokta ayrı; aradaki noktalar (points - 2) // 2 ardışık kovaya, her kovadan 2 nokta
+    buckets = (points - 2) // 2
+    edges = (np.arange(buckets + 1) * ((n - 2) / buckets)).astype(np.int64) + 1
+    edges[-1] = n - 1
+
+    selected = [0]
+    for start, end in zip(edges[:-1].tolist(), edges[1:].tolist()):
+        window = y[start:end]
+        low, high = start + int(np.argmin(window)), start + int(np.argmax(window))
+        selected.extend((low, high) if low <= high else (high, low))
+    selected.append(n - 1)
+
+    return np.unique(np.array(selected, dtype=np.int64))
+
+
+def downsample(x: np.ndarray, y: np.ndarray, points: int, method: str = 'lttb') -> np.ndarray:
+    """Yönteme göre seçilen indeksler"""
+    if method == 'lttb':
+        return lttb(x, y, points)
+    if method == 'minmax':
+        return minmax(x, y, points)
+    raise ValueError(f"Geçersiz yöntem: {method} (desteklenen: {', '.join(METHODS)})")
@@ -0,0 +1,347 @@
+"""
+SAHTE BINANCE STREAM SUNUCUSU 🧪🔌
+Bağlantı yöneticisini internetsiz denemek için yerel WebSocket sunucusu (sadece standart kütüphane)
+- /stream?streams=a@trade/b@trade combined-stream URL'si
+- SUBSCRIBE / UNSUBSCRIBE / LIST_SUBSCRIPTIONS kontrol mesajları
+- Abone olunan her stream için sabit hızda sentetik trade (@trade) ve defter diff'i (@depth)
+- GET /api/v3/depth?symbol=&limit= REST snapshot'ı (diff'lerle tutarlı güncelleme numaraları)
+- drop_connections() ile tüm bağlantıları kopararak yeniden bağlanma denemesi
+
+Kullanım:
+    python -m src.fake_binance_server --port 9001 --rate 20
+    BINANCE_STREAM_URL=ws://127.0.0.1:9001/stream BINANCE_REST_URL=http://127.0.0.1:9001 python app.py
+"""
+
+import argparse
+import base64
+import hashlib
+import json
+import random
+import select
+import socket
+import struct
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import parse_qs, urlsplit
+
+_WS_GUID = '258EAFA5-E914-47DA-95CA-C5AB0DC85B11'
+
+OP_TEXT, OP_CLOSE, OP_PING, OP_PONG = 0x1, 0x8, 0x9, 0xA
+
+
+def _encode_frame(opcode: int, payload: bytes) -> bytes:
+    """Sunucu çerçevesi (maskesiz, FIN)"""
+    length = len(payload)
+    if length < 126:
+        header = struct.pack('!BB', 0x80 | opcode, length)
+    elif length < 1 << 16:
+        header = struct.pack('!BBH', 0x80 | opcode, 126, length)
+    else:
+        header = struct.pack('!BBQ', 0x80 | opcode, 127, length)
+    return header + payload
+
+
+def _recv_exact(sock: socket.socket, count: int) -> bytes:
+    data = b''
+    while len(data) < count:
+        chunk = sock.recv(count - len(data))
+        if not chunk:
+            raise ConnectionError("bağlantı kapandı")
+        data += chunk
+    return data
+
+
+def _read_frame(sock: socket.socket):
+    """İstemci çerçevesini oku -> (opcode, payload)"""
+    first, second = _recv_exact(sock, 2)
+    opcode = first & 0x0F
+    length = second & 0x7F
+    if length == 126:
+        length = struct.unpack('!H', _recv_exact(sock, 2))[0]
+    elif length == 127:
+        length = struct.unpack('!Q', _recv_exact(sock, 8))[0]
+
+    mask = _recv_exact(sock, 4) if second & 0x80 else None
+    payload = _recv_exact(sock, length)
+    if mask:
+        payload = bytes(byte ^ mask[i % 4] for i, byte in enumerate(payload))
+    return opcode, payload
+
+
+class FakeBinanceServer:
+    """Sentetik trade ve defter diff'i yayınlayan yerel combined-stream sunucusu"""
+
+    def __init__(self, host: str = '127.0.0.1', port: int = 0, rate_hz: float = 10.0, max_streams: int = 1024):
+        self.host = host
+        self.port = port
+        self.interval = 1 / rate_hz  # Stream başına trade aralığı
+        self.max_streams = max_streams
+
+        self.running = False
+        self._server = None
+        self._clients = {}  # socket -> abone olunan stream kümesi
+        self._lock = threading.Lock()
+        self._prices = {}
+        self._trade_id = 0
+        self._books = {}  # Coin -> {'bids': {fiyat: miktar}, 'asks': {...}, 'update_id': int}
+        self.stats = {'connections': 0, 'control_messages': 0, 'trades_sent': 0, 'depth_sent': 0,
+                      'snapshots': 0, 'drops': 0}
+
+    @property
+    def url(self) -> str:
+        return f"ws://{self.host}:{self.port}/stream"
+
+    def start(self) -> 'FakeBinanceServer':
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((self.host, self.port))
+        self._server.listen()
+        self.port = self._server.getsockname()[1]
+        self.running = True
+        threading.Thread(target=self._accept_loop, name='fake-binance', daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.running = False
+        self.drop_connections()
+        if self._server is not None:
+            self._server.close()
+
+    def drop_connections(self) -> int:
+        """Tüm istemci bağlantılarını kapanış çerçevesi göndermeden kopar"""
+        with self._lock:
+            clients = list(self._clients)
+            self._clients.clear()
+        for client in clients:
+            try:
+                client.shutdown(socket.SHUT_RDWR)
+            except OSError:
+                pass
+            client.close()
+        self.stats['drops'] += len(clients)
+        return len(clients)
+
+    def subscriptions(self) -> Dict[int, set]:
+        with self._lock:
+            return {client.fileno(): set(streams) for client, streams in self._clients.items()}
+
+    # ─────────────────────────── Bağlantı ───────────────────────────
+
+    def _accept_loop(self) -> None:
+        while self.running:
+            try:
+                client, _ = self._server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._serve, args=(client,), daemon=True).start()
+
+    def _handshake(self, client: socket.socket) -> Optional[set]:
+        request = b''
+        while b'\r\n\r\n' not in request:
+            chunk = client.recv(4096)
+            if not chunk:
+                return None
+            request += chunk
+
+        lines = request.decode('latin-1').split('\r\n')
+        path = lines[0].split(' ')[1]
+        headers = {}
+        for line in lines[1:]:
+            if ':' in line:
+                key, value = line.split(':', 1)
+                headers[key.strip().lower()] = value.strip()
+
+        query = parse_qs(urlsplit(path).query)
+        if 'upgrade' not in headers:
+            self._serve_rest(client, urlsplit(path).path, query)
+            return None
+
+        streams = {stream for value in query.get('streams', []) for stream in value.split('/') if stream}
+        if len(streams) > self.max_streams:
+            client.sendall(b'HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n')
+            return None
+
+        accept = base64.b64encode(hashlib.sha1((headers['sec-websocket-key'] + _WS_GUID).encode()).digest())
+        client.sendall(
+            b'HTTP/1.1 101 Switching Protocols\r\n'
+            b'Upgrade: websocket\r\nConnection: Upgrade\r\n'
+            b'Sec-WebSocket-Accept: ' + accept + b'\r\n\r\n'
+        )
+        return streams
+
+    def _serve(self, client: socket.socket) -> None:
+        try:
+            streams = self._handshake(client)
+        except (OSError, KeyError, IndexError):
+            streams = None
+        if streams is None:
+            client.close()
+            return
+
+        with self._lock:
+            self._clients[client] = streams
+        self.stats['connections'] += 1
+
+        next_send = time.monotonic()
+        try:
+            while self.running and client in self._clients:
+                timeout = max(next_send - time.monotonic(), 0)
+                readable, _, _ = select.select([client], [], [], timeout)
+                if readable and not self._handle_frame(client):
+                    break
+                if time.monotonic() >= next_send:
+                    self._send_trades(client)
+                    next_send += self.interval
+        except (OSError, ConnectionError, ValueError):
+            pass
+        finally:
+            with self._lock:
+                self._clients.pop(client, None)
+            client.close()
+
+    def _handle_frame(self, client: socket.socket) -> bool:
+        opcode, payload = _read_frame(client)
+        if opcode == OP_CLOSE:
+            client.sendall(_encode_frame(OP_CLOSE, payload[:2]))
+            return False
+        if opcode == OP_PING:
+            client.sendall(_encode_frame(OP_PONG, payload))
+        elif opcode == OP_TEXT:
+            self._handle_control(client, json.loads(payload))
+        return True
+
+    def _handle_control(self, client: socket.socket, request: Dict) -> None:
+        self.stats['control_messages'] += 1
+        method = request.get('method')
+        params = request.get('params') or []
+        result = None
+
+        with self._lock:
+            streams = self._clients.get(client)
+            if streams is None:
+                return
+            if method == 'SUBSCRIBE':
+                streams.update(params)
+            elif method == 'UNSUBSCRIBE':
+                streams.difference_update(params)
+            elif method == 'LIST_SUBSCRIPTIONS':
+                result = sorted(streams)
+
+        client.sendall(_encode_frame(OP_TEXT, json.dumps({'result': result, 'id': request.get('id')}).encode()))
+
+    # ─────────────────────────── Sentetik trade ───────────────────────────
+
+    def _trade(self, stream: str) -> bytes:
+        symbol = stream.split('@', 1)[0].upper()
+        price = self._prices.get(symbol, 100.0) * (1 + random.gauss(0, 0.0005))
+        self._prices[symbol] = price
+        self._trade_id += 1
+        now = int(time.time() * 1000)
+        return json.dumps({
+            'stream': stream,
+            'data': {
+                'e': 'trade', 'E': now, 's': symbol, 't': self._trade_id,
+                'p': f'{price:.8f}', 'q': f'{random.uniform(0.001, 2):.8f}',
+                'T': now, 'm': random.random() < 0.5, 'M': True
+            }
+        }, separators=(',', ':')).encode()
+
+    def _book(self, symbol: str) -> Dict:
+        book = self._books.get(symbol)
+        if book is None:
+            mid = self._prices.get(symbol, 100.0)
+            book = self._books[symbol] = {
+                'bids': {round(mid - 0.01 * i, 2): round(random.uniform(0.1, 5), 4) for i in range(1, 51)},
+                'asks': {round(mid + 0.01 * i, 2): round(random.uniform(0.1, 5), 4) for i in range(1, 51)},
+                'update_id': 1000
+            }
+        return book
+
+    def _depth(self, stream: str) -> bytes:
+        """Birkaç seviyeyi değiştiren diff olayı (miktar 0 = seviye silindi)"""
+        symbol = stream.split('@', 1)[0].upper()
+        with self._lock:
+            book = self._book(symbol)
+            changes = {'b': [], 'a': []}
+            for side, key in (('bids', 'b'), ('asks', 'a')):
+                levels = book[side]
+                for _ in range(random.randint(1, 3)):
+                    price = random.choice(list(levels))
+                    quantity = 0.0 if random.random() < 0.2 and len(levels) > 10 else round(random.uniform(0.1, 5), 4)
+                    if quantity == 0:
+                        del levels[price]
+                    else:
+                        levels[price] = quantity
+                    changes[key].append([f'{price:.8f}', f'{quantity:.8f}'])
+
+            first_id = book['update_id'] + 1
+            book['update_id'] += len(changes['b']) + len(changes['a'])
+            last_id = book['update_id']
+
+        now = int(time.time() * 1000)
+        return json.dumps({
+            'stream': stream,
+            'data': {'e': 'depthUpdate', 'E': now, 's': symbol, 'U': first_id, 'u': last_id, **changes}
+        }, separators=(',', ':')).encode()
+
+    def _serve_rest(self, client: socket.socket, path: str, query: Dict) -> None:
+        if path != '/api/v3/depth' or 'symbol' not in query:
+            client.sendall(b'HTTP/1.1 404 Not Found\r\nContent-Length: 0\r\n\r\n')
+            client.close()
+            return
+
+        symbol = query['symbol'][0].upper()
+        limit = int(query.get('limit', ['100'])[0])
+        with self._lock:
+            book = self._book(symbol)
+            body = json.dumps({
+                'lastUpdateId': book['update_id'],
+                'bids': [[f'{p:.8f}', f'{q:.8f}'] for p, q in sorted(book['bids'].items(), reverse=True)[:limit]],
+                'asks': [[f'{p:.8f}', f'{q:.8f}'] for p, q in sorted(book['asks'].items())[:limit]]
+            }).encode()
+        self.stats['snapshots'] += 1
+
+        client.sendall(
+            b'HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n'
+            b'Content-Length: ' + str(len(body)).encode() + b'\r\nConnection: close\r\n\r\n' + body
+        )
+        client.close()
+
+    def _send_trades(self, client: socket.socket) -> None:
+        with self._lock:
+            streams = sorted(self._clients.get(client, ()))
+        frames = []
+        for stream in streams:
+            if stream.endswith('@trade'):
+                frames.append(_encode_frame(OP_TEXT, self._trade(stream)))
+                self.stats['trades_sent'] += 1
+            elif '@depth' in stream:
+                frames.append(_encode_frame(OP_TEXT, self._depth(stream)))
+                self.stats['depth_sent'] += 1
+        if frames:
+            client.sendall(b''.join(frames))
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description='Sahte Binance combined-stream sunucusu')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9001)
+    parser.add_argument('--rate', type=float, default=10.0, help='Stream başına saniyede trade')
+    parser.add_argument('--drop-every', type=float, default=0, help='Bu kadar saniyede bir bağlantıları kopar (0 = kapalı)')
+    args = parser.parse_args(argv)
+
+    server = FakeBinanceServer(args.host, args.port, rate_hz=args.rate).start()
+    print(f"🧪 Sahte Binance sunucusu: {server.url}")
+
+    try:
+        while True:
+            time.sleep(args.drop_every or 1)
+            if args.drop_every:
+                print(f"✂️ {server.drop_connections()} bağlantı koparıldı")
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
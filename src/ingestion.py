@@ -0,0 +1,131 @@
+"""
+VERİ ALIM HATTI (INGESTION PIPELINE) 📥
+WebSocket alımını işlemden ayırır: alım thread'i ham mesajı sınırlı kuyruğa atar,
+ayrı bir tüketici thread'i kuyruğu toplu (batch) halinde boşaltıp işler
+Kuyruk dolarsa en eski mesajlar düşürülür (en güncel veri korunur)
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Tuple
+
+# (alım zamanı - monotonic, ham mesaj)
+QueuedMessage = Tuple[float, Any]
+
+
+class IngestionPipeline:
+    """Sınırlı kuyruk + toplu tüketici"""
+
+    def __init__(self, handler: Callable[[List[QueuedMessage]], None],
+                 maxsize: int = 20_000, batch_size: int = 500, name: str = 'ingestion'):
+        if maxsize <= 0 or batch_size <= 0:
+            raise ValueError("maxsize ve batch_size pozitif olmalı")
+
+        self.handler = handler  # Toplu işleyici: list[(alım zamanı, mesaj)]
+        self.maxsize = maxsize
+        self.batch_size = batch_size
+        self.name = name
+
+        self._queue = deque()
+        self._condition = threading.Condition()
+        self._thread = None
+        self.running = False
+
+        self.stats = {
+            'received': 0,
+            'processed': 0,
+            'dropped': 0,
+            'batches': 0,
+            'errors': 0,
+            'max_depth': 0,
+            'last_lag_ms': 0.0,
+            'max_lag_ms': 0.0,
+            'processing_ms': 0.0
+        }
+
+    def start(self) -> None:
+        """Tüketici thread'ini başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        if self.running:
+            return
+        self.running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    def stop(self, drain: bool = True) -> None:
+        """Tüketiciyi durdur (drain: kuyrukta kalanlar işlenir)"""
+        with self._condition:
+            self.running = False
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+        if drain:
+            while self._queue:
+                self._process(self._take_batch())
+
+    def submit(self, message: Any) -> None:
+        """Mesajı kuyruğa ekle (alım thread'inden çağrılır, bloklamaz)"""
+        with self._condition:
+            if len(self._queue) >= self.maxsize:
+                self._queue.popleft()
+                self.stats['dropped'] += 1
+
+            self._queue.append((time.monotonic(), message))
+            self.stats['received'] += 1
+
+            depth = len(self._queue)
+            if depth > self.stats['max_depth']:
+                self.stats['max_depth'] = depth
+            self._condition.notify()
+
+    def _take_batch(self) -> List[QueuedMessage]:
+        with self._condition:
+            count = min(len(self._queue), self.batch_size)
+            return [self._queue.popleft() for _ in range(count)]
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self.running and not self._queue:
+                    self._condition.wait(timeout=1.0)
+                if not self.running:
+                    return
+            self._process(self._take_batch())
+
+    def _process(self, batch: List[QueuedMessage]) -> None:
+        if not batch:
+            return
+
+        started = time.monotonic()
+        try:
+            self.handler(batch)
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"❌ Veri alım hattı hatası ({self.name}): {e}")
+
+        finished = time.monotonic()
+        # Gecikme: en eski mesajın kuyruğa girişinden işlenmesinin bitişine kadar
+        lag_ms = (finished - batch[0][0]) * 1000
+
+        self.stats['processed'] += len(batch)
+        self.stats['batches'] += 1
+        self.stats['processing_ms'] += (finished - started) * 1000
+        self.stats['last_lag_ms'] = lag_ms
+        if lag_ms > self.stats['max_lag_ms']:
+            self.stats['max_lag_ms'] = lag_ms
+
+    def get_stats(self) -> Dict:
+        batches = self.stats['batches']
+        return {
+            **self.stats,
+            'running': self.running,
+            'depth': len(self._queue),
+            'capacity': self.maxsize,
+            'batch_size': self.batch_size,
+            'avg_batch': round(self.stats['processed'] / batches, 1) if batches else 0,
+            'avg_batch_ms': round(self.stats['processing_ms'] / batches, 3) if batches else 0,
+            'last_lag_ms': round(self.stats['last_lag_ms'], 3),
+            'max_lag_ms': round(self.stats['max_lag_ms'], 3),
+            'processing_ms': round(self.stats['processing_ms'], 3)
+        }
@@ -0,0 +1,312 @@
+"""
+PİYASA GENELİ ANALİTİĞİ 🌐📊
+Tüm coinlerin zaman kovalarına (bucket) hizalanmış log getirilerini tutar ve
+kayan pencerede korelasyon matrisi, BTC betası ve piyasa genişliği (breadth) üretir
+
+Her kova kapanışında toplamlar artımlı güncellenir (Σr, Σr·rᵀ, çift gözlem sayısı) - O(N²)
+sorgu başına değil kova başına bir kez; sorgu bu toplamlardan okunur
+Sayısal kaymayı önlemek için toplamlar her `window` kovada bir halka tampondan yeniden kurulur
+"""
+
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+# Ortalama korelasyona göre hareket türü
+BROAD_CORRELATION = 0.6
+IDIOSYNCRATIC_CORRELATION = 0.3
+
+
+class MarketAnalytics:
+    """Hizalı kova getirileri üzerinde kayan korelasyon / beta / genişlik"""
+
+    def __init__(self, bucket_ms: int = 5_000, window: int = 360, benchmark: str = 'BTCUSDT',
+                 min_periods: int = 30, capacity: int = 32):
+        if bucket_ms <= 0 or window <= 1:
+            raise ValueError("bucket_ms pozitif, window 1'den büyük olmalı")
+
+        self.bucket_ms = bucket_ms
+        self.window = window  # Kova sayısı (5 sn x 360 = 30 dk)
+        self.benchmark = benchmark
+        self.min_periods = min(min_periods, window)  # Korelasyon için gereken ortak gözlem
+
+        self._lock = threading.Lock()
+        self._columns = {}  # Coin -> sütun
+        self._bucket = None  # Açık kovanın numarası (epoch-ms // bucket_ms)
+        self._allocate(capacity)
+        self._reset_window()
+        self._version = 0
+        self._cache = {}
+
+    def _allocate(self, capacity: int) -> None:
+        self._capacity = capacity
+        self._last = np.full(capacity, np.nan)  # Açık kovadaki son fiyat
+        self._close = np.full(capacity, np.nan)  # Önceki kovanın kapanışı
+
+    def _reset_window(self) -> None:
+        capacity = self._capacity
+        self._returns = np.zeros((self.window, capacity))  # Halka tampon: kova x coin log getiri
+        self._valid = np.zeros((self.window, capacity))  # 1: coin o kovada gözlendi
+        self._sum = np.zeros(capacity)
+        self._count = np.zeros(capacity)
+        self._cross = np.zeros((capacity, capacity))  # Σ r·rᵀ
+        self._pairs = np.zeros((capacity, capacity))  # Ortak gözlem sayısı
+        self._position = 0
+        self._filled = 0
+        self._pushes = 0
+
+    def _grow(self) -> None:
+        """Sütun kapasitesini ikiye katla (yeni coinler sıfır geçmişle başlar)"""
+        old = self._capacity
+        last, close = self._last, self._close
+        returns, valid = self._returns, self._valid
+        sums, count, cross, pairs = self._sum, self._count, self._cross, self._pairs
+
+        self._allocate(old * 2)
+        self._last[:old], self._close[:old] = last, close
+        self._returns = np.zeros((self.window, self._capacity))
+        self._valid = np.zeros((self.window, self._capacity))
+        self._returns[:, :old], self._valid[:, :old] = returns, valid
+        self._sum = np.zeros(self._capacity)
+        self._count = np.zeros(self._capacity)
+        self._sum[:old], self._count[:old] = sums, count
+        self._cross = np.zeros((self._capacity, self._capacity))
+        self._pairs = np.zeros((self._capacity, self._capacity))
+        self._cross[:old, :old], self._pairs[:old, :old] = cross, pairs
+
+    # ─────────────────────────── Güncelleme ───────────────────────────
+
+    def update(self, symbol: str, price: float, timestamp_ms: int) -> None:
+        """Tick işle (O(1); kova değişiminde O(N²) toplam güncellemesi)"""
+        bucket = timestamp_ms // self.bucket_ms
+        if self._bucket is None:
+            self._bucket = bucket
+        elif bucket > self._bucket:
+            with self._lock:
+                self._roll(bucket)
+
+        column = self._columns.get(symbol)
+        if column is None:
+            with self._lock:
+                if len(self._columns) == self._capacity:
+                    self._grow()
+                column = self._columns[symbol] = len(self._columns)
+        self._last[column] = price
+
+    def _roll(self, bucket: int) -> None:
+        """Açık kovayı kapat; aradaki boş kovalar fiyat değişmemiş (sıfır getiri) sayılır"""
+        gap = bucket - self._bucket
+        self._bucket = bucket
+
+        if gap > self.window:
+            # Uzun kesinti: eski pencere artık anlamsız
+            self._reset_window()
+            self._close = self._last.copy()
+            self._version += 1
+            return
+
+        started = ~np.isnan(self._close)
+        returns = np.where(started, np.log(self._last / np.where(started, self._close, 1.0)), 0.0)
+        returns = np.nan_to_num(returns, nan=0.0, posinf=0.0, neginf=0.0)
+        self._push(returns, started.astype(np.float64))
+        self._close = self._last.copy()
+
+        observed = (~np.isnan(self._close)).astype(np.float64)
+        zeros = np.zeros(self._capacity)
+        for _ in range(gap - 1):
+            self._push(zeros, observed)
+        self._version += 1
+
+    def _push(self, returns: np.ndarray, valid: np.ndarray) -> None:
+        position = self._position
+        old_returns, old_valid = self._returns[position], self._valid[position]
+
+        self._sum += returns - old_returns
+        self._count += valid - old_valid
+        self._cross += np.outer(returns, returns) - np.outer(old_returns, old_returns)
+        self._pairs += np.outer(valid, valid) - np.outer(old_valid, old_valid)
+
+        self._returns[position] = returns
+        self._valid[position] = valid
+        self._position = (position + 1) % self.window
+        self._filled = min(self._filled + 1, self.window)
+
+        self._pushes += 1
+        if self._pushes % self.window == 0:
+            # Artımlı toplamlardaki kayan nokta hatasını sıfırla
+            self._sum = self._returns.sum(axis=0)
+            self._count = self._valid.sum(axis=0)
+            self._cross = self._returns.T @ self._returns
+            self._pairs = self._valid.T @ self._valid
+
+    def load(self, histories: Dict[str, np.ndarray]) -> int:
+        """
+        Kayıtlı tick'lerden (TICK_DTYPE) pencereyi toplu kur - coinler arası zaman sırası gerekmez
+        Her kovanın kapanışı searchsorted ile bulunur; işlenen kova sayısını döndürür
+        """
+        histories = {symbol: ticks for symbol, ticks in histories.items() if len(ticks)}
+        if not histories:
+            return 0
+
+        last_ts = max(int(ticks['timestamp'][-1]) for ticks in histories.values())
+        end_bucket = last_ts // self.bucket_ms
+        first_bucket = end_bucket - self.window
+        # Kova kapanış zamanları (dahil): first_bucket ... end_bucket - 1 kovalarının sonu
+        edges = (np.arange(first_bucket, end_bucket) + 1) * self.bucket_ms - 1
+
+        with self._lock:
+            self._reset_window()
+            for symbol in histories:
+                if symbol not in self._columns:
+                    if len(self._columns) == self._capacity:
+                        self._grow()
+                    self._columns[symbol] = len(self._columns)
+
+            closes = np.full((len(edges), self._capacity), np.nan)
+            for symbol, ticks in histories.items():
+                index = np.searchsorted(ticks['timestamp'], edges, side='right') - 1
+                known = index >= 0
+                closes[known, self._columns[symbol]] = ticks['price'][index[known]]
+
+            for row in range(1, len(edges)):
+                started = ~np.isnan(closes[row - 1]) & ~np.isnan(closes[row])
+                returns = np.zeros(self._capacity)
+                returns[started] = np.log(closes[row, started] / closes[row - 1, started])
+                self._push(returns, started.astype(np.float64))
+
+            # Açık kova: son kapanıştan itibaren canlı tick'lerle devam eder
+            self._close = closes[-1].copy()
+            for symbol, ticks in histories.items():
+                self._last[self._columns[symbol]] = float(ticks['price'][-1])
+            self._bucket = end_bucket
+            self._version += 1
+            return len(edges) - 1
+
+    # ─────────────────────────── Okuma ───────────────────────────
+
+    def _statistics(self) -> Dict:
+        """Toplamlardan kovaryans / korelasyon (kilit altında çağrılır)"""
+        n = len(self._columns)
+        count = self._count[:n]
+        pairs = self._pairs[:n, :n]
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, self._sum[:n] / count, 0.0)
+            cov = np.where(pairs > 0, self._cross[:n, :n] / pairs, np.nan) - np.outer(mean, mean)
+            std = np.sqrt(np.clip(np.diag(cov), 0, None))
+            corr = cov / np.outer(std, std)
+        corr[(pairs < self.min_periods) | ~np.isfinite(corr)] = np.nan
+        np.fill_diagonal(corr, np.where(count >= self.min_periods, 1.0, np.nan))
+        return {'count': count, 'cov': cov, 'corr': np.clip(corr, -1, 1), 'std': std}
+
+    def _cached(self, key: str, compute):
+        cached = self._cache.get(key)
+        if cached is not None and cached[0] == self._version:
+            return cached[1]
+        result = compute()
+        self._cache[key] = (self._version, result)
+        return result
+
+    def symbols(self) -> List[str]:
+        return list(self._columns)
+
+    def get_correlations(self, symbols: Optional[Sequence[str]] = None) -> Dict:
+        """Korelasyon matrisi + coin başına BTC betası (kova başına bir kez hesaplanır)"""
+        with self._lock:
+            result = self._cached('correlations', self._compute_correlations)
+
+        if symbols:
+            wanted = [symbol for symbol in (s.upper() for s in symbols) if symbol in result['symbols']]
+            index = [result['symbols'].index(symbol) for symbol in wanted]
+            result = {
+                **result,
+                'symbols': wanted,
+                'matrix': [[result['matrix'][i][j] for j in index] for i in index],
+                'beta': {symbol: result['beta'][symbol] for symbol in wanted}
+            }
+        return result
+
+    def _compute_correlations(self) -> Dict:
+        names = list(self._columns)
+        stats = self._statistics()
+        corr, cov, count = stats['corr'], stats['cov'], stats['count']
+
+        beta = {}
+        benchmark = self._columns.get(self.benchmark)
+        if benchmark is not None:
+            variance = cov[benchmark, benchmark]
+            benchmark_return = self._sum[benchmark]
+            for symbol, column in self._columns.items():
+                rho = corr[column, benchmark]
+                if not np.isfinite(rho) or variance <= 0:
+                    continue
+                value = cov[column, benchmark] / variance
+                beta[symbol] = {
+                    'beta': round(float(value), 3),
+                    'correlation': round(float(rho), 3),
+                    'r_squared': round(float(rho ** 2), 3),  # Hareketin BTC ile açıklanan payı
+                    # Pencere getirisinin BTC'den bağımsız kısmı (%)
+                    'idiosyncratic_return': round(float((self._sum[column] - value * benchmark_return) * 100), 3)
+                }
+
+        return {
+            'symbols': names,
+            'matrix': [[None if np.isnan(v) else round(float(v), 3) for v in row] for row in corr],
+            'beta': beta,
+            'benchmark': self.benchmark,
+            'bucket_ms': self.bucket_ms,
+            'window': self.window,
+            'buckets': self._filled,
+            'observations': {name: int(count[i]) for i, name in enumerate(names)},
+            'timestamp': datetime.now().isoformat()
+        }
+
+    def get_breadth(self) -> Dict:
+        """Piyasa genişliği: yükselen/düşen, ortalama korelasyon, dağılım ve hareket türü"""
+        with self._lock:
+            return self._cached('breadth', self._compute_breadth)
+
+    def _compute_breadth(self) -> Dict:
+        n = len(self._columns)
+        stats = self._statistics()
+        eligible = stats['count'] >= self.min_periods
+        window_returns = self._sum[:n][eligible] * 100  # Pencere log getirisi (%)
+
+        last_row = self._returns[(self._position - 1) % self.window, :n]
+        last_valid = self._valid[(self._position - 1) % self.window, :n] > 0
+
+        corr = stats['corr'][np.ix_(eligible, eligible)]
+        off_diagonal = corr[~np.eye(len(corr), dtype=bool)]
+        off_diagonal = off_diagonal[np.isfinite(off_diagonal)]
+        avg_correlation = float(off_diagonal.mean()) if len(off_diagonal) else None
+
+        advancing = int((window_returns > 0).sum())
+        declining = int((window_returns < 0).sum())
+
+        if avg_correlation is None:
+            regime = 'YETERSİZ VERİ'
+        elif avg_correlation >= BROAD_CORRELATION:
+            regime = 'GENİŞ PİYASA HAREKETİ'
+        elif avg_correlation <= IDIOSYNCRATIC_CORRELATION:
+            regime = 'COİNE ÖZEL HAREKETLER'
+        else:
+            regime = 'KARIŞIK'
+
+        return {
+            'symbols': int(eligible.sum()),
+            'advancing': advancing,
+            'declining': declining,
+            'advance_decline_ratio': round(advancing / declining, 2) if declining else None,
+            'advancing_percent': round(advancing / len(window_returns) * 100, 1) if len(window_returns) else 0,
+            'market_return': round(float(window_returns.mean()), 3) if len(window_returns) else 0,
+            'dispersion': round(float(window_returns.std()), 3) if len(window_returns) else 0,
+            'avg_correlation': round(avg_correlation, 3) if avg_correlation is not None else None,
+            'regime': regime,
+            'last_bucket': {
+                'up': int(((last_row > 0) & last_valid).sum()),
+                'down': int(((last_row < 0) & last_valid).sum())
+            },
+            'window_seconds': self.window * self.bucket_ms / 1000,
+            'buckets': self._filled
+        }
@@ -0,0 +1,310 @@
+"""
+L2 EMİR DEFTERİ 📚
+Binance @depth diff stream'lerinden coin başına kompakt emir defteri tutar
+- Her taraf fiyata göre sıralı iki sıkışık dizi (array('d')): fiyatlar ve miktarlar
+- Seviye değişimi ikili arama ile O(log n) bulunur (ekleme/silme kısa bellek kaydırması)
+- Snapshot + diff senkronu (Binance kuralları): snapshot gelene kadar olaylar tamponlanır,
+  lastUpdateId'ye kadar olanlar atılır, güncelleme numaralarında boşluk olursa yeniden senkron
+- Tahmin motoru için: en iyi N seviye likiditesi, alış/satış dengesizliği, duvar (wall) tespiti
+"""
+
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import deque
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+import requests
+
+from src.trade_decoder import json_loads
+
+BINANCE_REST_URL = 'https://api.binance.com'
+
+
+def fetch_depth_snapshot(symbol: str, limit: int = 1000, base_url: str = BINANCE_REST_URL) -> Dict:
+    """REST snapshot: {'lastUpdateId': ..., 'bids': [[fiyat, miktar], ...], 'asks': [...]}"""
+    response = requests.get(f"{base_url}/api/v3/depth", params={'symbol': symbol, 'limit': limit}, timeout=10)
+    response.raise_for_status()
+    return response.json()
+
+
+class BookSide:
+    """Fiyata göre artan sıralı seviyeler (alışta en iyi fiyat sonda, satışta başta)"""
+
+    __slots__ = ('prices', 'quantities', 'descending')
+
+    def __init__(self, descending: bool):
+        self.prices = array('d')
+        self.quantities = array('d')
+        self.descending = descending  # True: alış tarafı (en iyi = en yüksek fiyat)
+
+    def set(self, price: float, quantity: float) -> None:
+        """Seviyeyi güncelle; miktar 0 ise seviye silinir"""
+        prices = self.prices
+        index = bisect_left(prices, price)
+        if index < len(prices) and prices[index] == price:
+            if quantity == 0:
+                del prices[index]
+                del self.quantities[index]
+            else:
+                self.quantities[index] = quantity
+        elif quantity != 0:
+            prices.insert(index, price)
+            self.quantities.insert(index, quantity)
+
+    def load(self, levels: List) -> None:
+        rows = sorted((float(price), float(quantity)) for price, quantity in levels if float(quantity) != 0)
+        self.prices = array('d', [price for price, _ in rows])
+        self.quantities = array('d', [quantity for _, quantity in rows])
+
+    def trim(self, max_levels: int) -> None:
+        """En iyi fiyattan en uzak seviyeleri at"""
+        excess = len(self.prices) - max_levels
+        if excess > 0:
+            if self.descending:
+                del self.prices[:excess]
+                del self.quantities[:excess]
+            else:
+                del self.prices[max_levels:]
+                del self.quantities[max_levels:]
+
+    def best(self) -> Optional[float]:
+        if not self.prices:
+            return None
+        return self.prices[-1] if self.descending else self.prices[0]
+
+    def top(self, count: int):
+        """En iyi `count` seviye (en iyiden kötüye) -> (fiyatlar, miktarlar) numpy kopyaları"""
+        if self.descending:
+            prices = np.frombuffer(self.prices[-count:], dtype=np.float64)[::-1]
+            quantities = np.frombuffer(self.quantities[-count:], dtype=np.float64)[::-1]
+        else:
+            prices = np.frombuffer(self.prices[:count], dtype=np.float64)
+            quantities = np.frombuffer(self.quantities[:count], dtype=np.float64)
+        return prices, quantities
+
+    def __len__(self) -> int:
+        return len(self.prices)
+
+
+class OrderBook:
+    """Tek coinin L2 defteri ve senkron durumu"""
+
+    def __init__(self, symbol: str, max_levels: int = 1000, buffer_size: int = 2000):
+        self.symbol = symbol
+        self.max_levels = max_levels
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.last_update_id = None
+        self.synced = False
+        self.lock = threading.Lock()
+        self._buffer = deque(maxlen=buffer_size)  # Senkron öncesi diff olayları
+        self.stats = {'events': 0, 'level_updates': 0, 'resyncs': 0, 'snapshots': 0}
+        self.updated_at = None
+
+    def apply_snapshot(self, snapshot: Dict) -> bool:
+        """Snapshot'ı yükle ve tamponlanmış olayları uygula; senkron olduysa True"""
+        with self.lock:
+            self.bids.load(snapshot['bids'])
+            self.asks.load(snapshot['asks'])
+            self.last_update_id = int(snapshot['lastUpdateId'])
+            self.synced = True
+            self.stats['snapshots'] += 1
+
+            buffered = list(self._buffer)
+            self._buffer.clear()
+            for index, event in enumerate(buffered):
+                if not self._apply(event):
+                    # Snapshot tampondan eski kaldı: boşluktaki olay ve sonrası bir sonraki snapshot için tutulur
+                    self._buffer.extend(buffered[index + 1:])
+                    break
+            return self.synced
+
+    def apply_diff(self, event: Dict) -> bool:
+        """Diff olayını uygula; senkron değilse tamponla. Defter senkronsa True"""
+        with self.lock:
+            self.stats['events'] += 1
+            if not self.synced:
+                self._buffer.append(event)
+                return False
+            return self._apply(event)
+
+    def _apply(self, event: Dict) -> bool:
+        """Kilit altında çağrılır. Olay numaraları: U ilk, u son güncelleme"""
+        last_id = event['u']
+        if last_id <= self.last_update_id:
+            return True  # Snapshot'ta zaten var
+
+        if event['U'] > self.last_update_id + 1:
+            # Boşluk: olay kaçırıldı, defter güvenilmez
+            self.synced = False
+            self.stats['resyncs'] += 1
+            self._buffer.clear()
+            self._buffer.append(event)
+            return False
+
+        bids, asks = self.bids, self.asks
+        for price, quantity in event['b']:
+            bids.set(float(price), float(quantity))
+        for price, quantity in event['a']:
+            asks.set(float(price), float(quantity))
+        self.stats['level_updates'] += len(event['b']) + len(event['a'])
+
+        bids.trim(self.max_levels)
+        asks.trim(self.max_levels)
+        self.last_update_id = last_id
+        self.updated_at = time.time()
+        return True
+
+    def metrics(self, top_n: int = 20, wall_levels: int = 100, wall_factor: float = 5.0) -> Optional[Dict]:
+        """
+        Likidite özeti:
+        - bid_liquidity / ask_liquidity: en iyi N seviyenin değeri (quote, fiyat x miktar)
+        - imbalance: (alış - satış) / toplam, [-1, 1]; pozitif = alış baskısı
+        - walls: ilk `wall_levels` seviyede miktarı medyanın `wall_factor` katını aşanlar
+        """
+        with self.lock:
+            if not self.synced or not len(self.bids) or not len(self.asks):
+                return None
+            bid_prices, bid_quantities = self.bids.top(max(top_n, wall_levels))
+            ask_prices, ask_quantities = self.asks.top(max(top_n, wall_levels))
+
+        best_bid, best_ask = float(bid_prices[0]), float(ask_prices[0])
+        mid = (best_bid + best_ask) / 2
+
+        bid_liquidity = float(bid_prices[:top_n] @ bid_quantities[:top_n])
+        ask_liquidity = float(ask_prices[:top_n] @ ask_quantities[:top_n])
+        total = bid_liquidity + ask_liquidity
+
+        def walls(prices, quantities):
+            if len(quantities) < 3:
+                return []
+            threshold = float(np.median(quantities)) * wall_factor
+            found = np.flatnonzero(quantities >= threshold)
+            # En büyük 3 duvar (miktara göre)
+            found = found[np.argsort(quantities[found])[::-1][:3]]
+            return [
+                {
+                    'price': float(prices[i]),
+                    'quantity': float(quantities[i]),
+                    'notional': round(float(prices[i] * quantities[i]), 2),
+                    'distance_percent': round(abs(float(prices[i]) - mid) / mid * 100, 3)
+                }
+                for i in found
+            ]
+
+        return {
+            'best_bid': best_bid,
+            'best_ask': best_ask,
+            'mid': mid,
+            'spread': best_ask - best_bid,
+            'spread_bps': round((best_ask - best_bid) / mid * 10_000, 2),
+            'bid_liquidity': round(bid_liquidity, 2),
+            'ask_liquidity': round(ask_liquidity, 2),
+            'imbalance': round((bid_liquidity - ask_liquidity) / total, 4) if total else 0.0,
+            'bid_walls': walls(bid_prices, bid_quantities),
+            'ask_walls': walls(ask_prices, ask_quantities),
+            'levels': {'bids': len(self.bids), 'asks': len(self.asks)},
+            'last_update_id': self.last_update_id,
+            'updated_at': self.updated_at
+        }
+
+    def depth(self, count: int = 20) -> Optional[Dict]:
+        """En iyi `count` seviye (grafik / API için)"""
+        with self.lock:
+            if not self.synced:
+                return None
+            bid_prices, bid_quantities = self.bids.top(count)
+            ask_prices, ask_quantities = self.asks.top(count)
+        return {
+            'bids': np.column_stack((bid_prices, bid_quantities)).tolist(),
+            'asks': np.column_stack((ask_prices, ask_quantities)).tolist()
+        }
+
+
+class OrderBookManager:
+    """@depth mesajlarını coin defterlerine dağıtır, gerektiğinde snapshot ile senkronlar"""
+
+    def __init__(self, fetch_snapshot: Optional[Callable[[str, int], Dict]] = None, snapshot_limit: int = 1000,
+                 max_levels: int = 1000, top_n: int = 20, wall_levels: int = 100, wall_factor: float = 5.0,
+                 retry_interval: float = 5.0):
+        self.fetch_snapshot = fetch_snapshot or fetch_depth_snapshot
+        self.snapshot_limit = snapshot_limit
+        self.max_levels = max_levels
+        self.top_n = top_n
+        self.wall_levels = wall_levels
+        self.wall_factor = wall_factor
+        self.retry_interval = retry_interval  # Başarısız snapshot sonrası bekleme (saniye)
+
+        self.books = {}  # Coin -> OrderBook
+        self._lock = threading.Lock()
+        self._syncing = set()  # Snapshot'ı yolda olan coinler
+        self._next_attempt = {}  # Coin -> en erken yeniden deneme (monotonic)
+        self.stats = {'messages': 0, 'snapshot_errors': 0}
+
+    def handle_message(self, message) -> Optional[str]:
+        """Combined-stream depth mesajını işle; güncellenen coin (depth değilse None)"""
+        data = json_loads(message)
+        event = data.get('data')
+        if event is None or event.get('e') != 'depthUpdate':
+            return None
+
+        self.stats['messages'] += 1
+        return self.apply_event(event)
+
+    def apply_event(self, event: Dict) -> str:
+        symbol = event['s']
+        book = self.books.get(symbol)
+        if book is None:
+            with self._lock:
+                book = self.books.setdefault(symbol, OrderBook(symbol, self.max_levels))
+
+        if not book.apply_diff(event):
+            self._request_sync(symbol)
+        return symbol
+
+    def _request_sync(self, symbol: str) -> None:
+        with self._lock:
+            if symbol in self._syncing or time.monotonic() < self._next_attempt.get(symbol, 0):
+                return
+            self._syncing.add(symbol)
+        threading.Thread(target=self._sync, args=(symbol,), name=f'depth-sync-{symbol}', daemon=True).start()
+
+    def _sync(self, symbol: str) -> None:
+        try:
+            snapshot = self.fetch_snapshot(symbol, self.snapshot_limit)
+            if not self.books[symbol].apply_snapshot(snapshot):
+                # Snapshot tampondaki olaylardan eski kaldı: biraz sonra tekrar
+                self._next_attempt[symbol] = time.monotonic() + 1.0
+        except Exception as e:
+            self.stats['snapshot_errors'] += 1
+            self._next_attempt[symbol] = time.monotonic() + self.retry_interval
+            print(f"❌ Emir defteri snapshot hatası ({symbol}): {e}")
+        finally:
+            with self._lock:
+                self._syncing.discard(symbol)
+
+    def get_metrics(self, symbol: str) -> Optional[Dict]:
+        book = self.books.get(symbol)
+        if book is None:
+            return None
+        return book.metrics(self.top_n, self.wall_levels, self.wall_factor)
+
+    def get_depth(self, symbol: str, count: int = 20) -> Optional[Dict]:
+        book = self.books.get(symbol)
+        return book.depth(count) if book is not None else None
+
+    def remove(self, symbol: str) -> None:
+        with self._lock:
+            self.books.pop(symbol, None)
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'books': len(self.books),
+            'synced': sum(1 for book in self.books.values() if book.synced),
+            'syncing': len(self._syncing),
+            'books_detail': {symbol: {**book.stats, 'synced': book.synced} for symbol, book in self.books.items()}
+        }
@@ -0,0 +1,222 @@
+"""
+PARAMETRE TARAMASI (SWEEP) 🔬
+Puanlama profili ağırlık/eşik kombinasyonlarını kaydedilmiş veri üzerinde tüm çekirdeklerde dener
+ve yapılandırmaları isabet oranı veya PnL'e göre sıralar
+
+Veri bir kez tekrar oynatılır; göstergeler ve ileri getiriler profilden bağımsız olduğu için
+her kombinasyon sadece vektörel karar + puanlama maliyeti taşır
+
+Kullanım:
+    python -m src.parameter_sweep veri.npz grid.json --metric pnl_percent --horizon 5m --top 20
+    grid.json: {"weights.rsi": [0.8, 1.2, 1.6], "thresholds.buy": [0.3, 0.4, 0.5]}
+"""
+
+import argparse
+import itertools
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from src.backtester import DEFAULT_HORIZONS, Backtester, load_ticks, parse_horizons
+from src.prediction_engine import AdvancedPredictionEngine
+from src.scoring_profile import ScoringProfile
+
+METRICS = ('pnl_percent', 'hit_rate', 'avg_return_percent', 'max_drawdown_percent')
+
+# Backtest puanlaması sadece ağırlıkları ve karar eşiklerini kullanır; uyarı eşikleri
+# (alert_thresholds) sonucu değiştirmez, ızgarada aynı sonucu veren sahte bir boyut olurdu
+SWEEP_SECTIONS = ('weights', 'thresholds')
+
+# Alt süreç başına bir kez yüklenen paylaşılan veri (her görevde tekrar gönderilmez)
+_worker_state = {}
+
+
+def expand_grid(grid: Dict[str, List[Any]]) -> List[Dict[str, Any]]:
+    """{'weights.rsi': [1, 2], 'thresholds.buy': [0.3, 0.4]} -> 4 kombinasyon"""
+    keys = list(grid)
+    return [dict(zip(keys, values)) for values in itertools.product(*(grid[key] for key in keys))]
+
+
+def _init_worker(prepared: Dict, backtester: Backtester, base_profile: ScoringProfile) -> None:
+    _worker_state['prepared'] = prepared
+    _worker_state['backtester'] = backtester
+    _worker_state['base_profile'] = base_profile
+
+
+def _evaluate_configs(configs: List[Dict[str, Any]]) -> List[Dict]:
+    """Bir grup kombinasyonu puanla (alt süreçte çalışır)"""
+    prepared = _worker_state['prepared']
+    backtester = _worker_state['backtester']
+    base_profile = _worker_state['base_profile']
+
+    decision_times = {symbol: item['timestamps'] for symbol, item in prepared.items()}
+    forward = {symbol: item['forward'] for symbol, item in prepared.items()}
+
+    rows = []
+    for config in configs:
+        profile = base_profile.with_overrides(config)
+        directions = {
+            symbol: profile.directions(item['scores'], item['risks'], backtester.min_confidence)
+            for symbol, item in prepared.items()
+        }
+        report = backtester.score(decision_times, directions, forward)
+        rows.append({'config': config, 'overall': report['overall']})
+    return rows
+
+
+class ParameterSweep:
+    """Kombinasyon ızgarasını süreç havuzunda puanlayıp sıralar"""
+
+    def __init__(self, grid: Dict[str, List[Any]], backtester: Optional[Backtester] = None,
+                 base_profile: Optional[ScoringProfile] = None, metric: str = 'pnl_percent',
+                 horizon: Optional[str] = None, workers: Optional[int] = None, chunk_size: int = 64):
+        if metric not in METRICS:
+            raise ValueError(f"Geçersiz metrik: {metric} ({', '.join(METRICS)})")
+
+        self.backtester = backtester or Backtester()
+        if horizon is None:
+            horizon = next(iter(self.backtester.horizons))
+        if horizon not in self.backtester.horizons:
+            raise ValueError(f"Geçersiz ufuk: {horizon}")
+
+        self.grid = grid
+        self.base_profile = base_profile or ScoringProfile()
+        self.metric = metric
+        self.horizon = horizon
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_size = chunk_size
+
+        # Geçersiz anahtarlar havuz açılmadan yakalansın
+        sections = self.base_profile.to_dict()
+        for key in grid:
+            section, _, field = key.partition('.')
+            if section not in SWEEP_SECTIONS:
+                raise ValueError(f"Taranamayan profil anahtarı: {key} (desteklenen: {', '.join(SWEEP_SECTIONS)})")
+            if field not in sections[section]:
+                raise ValueError(f"Bilinmeyen profil alanı: {key}")
+        for config in expand_grid({key: values[:1] for key, values in grid.items()}):
+            self.base_profile.with_overrides(config)
+
+    def prepare(self, data: Dict[str, np.ndarray]) -> Dict[str, Dict]:
+        """Veriyi bir kez oynat; coin başına alt skor matrisi, risk, karar zamanı ve ileri getirileri çıkar"""
+        replayed = self.backtester.replay(self.backtester.prepare(data))
+        forward = self.backtester.forward_returns(data, replayed)
+        engine = AdvancedPredictionEngine(streaming=False, event_alerts=False)
+
+        prepared = {}
+        for symbol, snapshots in replayed.items():
+            scores, risks = engine.signal_matrix(snapshots['indicators'])
+            prepared[symbol] = {
+                'scores': scores,
+                'risks': risks,
+                'timestamps': snapshots['timestamps'],
+                'forward': forward[symbol]
+            }
+        return prepared
+
+    def run(self, source, top: Optional[int] = 20) -> List[Dict]:
+        """
+        Tüm kombinasyonları puanla ve sıralı tablo döndür
+
+        Returns:
+            [{'rank', 'config', 'trades', 'hit_rate', 'pnl_percent', ...}, ...]
+        """
+        started = time.perf_counter()
+        data = load_ticks(source) if isinstance(source, str) else source
+        prepared = self.prepare(data)
+        prepared_at = time.perf_counter()
+
+        configs = expand_grid(self.grid)
+        chunks = [configs[i:i + self.chunk_size] for i in range(0, len(configs), self.chunk_size)]
+
+        if self.workers <= 1 or len(chunks) <= 1:
+            _init_worker(prepared, self.backtester, self.base_profile)
+            results = [row for chunk in chunks for row in _evaluate_configs(chunk)]
+        else:
+            with ProcessPoolExecutor(
+                max_workers=min(self.workers, len(chunks)),
+                initializer=_init_worker,
+                initargs=(prepared, self.backtester, self.base_profile)
+            ) as pool:
+                results = [row for rows in pool.map(_evaluate_configs, chunks) for row in rows]
+
+        rows = [{'config': result['config'], **result['overall'][self.horizon]} for result in results]
+
+        # Drawdown küçükse iyidir; diğer metrikler büyükse
+        descending = self.metric != 'max_drawdown_percent'
+        rows.sort(key=lambda row: (row[self.metric], row['trades']) if descending
+                  else (-row[self.metric], row['trades']), reverse=True)
+
+        for rank, row in enumerate(rows, 1):
+            row['rank'] = rank
+
+        elapsed = time.perf_counter() - started
+        print(f"🔬 {len(configs):,} kombinasyon puanlandı: replay {prepared_at - started:.1f}s, "
+              f"tarama {elapsed - (prepared_at - started):.1f}s")
+
+        return rows[:top] if top else rows
+
+
+def print_table(rows: List[Dict], metric: str) -> None:
+    if not rows:
+        print("Sonuç yok")
+        return
+
+    keys = list(rows[0]['config'])
+    header = f"{'#':>4}  " + ''.join(f"{key:>22}" for key in keys) + \
+        f"{'İŞLEM':>8}{'İSABET%':>10}{'PNL%':>12}{'DD%':>10}"
+    print(header)
+    print('─' * len(header))
+
+    for row in rows:
+        values = ''.join(f"{row['config'][key]:>22}" for key in keys)
+        print(f"{row['rank']:>4}  {values}{row['trades']:>8}{row['hit_rate']:>10.2f}"
+              f"{row['pnl_percent']:>12.4f}{row['max_drawdown_percent']:>10.4f}")
+    print(f"\nSıralama: {metric}")
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description='Puanlama profili parametre taraması')
+    parser.add_argument('source', help='Tick/mum CSV dosyası veya .npz ikili dosya')
+    parser.add_argument('grid', help='Izgara JSON dosyası ({"weights.rsi": [..], ...})')
+    parser.add_argument('--metric', default='pnl_percent', choices=METRICS)
+    parser.add_argument('--horizons', default=','.join(DEFAULT_HORIZONS))
+    parser.add_argument('--horizon', default=None, help='Sıralamada kullanılacak ufuk')
+    parser.add_argument('--interval', type=int, default=1_000, help='Kararlar arası süre (ms)')
+    parser.add_argument('--timeframe', default='1s', help="Gösterge zaman dilimi ('tick' = tick modu)")
+    parser.add_argument('--fee', type=float, default=0.0)
+    parser.add_argument('--min-confidence', type=float, default=0)
+    parser.add_argument('--profile', help='Temel profil JSON dosyası')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--save-best', help='En iyi profili bu JSON dosyasına kaydet')
+    args = parser.parse_args(argv)
+
+    with open(args.grid, encoding='utf-8') as f:
+        grid = json.load(f)
+
+    base_profile = ScoringProfile.load(args.profile) if args.profile else ScoringProfile()
+    backtester = Backtester(
+        horizons=parse_horizons(args.horizons),
+        decision_interval_ms=args.interval,
+        indicator_timeframe=None if args.timeframe == 'tick' else args.timeframe,
+        fee=args.fee,
+        min_confidence=args.min_confidence,
+        workers=args.workers
+    )
+    sweep = ParameterSweep(grid, backtester, base_profile, args.metric, args.horizon, args.workers)
+    rows = sweep.run(args.source, args.top)
+    print_table(rows, args.metric)
+
+    if args.save_best and rows:
+        best = base_profile.with_overrides(rows[0]['config'], name='sweep-best')
+        best.save(args.save_best)
+        print(f"✅ En iyi profil kaydedildi: {args.save_best}")
+
+
+if __name__ == '__main__':
+    main()
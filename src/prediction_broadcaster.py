@@ -0,0 +1,150 @@
+"""
+TAHMİN YAYINCISI 📡
+Tahminleri sunucuda aralıklarla bir kez hesaplar ve Socket.IO odalarına sadece değişenleri yayınlar
+Sunucu yükü bağlı tarayıcı sayısından bağımsızdır
+"""
+
+from collections import deque
+from typing import Dict, List, Optional
+
+
+def _without_timestamp(payload):
+    """Değişim karşılaştırması için zaman damgasını çıkar"""
+    if isinstance(payload, dict):
+        return {k: v for k, v in payload.items() if k != 'timestamp'}
+    return payload
+
+
+class PredictionBroadcaster:
+    """Periyodik tahmin hesaplayıcı ve Socket.IO yayıncısı"""
+
+    ROOM = 'predictions'  # Tüm coinler + toplu veriler
+    # Yayınlanmayı bekleyen en fazla uyarı olayı (yayıncı henüz başlamadıysa en eskiler atılır)
+    MAX_PENDING_ALERT_EVENTS = 1000
+
+    def __init__(self, socketio, engine, interval: float = 2.0,
+                 opportunities_limit: int = 5, min_confidence: float = 65):
+        self.socketio = socketio
+        self.engine = engine
+        self.interval = interval
+        self.opportunities_limit = opportunities_limit
+        self.min_confidence = min_confidence
+
+        self.running = False
+        self._versions = {}  # Coin -> son hesaplanan veri sürümü
+        self._predictions = {}  # Coin -> son yayınlanan tahmin
+        self._aggregates = {}  # 'opportunities' / 'alerts' / 'market_summary' -> son yayınlanan
+        self._data_version = None
+        self._alert_events = deque(maxlen=self.MAX_PENDING_ALERT_EVENTS)  # Tick yolundan gelen, yayınlanmamış olaylar
+        self.stats = {'cycles': 0, 'predictions_computed': 0, 'events_emitted': 0, 'alert_events_dropped': 0}
+
+    @staticmethod
+    def symbol_room(symbol: str) -> str:
+        """Tek coin aboneliği için oda adı"""
+        return f"prediction:{symbol.upper()}"
+
+    def start(self) -> None:
+        """Zamanlayıcıyı başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        if self.running:
+            return
+        self.running = True
+        self.socketio.start_background_task(self._run)
+        print(f"📡 Tahmin yayıncısı başlatıldı ({self.interval}s aralık)")
+
+    def stop(self) -> None:
+        self.running = False
+
+    def _run(self) -> None:
+        while self.running:
+            try:
+                self.broadcast_once()
+            except Exception as e:
+                print(f"❌ Tahmin yayın hatası: {e}")
+            self.socketio.sleep(self.interval)
+
+    def _emit(self, event: str, payload, room: str) -> None:
+        self.socketio.emit(event, payload, to=room)
+        self.stats['events_emitted'] += 1
+
+    def broadcast_once(self) -> Dict[str, Dict]:
+        """Verisi değişen coinleri yeniden hesapla ve sadece değişen sonuçları yayınla"""
+        self.stats['cycles'] += 1
+        self._flush_alert_events()
+        changed = {}
+
+        for symbol, version in list(self.engine.versions.items()):
+            if self._versions.get(symbol) == version:
+                continue
+            self._versions[symbol] = version
+
+            prediction = self.engine.generate_advanced_prediction(symbol)
+            self.stats['predictions_computed'] += 1
+
+            previous = self._predictions.get(symbol)
+            if previous is not None and _without_timestamp(previous) == _without_timestamp(prediction):
+                continue
+
+            self._predictions[symbol] = prediction
+            changed[symbol] = prediction
+
+        if changed:
+            self._emit('prediction_update', {'predictions': changed}, self.ROOM)
+            for symbol, prediction in changed.items():
+                self._emit('prediction_update', {'predictions': {symbol: prediction}}, self.symbol_room(symbol))
+
+        if self.engine.data_version != self._data_version:
+            self._data_version = self.engine.data_version
+            self._broadcast_aggregates()
+
+        return changed
+
+    def _broadcast_aggregates(self) -> None:
+        """Fırsatlar, uyarılar ve piyasa özetini değiştiyse yayınla"""
+        aggregates = {
+            'opportunities': self.engine.get_top_opportunities(self.min_confidence, self.opportunities_limit),
+            'alerts': self.engine.get_risk_alerts(),
+            'market_summary': self.engine.generate_market_summary()
+        }
+
+        for name, value in aggregates.items():
+            if value is None:
+                continue
+            previous = self._aggregates.get(name)
+            if previous is not None and _without_timestamp(previous) == _without_timestamp(value):
+                continue
+            self._aggregates[name] = value
+            self._emit(f'prediction_{name}', value, self.ROOM)
+
+    def publish_alert_event(self, event: Dict) -> None:
+        """
+        Uyarı motorundan gelen yeni/kapanan uyarıyı kuyruğa al (tick yolundan, motor kilidi altında çağrılır)
+        Yayın bir sonraki döngüde, kilit dışında yapılır: yavaş istemciler veri alımını bekletmez
+        """
+        if len(self._alert_events) == self._alert_events.maxlen:
+            self.stats['alert_events_dropped'] += 1
+        self._alert_events.append(event)
+
+    def _flush_alert_events(self) -> None:
+        """Kuyruktaki uyarı olaylarını geliş sırasıyla yayınla"""
+        while self._alert_events:
+            event = self._alert_events.popleft()
+            self._emit('prediction_alert_event', event, self.ROOM)
+            self._emit('prediction_alert_event', event, self.symbol_room(event['alert']['symbol']))
+    
+    def snapshot(self, symbols: Optional[List[str]] = None) -> Dict:
+        """Yeni abone için son yayınlanan durumun tamamı"""
+        if symbols:
+            wanted = {symbol.upper() for symbol in symbols}
+            predictions = {s: p for s, p in self._predictions.items() if s in wanted}
+            return {'predictions': predictions}
+
+        return {'predictions': dict(self._predictions), **self._aggregates}
+
+    def get_stats(self) -> Dict:
+        return {
+            **self.stats,
+            'running': self.running,
+            'interval': self.interval,
+            'tracked_symbols': len(self._predictions),
+            'pending_alert_events': len(self._alert_events)
+        }
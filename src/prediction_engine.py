@@ -4,63 +4,262 @@ Binance verilerinden AI destekli gelişmiş tahminler üretir
 """
 
 import numpy as np
-from collections import deque
 from datetime import datetime, timedelta
+import itertools
 import statistics
-from typing import Dict, List, Optional, Tuple
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+from src import batch_indicators
+from src.alert_engine import AlertEngine
+from src.candles import DEFAULT_MAX_BARS, TIMEFRAMES, CandleBuilder
+from src.market_analytics import MarketAnalytics
+from src.order_book import OrderBookManager
+from src.scoring_profile import SIGNAL_NAMES, ScoringProfile
+from src.streaming_indicators import StreamingIndicatorState
+from src.tick_buffer import compress_ticks, to_epoch_ms
+from src.tick_store import TickStore
 
 class AdvancedPredictionEngine:
-    def __init__(self, history_size: int = 200):
-        self.price_data = {}  # Her coin için fiyat geçmişi
-        self.volume_data = {}  # Hacim verileri
+    # Farklı sorgu parametreleri için tutulacak en fazla toplu sonuç sayısı
+    MAX_AGGREGATE_CACHE = 64
+    
+    # Değişim yüzdeleri gerçek zaman aralıklarıyla (ms) hesaplanır
+    CHANGE_LOOKBACKS = {
+        '1m': 60_000,
+        '5m': 300_000,
+        '15m': 900_000,
+        '30m': 1_800_000,
+        '1h': 3_600_000,
+    }
+    
+    def __init__(self, history_size: int = 200, streaming: bool = True, cache_max_age: Optional[float] = None,
+                 indicator_timeframe: Optional[str] = None, event_alerts: bool = True,
+                 profile: Optional[ScoringProfile] = None, tick_store: Optional[TickStore] = None,
+                 market_analytics: Optional[MarketAnalytics] = None, order_books: Optional[OrderBookManager] = None):
+        if indicator_timeframe is not None and indicator_timeframe not in TIMEFRAMES:
+            raise ValueError(f"Geçersiz zaman dilimi: {indicator_timeframe}")
+        
+        # Tick'ler ortak depoda tutulur (grafik API'si de aynı depodan okur)
+        self.tick_store = tick_store if tick_store is not None else TickStore(history_size)
+        self.price_data = self.tick_store.buffers  # Her coin için fiyat/hacim/zaman halka tamponu (TickRingBuffer)
+        # Ingestion thread'i yazarken Flask istekleri ve yayıncı thread'i okur: tampon görünümleri,
+        # önbellekler ve sürüm sayaçları depo kilidi (reentrant) altında okunur/yazılır
+        self._lock = self.tick_store.lock
+        self.candles = {}  # Her coin için OHLCV bar oluşturucu (CandleBuilder)
+        self.indicator_timeframe = indicator_timeframe  # None: göstergeler tick'ler üzerinde, aksi halde kapanmış barlar üzerinde
+        self.indicator_states = {}  # Akış modunda coin başına gösterge durumu
+        self.streaming = streaming  # True: göstergeler her tick'te O(1) güncellenir
         self.predictions = {}  # Aktif tahminler
         self.prediction_history = {}  # Tahmin geçmişi (başarı oranı için)
-        self.history_size = history_size
-        self.alert_thresholds = {
-            'volatility': 0.1,
-            'rapid_decline': -5,
-            'rapid_increase': 5,
-            'rsi_overbought': 75,
-            'rsi_oversold': 25
-        }
-        
-    def add_price_data(self, symbol: str, price: float, volume: float = 0, timestamp: datetime = None):
-        """Fiyat ve hacim verisi ekle"""
-        if timestamp is None:
-            timestamp = datetime.now()
+        self.history_size = self.tick_store.capacity
+        
+        # Tick sürümlü önbellek: her yeni veri coin sürümünü artırır,
+        # aynı sürüm için hesaplanan sonuçlar tekrar kullanılır
+        self.versions = {}  # Coin başına veri sürümü
+        self.data_version = 0  # Tüm coinler için toplam sürüm
+        self.cache_max_age = cache_max_age  # Saniye; set edilirse sürüm değişse de bu kadar eski sonuç kabul edilir
+        self._indicator_cache = {}
+        self._prediction_cache = {}
+        self._aggregate_cache = {}
+        self.cache_stats = {'hits': 0, 'misses': 0}
+        self._warming = False  # warm_start sırasında piyasa analitiği tick tick güncellenmez
+        self.profile = profile or ScoringProfile()  # Sinyal ağırlıkları ve karar/uyarı eşikleri
+        self.alert_thresholds = self.profile.alert_thresholds
+        # Uyarılar her tick'te değerlendirilir; sadece açılan/kapanan uyarılar olay üretir
+        self.alert_engine = AlertEngine(self.alert_thresholds) if event_alerts else None
+        # Coinler arası korelasyon / beta / genişlik (None: kapalı)
+        self.market_analytics = market_analytics
+        # L2 emir defterleri (None: sadece trade verisi; destek/direnç yerel tepe/diplerden)
+        self.order_books = order_books
+        
+    def add_price_data(self, symbol: str, price: float, volume: float = 0,
+                       timestamp: Union[datetime, int, None] = None):
+        """Fiyat ve hacim verisi ekle (timestamp: datetime veya epoch-ms)"""
+        with self._lock:
+            self._ingest(symbol, float(price), float(volume), to_epoch_ms(timestamp))
             
-        if symbol not in self.price_data:
-            self.price_data[symbol] = deque(maxlen=self.history_size)
-            self.volume_data[symbol] = deque(maxlen=self.history_size)
+            if self.alert_engine is not None:
+                self.alert_engine.evaluate(symbol, self._refresh_indicators(symbol))
+    
+    def add_price_batch(self, trades: Sequence[Tuple[str, float, float, int]]) -> None:
+        """
+        Toplu veri ekle: [(coin, fiyat, hacim, epoch-ms), ...] (zaman sıralı)
+        Uyarılar tick başına değil, toplu işlem sonunda coin başına bir kez değerlendirilir
+        """
+        touched = {}
+        with self._lock:
+            for symbol, price, volume, timestamp_ms in trades:
+                self._ingest(symbol, float(price), float(volume), int(timestamp_ms))
+                touched[symbol] = True
+            
+            if self.alert_engine is not None:
+                for symbol in touched:
+                    self.alert_engine.evaluate(symbol, self._refresh_indicators(symbol))
+    
+    def load_history(self, symbol: str, ticks: np.ndarray) -> int:
+        """
+        Kaydedilmiş tick'lerle (TICK_DTYPE dizisi) motoru ısıt; işlenen tick sayısını döndürür
+        Son `history_size` tick ham, 1s bar geçmişinde tutulacak son saniyeler 1s kovalarına,
+        daha eskisi 1m kovalarına indirilerek işlenir: tüm zaman dilimlerinin barları tam
+        tekrar oynatmayla aynıdır. Tick tabanlı akış göstergeleri (EMA/RSI durumu) ise
+        sıkıştırılmış tick'lerle ısındığı için yaklaşık değerle başlar
+        """
+        if len(ticks) == 0:
+            return 0
         
-        self.price_data[symbol].append({
-            'price': float(price),
-            'timestamp': timestamp
-        })
+        older, recent = ticks[:-self.history_size], ticks[-self.history_size:]
+        # Sınır zamanla değil saniye kovası sayısıyla bulunur: seyrek coinlerde 1s serisindeki
+        # son barlar (kapanmış + açık) zamanca çok geriye uzanabilir
+        seconds = ticks['timestamp'] // TIMEFRAMES['1s']
+        starts = np.flatnonzero(np.r_[True, seconds[1:] != seconds[:-1]])
+        keep = DEFAULT_MAX_BARS['1s'] + 1
+        split = min(int(starts[-keep]) if len(starts) > keep else 0, len(older))
+        
+        replay = np.concatenate((
+            compress_ticks(older[:split], TIMEFRAMES['1m']),
+            compress_ticks(older[split:], TIMEFRAMES['1s']),
+            recent
+        ))
+        self.add_price_batch(list(zip(
+            itertools.repeat(symbol, len(replay)),
+            replay['price'].tolist(),
+            replay['volume'].tolist(),
+            replay['timestamp'].tolist()
+        )))
+        return len(replay)
+    
+    def warm_start(self, histories: Dict[str, np.ndarray]) -> int:
+        """
+        Birden fazla coini kayıtlı tick'lerle ısıt; işlenen tick sayısını döndürür
+        Coinler sırayla işlendiği için zamanlar coinler arasında geri gider; piyasa analitiği
+        bu yüzden tick tick değil, tüm geçmişten toplu (hizalı kovalarla) kurulur
+        """
+        self._warming = True
+        try:
+            replayed = sum(self.load_history(symbol, ticks) for symbol, ticks in histories.items())
+        finally:
+            self._warming = False
+        
+        if self.market_analytics is not None:
+            self.market_analytics.load(histories)
+        return replayed
+    
+    def _ingest(self, symbol: str, price: float, volume: float, timestamp_ms: int) -> None:
+        """Tick'i tampona, mumlara ve akış göstergelerine işle"""
+        if symbol not in self.candles:
+            self.candles[symbol] = CandleBuilder()
+            if self.streaming:
+                self.indicator_states[symbol] = StreamingIndicatorState()
+        
+        self.tick_store.append(symbol, price, volume, timestamp_ms)
+        if self.market_analytics is not None and not self._warming:
+            self.market_analytics.update(symbol, price, timestamp_ms)
+        closed_bars = self.candles[symbol].update(price, volume, timestamp_ms)
+        self.versions[symbol] = self.versions.get(symbol, 0) + 1
+        self.data_version += 1
+        
+        if self.streaming:
+            if self.indicator_timeframe is None:
+                self.indicator_states[symbol].update(price, volume)
+            elif self.indicator_timeframe in closed_bars:
+                bar = closed_bars[self.indicator_timeframe]
+                self.indicator_states[symbol].update(bar.close, bar.volume, bar.high, bar.low)
+    
+    def _series_length(self, symbol: str) -> int:
+        """Göstergelerin hesaplandığı serinin uzunluğu (tick veya kapanmış bar sayısı)"""
+        if symbol not in self.price_data:
+            return 0
+        if self.indicator_timeframe is None:
+            return len(self.price_data[symbol])
+        return len(self.candles[symbol].series[self.indicator_timeframe])
+    
+    def _indicator_series(self, symbol: str) -> Tuple[np.ndarray, np.ndarray, Optional[np.ndarray], Optional[np.ndarray]]:
+        """(fiyat, hacim, yüksek, düşük) dizileri - tick modunda yüksek/düşük yoktur"""
+        if self.indicator_timeframe is None:
+            buffer = self.price_data[symbol]
+            return buffer.prices, buffer.volumes, None, None
+        
+        bars = self.candles[symbol].series[self.indicator_timeframe].arrays()
+        return bars['close'], bars['volume'], bars['high'], bars['low']
+    
+    def _candle_changes(self, symbol: str) -> Dict[str, float]:
+        """Gerçek zaman aralıklarına göre değişim yüzdeleri (mum geçmişinden)"""
+        builder = self.candles[symbol]
+        return {label: builder.change_percent(lookback) for label, lookback in self.CHANGE_LOOKBACKS.items()}
+    
+    def get_candles(self, symbol: str, timeframe: str = '1m', limit: Optional[int] = None) -> Optional[List[Dict]]:
+        """Coin için OHLCV barları (açık bar dahil)"""
+        if symbol not in self.candles or timeframe not in TIMEFRAMES:
+            return None
+        with self._lock:
+            return self.candles[symbol].get_candles(timeframe, limit)
+    
+    def _memoize(self, cache: Dict, key: Any, version: int, compute: Callable[[], Any]) -> Any:
+        """
+        Sürüm (veya cache_max_age) geçerliyse önbellekteki sonucu döndür, değilse hesapla
+        Hesaplama kilit altında yapılır: okunan seriler ve sürüm aynı ana aittir
+        """
+        with self._lock:
+            now = time.monotonic()
+            entry = cache.get(key)
+            
+            if entry is not None:
+                cached_version, created_at, value = entry
+                if cached_version == version or (
+                    self.cache_max_age is not None and now - created_at <= self.cache_max_age
+                ):
+                    self.cache_stats['hits'] += 1
+                    return value
+            
+            self.cache_stats['misses'] += 1
+            value = compute()
+            cache[key] = (version, now, value)
+            return value
+    
+    def get_cache_stats(self) -> Dict:
+        """Önbellek isabet/ıska sayaçları"""
+        hits = self.cache_stats['hits']
+        misses = self.cache_stats['misses']
+        total = hits + misses
         
-        self.volume_data[symbol].append({
-            'volume': float(volume),
-            'timestamp': timestamp
-        })
+        return {
+            'hits': hits,
+            'misses': misses,
+            'hit_rate': round(hits / total * 100, 2) if total else 0,
+            'cached_indicators': len(self._indicator_cache),
+            'cached_predictions': len(self._prediction_cache),
+            'cached_aggregates': len(self._aggregate_cache),
+            'data_version': self.data_version,
+            'max_age': self.cache_max_age
+        }
     
     def calculate_advanced_indicators(self, symbol: str) -> Optional[Dict]:
-        """Gelişmiş teknik göstergeleri hesapla"""
-        if symbol not in self.price_data or len(self.price_data[symbol]) < 20:
+        """Gelişmiş teknik göstergeleri hesapla (tick sürümüne göre önbellekli)"""
+        return self._memoize(
+            self._indicator_cache, symbol, self.versions.get(symbol, 0),
+            lambda: self._compute_indicators(symbol)
+        )
+    
+    def _refresh_indicators(self, symbol: str) -> Optional[Dict]:
+        """Göstergeleri güncel sürüm için hesapla ve önbelleğe yaz (cache_max_age beklenmez)"""
+        self.cache_stats['misses'] += 1
+        indicators = self._compute_indicators(symbol)
+        self._indicator_cache[symbol] = (self.versions.get(symbol, 0), time.monotonic(), indicators)
+        return indicators
+    
+    def _compute_indicators(self, symbol: str) -> Optional[Dict]:
+        """Göstergeleri önbelleğe bakmadan hesapla"""
+        if self._series_length(symbol) < 20:
             return None
         
-        prices = [d['price'] for d in self.price_data[symbol]]
-        volumes = [d['volume'] for d in self.volume_data[symbol]] if symbol in self.volume_data else [0] * len(prices)
+        if self.streaming:
+            return self._with_order_book(symbol, self._read_streaming_indicators(symbol))
         
-        current_price = prices[-1]
+        prices, volumes, highs, lows = self._indicator_series(symbol)
         
-        # Değişim yüzdeleri (farklı zaman dilimleri)
-        changes = {
-            '1m': self._calculate_change(prices, -2),
-            '5m': self._calculate_change(prices, -6),
-            '15m': self._calculate_change(prices, -16),
-            '30m': self._calculate_change(prices, -31),
-            '1h': self._calculate_change(prices, -61),
-        }
+        # Değişim yüzdeleri (gerçek zaman dilimleri)
+        changes = self._candle_changes(symbol)
         
         # Hareketli ortalamalar
         ma_5 = self._moving_average(prices, 5)
@@ -72,10 +271,8 @@ class AdvancedPredictionEngine:
         ema_12 = self._exponential_moving_average(prices, 12)
         ema_26 = self._exponential_moving_average(prices, 26)
         
-        # MACD
-        macd_line = ema_12 - ema_26
-        macd_signal = self._exponential_moving_average([macd_line] * 9, 9)
-        macd_histogram = macd_line - macd_signal
+        # MACD (gerçek MACD serisinin 9 EMA'sı ile sinyal)
+        macd = tuple(float(v[0]) for v in batch_indicators.macd(prices[np.newaxis, :]))
         
         # RSI
         rsi = self._calculate_rsi(prices, period=14)
@@ -85,15 +282,13 @@ class AdvancedPredictionEngine:
         
         # Bollinger Bands
         bb_upper, bb_middle, bb_lower = self._calculate_bollinger_bands(prices)
-        bb_position = ((current_price - bb_lower) / (bb_upper - bb_lower)) * 100 if bb_upper != bb_lower else 50
         
         # Volatilite (ATR - Average True Range)
-        atr = self._calculate_atr(prices)
-        volatility_percent = (atr / current_price) * 100
+        atr = self._calculate_atr(prices, highs=highs, lows=lows)
         
         # Hacim analizi
-        volume_ma = statistics.mean(volumes[-20:]) if len(volumes) >= 20 else sum(volumes) / len(volumes) if volumes else 0
-        volume_ratio = (volumes[-1] / volume_ma) if volume_ma > 0 else 1
+        volume_ma = float(volumes[-20:].mean())
+        volume_ratio = (float(volumes[-1]) / volume_ma) if volume_ma > 0 else 1
         
         # Trend gücü (ADX benzeri)
         trend_strength = self._calculate_trend_strength(prices)
@@ -102,6 +297,116 @@ class AdvancedPredictionEngine:
         momentum = self._calculate_momentum(prices, 10)
         roc = self._calculate_rate_of_change(prices, 10)
         
+        return self._with_order_book(symbol, self._build_indicators(
+            prices, changes, ma_5, ma_10, ma_20, ma_50, ema_12, ema_26, macd, rsi, stoch_rsi,
+            (bb_upper, bb_middle, bb_lower), atr, volume_ratio, trend_strength, momentum, roc
+        ))
+    
+    def calculate_all_indicators(self) -> Dict[str, Dict]:
+        """
+        Tüm coinlerin göstergelerini tek geçişte hesapla
+        Aynı uzunlukta geçmişe sahip coinler tek bir (coin x pencere) matrisinde
+        vektörel olarak işlenir; yetersiz verisi olan coinler sonuçta yer almaz
+        """
+        return self._memoize_aggregate('all_indicators', self._compute_all_indicators)
+    
+    def _compute_all_indicators(self) -> Dict[str, Dict]:
+        """Toplu göstergeleri önbelleğe bakmadan hesapla"""
+        ready = [symbol for symbol in list(self.price_data) if self._series_length(symbol) >= 20]
+        
+        if self.streaming:
+            return {symbol: self._with_order_book(symbol, self._read_streaming_indicators(symbol)) for symbol in ready}
+        
+        groups = {}
+        for symbol in ready:
+            groups.setdefault(self._series_length(symbol), []).append(symbol)
+        
+        results = {}
+        for symbols in groups.values():
+            series = [self._indicator_series(symbol) for symbol in symbols]
+            prices = np.stack([s[0] for s in series])
+            volumes = np.stack([s[1] for s in series])
+            highs = np.stack([s[2] for s in series]) if self.indicator_timeframe else None
+            lows = np.stack([s[3] for s in series]) if self.indicator_timeframe else None
+            values = batch_indicators.compute_batch(prices, volumes, highs, lows)
+            
+            for row, symbol in enumerate(symbols):
+                results[symbol] = self._build_indicators(
+                    prices[row],
+                    self._candle_changes(symbol),
+                    float(values['ma_5'][row]), float(values['ma_10'][row]),
+                    float(values['ma_20'][row]), float(values['ma_50'][row]),
+                    float(values['ema_12'][row]), float(values['ema_26'][row]),
+                    (float(values['macd_line'][row]), float(values['macd_signal'][row]),
+                     float(values['macd_histogram'][row])),
+                    float(values['rsi'][row]), float(values['stoch_rsi'][row]),
+                    (float(values['bb_upper'][row]), float(values['bb_middle'][row]), float(values['bb_lower'][row])),
+                    float(values['atr'][row]), float(values['volume_ratio'][row]),
+                    float(values['trend_strength'][row]), float(values['momentum'][row]), float(values['roc'][row])
+                )
+        
+        return {symbol: self._with_order_book(symbol, results[symbol]) for symbol in ready}
+    
+    def _with_order_book(self, symbol: str, indicators: Dict) -> Dict:
+        """
+        Senkron emir defteri varsa likidite özetini ekle ve destek/direnci defterdeki
+        duvarlardan (büyük bekleyen emirler) al; yoksa fiyat tepe/dipleri kalır
+        """
+        if self.order_books is None:
+            return indicators
+        
+        book = self.order_books.get_metrics(symbol)
+        indicators['order_book'] = book
+        if book is None:
+            return indicators
+        
+        price = indicators['current_price']
+        supports = sorted(wall['price'] for wall in book['bid_walls'] if wall['price'] < price)
+        resistances = sorted(wall['price'] for wall in book['ask_walls'] if wall['price'] > price)
+        if supports:
+            indicators['support_levels'] = [round(level, 2) for level in supports]
+        if resistances:
+            indicators['resistance_levels'] = [round(level, 2) for level in resistances]
+        return indicators
+    
+    def _read_streaming_indicators(self, symbol: str) -> Dict:
+        """Akış durumundan göstergeleri oku (tam yeniden hesaplama yok)"""
+        state = self.indicator_states[symbol]
+        prices = list(state.recent)
+        changes = self._candle_changes(symbol)
+        
+        momentum_base = state.price_ago(10)
+        momentum = state.last_price - momentum_base if momentum_base is not None else 0
+        roc = (momentum / momentum_base) * 100 if momentum_base else 0
+        
+        return self._build_indicators(
+            prices, changes,
+            state.moving_average(5), state.moving_average(10),
+            state.moving_average(20), state.moving_average(50),
+            state.exponential_moving_average(12), state.exponential_moving_average(26), state.macd(),
+            state.rsi.get(), state.stochastic_rsi(), state.bollinger_bands(),
+            state.atr(), state.volume_ratio(), state.trend_strength(), momentum, roc
+        )
+    
+    def _build_indicators(self, prices: Sequence[float], changes: Dict[str, float],
+                          ma_5: float, ma_10: float, ma_20: float, ma_50: float,
+                          ema_12: float, ema_26: float, macd: Tuple[float, float, float],
+                          rsi: float, stoch_rsi: float,
+                          bollinger: Tuple[float, float, float], atr: float, volume_ratio: float,
+                          trend_strength: float, momentum: float, roc: float) -> Dict:
+        """Ham gösterge değerlerinden API sözlüğünü oluştur"""
+        current_price = float(prices[-1])
+        
+        # MACD (çizgi, 9 EMA sinyal, histogram)
+        macd_line, macd_signal, macd_histogram = macd
+        
+        # Bollinger Bands
+        bb_upper, bb_middle, bb_lower = bollinger
+        bb_position = ((current_price - bb_lower) / (bb_upper - bb_lower)) * 100 if bb_upper != bb_lower else 50
+        
+        # Volatilite
+        volatility_percent = (atr / current_price) * 100
+        
         # Destek/Direnç seviyeleri (pivot points)
         support_levels, resistance_levels = self._calculate_support_resistance(prices)
         
@@ -141,166 +446,137 @@ class AdvancedPredictionEngine:
             'fibonacci': fib_levels
         }
     
-    def _calculate_change(self, prices: List[float], index: int) -> float:
-        """Fiyat değişimi hesapla"""
-        if len(prices) >= abs(index):
-            return ((prices[-1] - prices[index]) / prices[index] * 100)
-        return 0
-    
-    def _moving_average(self, prices: List[float], period: int) -> float:
+    def _moving_average(self, prices: np.ndarray, period: int) -> float:
         """Basit hareketli ortalama"""
-        if len(prices) >= period:
-            return statistics.mean(prices[-period:])
-        return statistics.mean(prices) if prices else 0
+        if len(prices) == 0:
+            return 0
+        return float(prices[-period:].mean())
     
-    def _exponential_moving_average(self, prices: List[float], period: int) -> float:
-        """Exponential Moving Average (EMA)"""
+    def _exponential_moving_average(self, prices: Sequence[float], period: int) -> float:
+        """
+        Exponential Moving Average (EMA)
+        İlk `period` değerin ortalamasıyla tohumlanır; kalan değerler döngü yerine
+        (1 - k)^n ağırlıklarıyla tek bir vektör çarpımında uygulanır
+        """
+        prices = np.asarray(prices, dtype=np.float64)
         if len(prices) < period:
-            return statistics.mean(prices) if prices else 0
+            return float(prices.mean()) if len(prices) else 0
         
         multiplier = 2 / (period + 1)
-        ema = statistics.mean(prices[:period])
+        seed = prices[:period].mean()
+        rest = prices[period:]
         
-        for price in prices[period:]:
-            ema = (price * multiplier) + (ema * (1 - multiplier))
+        decay = (1 - multiplier) ** np.arange(len(rest) - 1, -1, -1)
+        ema = seed * (1 - multiplier) ** len(rest) + multiplier * np.dot(decay, rest)
         
-        return ema
+        return float(ema)
     
-    def _calculate_rsi(self, prices: List[float], period: int = 14) -> float:
-        """RSI hesapla (geliştirilmiş)"""
+    def _calculate_rsi(self, prices: np.ndarray, period: int = 14) -> float:
+        """Wilder RSI - akış durumu ve toplu hesaplayıcıyla aynı tanım"""
         if len(prices) < period + 1:
             return 50
-        
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        
-        gains = [d if d > 0 else 0 for d in deltas]
-        losses = [-d if d < 0 else 0 for d in deltas]
-        
-        avg_gain = statistics.mean(gains[-period:])
-        avg_loss = statistics.mean(losses[-period:])
-        
-        if avg_loss == 0:
-            return 100
-        
-        rs = avg_gain / avg_loss
-        rsi = 100 - (100 / (1 + rs))
-        
-        return rsi
+        return float(self._rsi_series(prices, period, count=1)[0])
+    
+    def _rsi_series(self, prices: np.ndarray, period: int = 14, count: Optional[int] = None) -> np.ndarray:
+        """Wilder RSI serisinin son `count` değeri (None: tüm seri) - toplu hesaplayıcıyla aynı tanım"""
+        return batch_indicators.rsi_series(np.asarray(prices, dtype=float)[np.newaxis, :], period, count)[0]
     
-    def _calculate_stochastic_rsi(self, prices: List[float], period: int = 14) -> float:
-        """Stochastic RSI hesapla"""
+    def _calculate_stochastic_rsi(self, prices: np.ndarray, period: int = 14) -> float:
+        """Stochastic RSI hesapla (sadece son `period` RSI değeri, doğrusal zaman)"""
         if len(prices) < period * 2:
             return 50
-        
-        rsi_values = []
-        for i in range(period, len(prices)):
-            rsi = self._calculate_rsi(prices[:i+1], period)
-            rsi_values.append(rsi)
-        
-        if len(rsi_values) < period:
-            return 50
-        
-        recent_rsi = rsi_values[-period:]
-        min_rsi = min(recent_rsi)
-        max_rsi = max(recent_rsi)
-        
-        if max_rsi == min_rsi:
-            return 50
-        
-        stoch_rsi = ((rsi_values[-1] - min_rsi) / (max_rsi - min_rsi)) * 100
-        return stoch_rsi
+        return float(batch_indicators.stochastic_rsi(np.asarray(prices, dtype=float)[np.newaxis, :], period)[0])
     
-    def _calculate_bollinger_bands(self, prices: List[float], period: int = 20, std_dev: int = 2) -> Tuple[float, float, float]:
+    def _calculate_bollinger_bands(self, prices: np.ndarray, period: int = 20, std_dev: int = 2) -> Tuple[float, float, float]:
         """Bollinger Bands hesapla"""
         if len(prices) < period:
-            avg = statistics.mean(prices)
+            avg = float(prices.mean())
             return avg, avg, avg
         
         recent_prices = prices[-period:]
-        middle = statistics.mean(recent_prices)
-        std = statistics.stdev(recent_prices)
+        middle = float(recent_prices.mean())
+        std = float(recent_prices.std(ddof=1))
         
         upper = middle + (std_dev * std)
         lower = middle - (std_dev * std)
         
         return upper, middle, lower
     
-    def _calculate_atr(self, prices: List[float], period: int = 14) -> float:
-        """Average True Range (ATR) hesapla"""
+    def _calculate_atr(self, prices: np.ndarray, period: int = 14,
+                       highs: Optional[np.ndarray] = None, lows: Optional[np.ndarray] = None) -> float:
+        """Average True Range (ATR) hesapla - yüksek/düşük verilirse gerçek bar true range'i"""
         if len(prices) < period + 1:
-            return statistics.stdev(prices) if len(prices) > 1 else 0
-        
-        true_ranges = []
-        for i in range(1, len(prices)):
-            high_low = abs(prices[i] - prices[i-1])
-            true_ranges.append(high_low)
+            return float(prices.std(ddof=1)) if len(prices) > 1 else 0
         
-        return statistics.mean(true_ranges[-period:])
+        if highs is None or lows is None:
+            true_ranges = np.abs(np.diff(prices[-(period + 1):]))
+        else:
+            previous_close = prices[-(period + 1):-1]
+            high = highs[-period:]
+            low = lows[-period:]
+            true_ranges = np.maximum(high - low, np.maximum(np.abs(high - previous_close), np.abs(low - previous_close)))
+        return float(true_ranges.mean())
     
-    def _calculate_trend_strength(self, prices: List[float], period: int = 14) -> float:
+    def _calculate_trend_strength(self, prices: np.ndarray, period: int = 14) -> float:
         """Trend gücü hesapla (ADX benzeri basitleştirilmiş)"""
         if len(prices) < period + 1:
             return 50
         
-        positive_moves = 0
-        negative_moves = 0
-        
-        for i in range(-period, -1):
-            change = prices[i] - prices[i-1]
-            if change > 0:
-                positive_moves += abs(change)
-            else:
-                negative_moves += abs(change)
+        # Son delta hariç son (period - 1) değişim
+        changes = np.diff(prices[-(period + 1):])[:-1]
+        positive_moves = changes[changes > 0].sum()
+        negative_moves = -changes[changes < 0].sum()
         
         total_movement = positive_moves + negative_moves
         if total_movement == 0:
             return 50
         
         directional_strength = abs(positive_moves - negative_moves) / total_movement * 100
-        return directional_strength
+        return float(directional_strength)
     
-    def _calculate_momentum(self, prices: List[float], period: int = 10) -> float:
+    def _calculate_momentum(self, prices: Sequence[float], period: int = 10) -> float:
         """Momentum hesapla"""
         if len(prices) <= period:
             return 0
-        return prices[-1] - prices[-period-1]
+        return float(prices[-1] - prices[-period-1])
     
-    def _calculate_rate_of_change(self, prices: List[float], period: int = 10) -> float:
+    def _calculate_rate_of_change(self, prices: Sequence[float], period: int = 10) -> float:
         """Rate of Change (ROC) hesapla"""
         if len(prices) <= period:
             return 0
-        return ((prices[-1] - prices[-period-1]) / prices[-period-1]) * 100
+        return float(((prices[-1] - prices[-period-1]) / prices[-period-1]) * 100)
     
-    def _calculate_support_resistance(self, prices: List[float]) -> Tuple[List[float], List[float]]:
+    def _calculate_support_resistance(self, prices: Sequence[float]) -> Tuple[List[float], List[float]]:
         """Destek ve direnç seviyelerini hesapla"""
+        prices = np.asarray(prices, dtype=np.float64)
         if len(prices) < 20:
-            return [min(prices)], [max(prices)]
+            return [float(prices.min())], [float(prices.max())]
         
-        recent_prices = prices[-50:] if len(prices) >= 50 else prices
+        recent_prices = prices[-50:]
         
-        # Local min/max bul
-        support_levels = []
-        resistance_levels = []
+        # Local min/max bul (iki yanındaki ikişer komşudan küçük/büyük)
+        center = recent_prices[2:-2]
+        neighbours = (recent_prices[1:-3], recent_prices[3:-1], recent_prices[:-4], recent_prices[4:])
+        is_support = np.logical_and.reduce([center < n for n in neighbours])
+        is_resistance = np.logical_and.reduce([center > n for n in neighbours])
         
-        for i in range(2, len(recent_prices) - 2):
-            # Local minimum (destek)
-            if recent_prices[i] < recent_prices[i-1] and recent_prices[i] < recent_prices[i+1]:
-                if recent_prices[i] < recent_prices[i-2] and recent_prices[i] < recent_prices[i+2]:
-                    support_levels.append(recent_prices[i])
-            
-            # Local maximum (direnç)
-            if recent_prices[i] > recent_prices[i-1] and recent_prices[i] > recent_prices[i+1]:
-                if recent_prices[i] > recent_prices[i-2] and recent_prices[i] > recent_prices[i+2]:
-                    resistance_levels.append(recent_prices[i])
+        support_levels = center[is_support]
+        resistance_levels = center[is_resistance]
         
         # En yakın 3 seviyeyi al
         current_price = prices[-1]
-        support_levels = sorted([s for s in support_levels if s < current_price])[-3:] if support_levels else [min(recent_prices)]
-        resistance_levels = sorted([r for r in resistance_levels if r > current_price])[:3] if resistance_levels else [max(recent_prices)]
+        if len(support_levels):
+            support_levels = np.sort(support_levels[support_levels < current_price])[-3:]
+        else:
+            support_levels = [recent_prices.min()]
+        if len(resistance_levels):
+            resistance_levels = np.sort(resistance_levels[resistance_levels > current_price])[:3]
+        else:
+            resistance_levels = [recent_prices.max()]
         
-        return support_levels, resistance_levels
+        return [float(s) for s in support_levels], [float(r) for r in resistance_levels]
     
-    def _determine_trend(self, ma_5: float, ma_10: float, ma_20: float, ma_50: float, prices: List[float]) -> str:
+    def _determine_trend(self, ma_5: float, ma_10: float, ma_20: float, ma_50: float, prices: Sequence[float]) -> str:
         """Geliştirilmiş trend belirleme"""
         current_price = prices[-1]
         
@@ -325,14 +601,14 @@ class AdvancedPredictionEngine:
         else:
             return "YATAY ↔️"
     
-    def _calculate_fibonacci_levels(self, prices: List[float]) -> Dict[str, float]:
+    def _calculate_fibonacci_levels(self, prices: Sequence[float]) -> Dict[str, float]:
         """Fibonacci retracement seviyeleri"""
         if len(prices) < 20:
             return {}
         
-        recent_prices = prices[-50:] if len(prices) >= 50 else prices
-        high = max(recent_prices)
-        low = min(recent_prices)
+        recent_prices = np.asarray(prices[-50:], dtype=np.float64)
+        high = float(recent_prices.max())
+        low = float(recent_prices.min())
         diff = high - low
         
         return {
@@ -345,7 +621,14 @@ class AdvancedPredictionEngine:
         }
     
     def generate_advanced_prediction(self, symbol: str) -> Dict:
-        """Gelişmiş AI destekli tahmin üret"""
+        """Gelişmiş AI destekli tahmin üret (tick sürümüne göre önbellekli)"""
+        return self._memoize(
+            self._prediction_cache, symbol, self.versions.get(symbol, 0),
+            lambda: self._compute_prediction(symbol)
+        )
+    
+    def _compute_prediction(self, symbol: str) -> Dict:
+        """Tahmini önbelleğe bakmadan üret"""
         indicators = self.calculate_advanced_indicators(symbol)
         
         if not indicators:
@@ -356,65 +639,17 @@ class AdvancedPredictionEngine:
                 'confidence': 0
             }
         
-        # Sinyal puanlama sistemi
-        signals = []
-        scores = []
-        weights = []  # Her sinyale ağırlık
-        
-        # 1. RSI Analizi (Ağırlık: 1.2)
-        rsi_score, rsi_signal = self._analyze_rsi(indicators['rsi'], indicators['stoch_rsi'])
-        scores.append(rsi_score)
-        weights.append(1.2)
-        signals.append(rsi_signal)
-        
-        # 2. MACD Analizi (Ağırlık: 1.5)
-        macd_score, macd_signal = self._analyze_macd(indicators['macd'])
-        scores.append(macd_score)
-        weights.append(1.5)
-        signals.append(macd_signal)
-        
-        # 3. Trend Analizi (Ağırlık: 1.3)
-        trend_score, trend_signal = self._analyze_trend(indicators['trend'], indicators['trend_strength'])
-        scores.append(trend_score)
-        weights.append(1.3)
-        signals.append(trend_signal)
-        
-        # 4. MA Cross Analizi (Ağırlık: 1.0)
-        ma_score, ma_signal = self._analyze_moving_averages(indicators['ma'], indicators['current_price'])
-        scores.append(ma_score)
-        weights.append(1.0)
-        signals.append(ma_signal)
-        
-        # 5. Bollinger Bands (Ağırlık: 1.1)
-        bb_score, bb_signal = self._analyze_bollinger_bands(indicators['bollinger_bands'], indicators['current_price'])
-        scores.append(bb_score)
-        weights.append(1.1)
-        signals.append(bb_signal)
-        
-        # 6. Momentum ve ROC (Ağırlık: 0.9)
-        momentum_score, momentum_signal = self._analyze_momentum(indicators['momentum'], indicators['roc'])
-        scores.append(momentum_score)
-        weights.append(0.9)
-        signals.append(momentum_signal)
-        
-        # 7. Volume Analizi (Ağırlık: 0.8)
-        volume_score, volume_signal = self._analyze_volume(indicators['volume_ratio'])
-        scores.append(volume_score)
-        weights.append(0.8)
-        signals.append(volume_signal)
-        
-        # 8. Support/Resistance (Ağırlık: 1.0)
-        sr_score, sr_signal = self._analyze_support_resistance(
-            indicators['current_price'],
-            indicators['support_levels'],
-            indicators['resistance_levels']
-        )
-        scores.append(sr_score)
-        weights.append(1.0)
-        signals.append(sr_signal)
+        return self._prediction_from_indicators(symbol, indicators)
+    
+    def _prediction_from_indicators(self, symbol: str, indicators: Dict) -> Dict:
+        """Hazır göstergelerden tahmin üret"""
+        # Sinyal puanlama sistemi (ağırlıklar puanlama profilinden)
+        analyses = self._analyze_signals(indicators)
+        scores = [score for score, _ in analyses]
+        signals = [signal for _, signal in analyses]
         
         # Ağırlıklı skor hesapla
-        weighted_score = sum(s * w for s, w in zip(scores, weights)) / sum(weights)
+        weighted_score = self.profile.weighted_score(scores)
         confidence = min(abs(weighted_score) * 15 + 50, 95)  # 50-95 arası
         
         # Risk skoru hesapla
@@ -443,6 +678,35 @@ class AdvancedPredictionEngine:
             'timestamp': datetime.now().isoformat()
         }
     
+    def _analyze_signals(self, indicators: Dict) -> List[Tuple[float, str]]:
+        """Tüm sinyallerin (skor, açıklama) çiftleri - sıra SIGNAL_NAMES ile aynı"""
+        return [
+            self._analyze_rsi(indicators['rsi'], indicators['stoch_rsi']),
+            self._analyze_macd(indicators['macd']),
+            self._analyze_trend(indicators['trend'], indicators['trend_strength']),
+            self._analyze_moving_averages(indicators['ma'], indicators['current_price']),
+            self._analyze_bollinger_bands(indicators['bollinger_bands'], indicators['current_price']),
+            self._analyze_momentum(indicators['momentum'], indicators['roc']),
+            self._analyze_volume(indicators['volume_ratio']),
+            self._analyze_support_resistance(
+                indicators['current_price'],
+                indicators['support_levels'],
+                indicators['resistance_levels']
+            )
+        ]
+    
+    def signal_matrix(self, indicator_list: Sequence[Dict]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Birçok gösterge anlık görüntüsü için (n x sinyal) alt skor matrisi ve risk skorları
+        Profilden bağımsızdır; farklı ağırlık/eşikler ScoringProfile.directions ile vektörel uygulanır
+        """
+        scores = np.array(
+            [[score for score, _ in self._analyze_signals(indicators)] for indicators in indicator_list],
+            dtype=np.float64
+        ).reshape(len(indicator_list), len(SIGNAL_NAMES))
+        risks = np.array([self._calculate_risk_score(indicators) for indicators in indicator_list], dtype=np.float64)
+        return scores, risks
+    
     def _analyze_rsi(self, rsi: float, stoch_rsi: float) -> Tuple[float, str]:
         """RSI analizi"""
         if rsi < 25:
@@ -585,8 +849,10 @@ class AdvancedPredictionEngine:
         return min(sum(risk_factors), 100)
     
     def _make_decision(self, weighted_score: float, confidence: float, risk_score: float) -> Dict:
-        """Nihai karar ver"""
-        if weighted_score >= 0.8 and risk_score < 60:
+        """Nihai karar ver (eşikler puanlama profilinden)"""
+        action = self.profile.action_type(weighted_score, risk_score)
+        
+        if action == 'STRONG_BUY':
             return {
                 'action': "GÜÇLÜ AL 🟢🟢",
                 'action_type': 'BUY',
@@ -595,7 +861,7 @@ class AdvancedPredictionEngine:
                 'emoji': '🚀',
                 'explanation': 'Tüm göstergeler güçlü yükseliş işaret ediyor!'
             }
-        elif weighted_score >= 0.4:
+        elif action == 'BUY':
             return {
                 'action': "AL 🟢",
                 'action_type': 'BUY',
@@ -604,7 +870,7 @@ class AdvancedPredictionEngine:
                 'emoji': '📈',
                 'explanation': 'Göstergeler yükseliş tarafında, ancak dikkatli ol.'
             }
-        elif weighted_score <= -0.8 and risk_score < 60:
+        elif action == 'STRONG_SELL':
             return {
                 'action': "GÜÇLÜ SAT 🔴🔴",
                 'action_type': 'SELL',
@@ -613,7 +879,7 @@ class AdvancedPredictionEngine:
                 'emoji': '📉',
                 'explanation': 'Güçlü düşüş sinyalleri mevcut!'
             }
-        elif weighted_score <= -0.4:
+        elif action == 'SELL':
             return {
                 'action': "SAT 🔴",
                 'action_type': 'SELL',
@@ -677,12 +943,29 @@ class AdvancedPredictionEngine:
             'atr': round(atr, 6)
         }
     
-    def get_top_opportunities(self, min_confidence: float = 65, top_n: int = 5) -> List[Dict]:
-        """En iyi fırsatları listele"""
+    def _memoize_aggregate(self, key: Any, compute: Callable[[], Any]) -> Any:
+        """Tüm coinleri kapsayan sonuçları toplam veri sürümüne göre önbellekle"""
+        with self._lock:
+            if key not in self._aggregate_cache and len(self._aggregate_cache) >= self.MAX_AGGREGATE_CACHE:
+                self._aggregate_cache.clear()
+            return self._memoize(self._aggregate_cache, key, self.data_version, compute)
+    
+    def get_top_opportunities(self, min_confidence: float = 65, top_n: int = 5,
+                              all_indicators: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+        """En iyi fırsatları listele (all_indicators: calculate_all_indicators sonucu)"""
+        if all_indicators is None:
+            return self._memoize_aggregate(
+                ('opportunities', min_confidence, top_n),
+                lambda: self.get_top_opportunities(min_confidence, top_n, self.calculate_all_indicators())
+            )
+        
         opportunities = []
         
-        for symbol in self.price_data.keys():
-            prediction = self.generate_advanced_prediction(symbol)
+        for symbol, indicators in all_indicators.items():
+            prediction = self._memoize(
+                self._prediction_cache, symbol, self.versions.get(symbol, 0),
+                lambda: self._prediction_from_indicators(symbol, indicators)
+            )
             
             if (prediction.get('confidence', 0) >= min_confidence and 
                 prediction.get('action_type') == 'BUY' and
@@ -694,15 +977,22 @@ class AdvancedPredictionEngine:
         
         return opportunities[:top_n]
     
-    def get_risk_alerts(self) -> List[Dict]:
-        """Gelişmiş risk uyarıları"""
+    def get_risk_alerts(self, all_indicators: Optional[Dict[str, Dict]] = None) -> List[Dict]:
+        """
+        Gelişmiş risk uyarıları (all_indicators: calculate_all_indicators sonucu)
+        Olay tabanlı uyarılar açıksa tarama yapılmaz, aktif uyarılar döndürülür
+        """
+        if all_indicators is None and self.alert_engine is not None:
+            return self.alert_engine.get_active_alerts()
+        
+        if all_indicators is None:
+            return self._memoize_aggregate(
+                'alerts', lambda: self.get_risk_alerts(self.calculate_all_indicators())
+            )
+        
         alerts = []
         
-        for symbol in self.price_data.keys():
-            indicators = self.calculate_advanced_indicators(symbol)
-            if not indicators:
-                continue
-            
+        for symbol, indicators in all_indicators.items():
             # Aşırı volatilite
             if indicators['volatility_percent'] > self.alert_thresholds['volatility'] * 100:
                 alerts.append({
@@ -796,11 +1086,22 @@ class AdvancedPredictionEngine:
         
         return alerts
     
-    def generate_market_summary(self) -> Optional[Dict]:
-        """Gelişmiş piyasa özeti"""
+    def get_alert_log(self, limit: int = 100) -> List[Dict]:
+        """Son açılan/kapanan uyarı olayları"""
+        if self.alert_engine is None:
+            return []
+        return self.alert_engine.get_log(limit)
+    
+    def generate_market_summary(self, all_indicators: Optional[Dict[str, Dict]] = None) -> Optional[Dict]:
+        """Gelişmiş piyasa özeti (all_indicators: calculate_all_indicators sonucu)"""
         if not self.price_data:
             return None
         
+        if all_indicators is None:
+            return self._memoize_aggregate(
+                'market_summary', lambda: self.generate_market_summary(self.calculate_all_indicators())
+            )
+        
         total_coins = len(self.price_data)
         strong_rising = 0
         rising = 0
@@ -814,11 +1115,7 @@ class AdvancedPredictionEngine:
         avg_rsi = []
         high_volatility_count = 0
         
-        for symbol in self.price_data.keys():
-            indicators = self.calculate_advanced_indicators(symbol)
-            if not indicators:
-                continue
-            
+        for indicators in all_indicators.values():
             change_5m = indicators['changes']['5m']
             
             # Trend kategorileri
@@ -900,30 +1197,38 @@ class AdvancedPredictionEngine:
             'avg_volume_ratio': round(avg_volume_ratio, 2),
             'high_volatility_count': high_volatility_count,
             'volatility_percentage': round((high_volatility_count / total_coins * 100), 1) if total_coins > 0 else 0,
+            # Hareketin piyasa geneli mi coine özel mi olduğu (kova getirilerinin korelasyonu)
+            'breadth': self.market_analytics.get_breadth() if self.market_analytics is not None else None,
             'timestamp': datetime.now().isoformat()
         }
     
     def get_symbol_statistics(self, symbol: str) -> Optional[Dict]:
         """Coin için detaylı istatistikler"""
-        if symbol not in self.price_data or len(self.price_data[symbol]) < 20:
-            return None
+        with self._lock:
+            if symbol not in self.price_data or len(self.price_data[symbol]) < 20:
+                return None
+            prices = self.price_data[symbol].prices.copy()
         
-        prices = [d['price'] for d in self.price_data[symbol]]
+        low = float(prices.min())
+        high = float(prices.max())
+        mean = float(prices.mean())
+        std = float(prices.std(ddof=1))
+        first, last = float(prices[0]), float(prices[-1])
         
         return {
             'symbol': symbol,
             'data_points': len(prices),
             'price_range': {
-                'min': round(min(prices), 6),
-                'max': round(max(prices), 6),
-                'range': round(max(prices) - min(prices), 6)
+                'min': round(low, 6),
+                'max': round(high, 6),
+                'range': round(high - low, 6)
             },
-            'average_price': round(statistics.mean(prices), 6),
-            'median_price': round(statistics.median(prices), 6),
-            'std_deviation': round(statistics.stdev(prices), 6),
-            'coefficient_of_variation': round((statistics.stdev(prices) / statistics.mean(prices)) * 100, 2),
-            'price_trend': 'UP' if prices[-1] > prices[0] else 'DOWN',
-            'total_change_percent': round(((prices[-1] - prices[0]) / prices[0]) * 100, 2)
+            'average_price': round(mean, 6),
+            'median_price': round(float(np.median(prices)), 6),
+            'std_deviation': round(std, 6),
+            'coefficient_of_variation': round((std / mean) * 100, 2),
+            'price_trend': 'UP' if last > first else 'DOWN',
+            'total_change_percent': round(((last - first) / first) * 100, 2)
         }
     
     def backtest_prediction(self, symbol: str, prediction: Dict, actual_outcome: str) -> None:
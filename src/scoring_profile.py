@@ -0,0 +1,138 @@
+"""
+TAHMİN PUANLAMA PROFİLİ ⚖️
+Sinyal ağırlıkları, karar eşikleri ve uyarı eşikleri tek bir yapılandırmada toplanır
+Profil JSON dosyasından okunabilir; parametre taramaları profilleri üretir
+"""
+
+import json
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+# Sinyal sırası (_analyze_signals ile aynı sırada)
+SIGNAL_NAMES = ('rsi', 'macd', 'trend', 'ma', 'bollinger', 'momentum', 'volume', 'support_resistance')
+
+DEFAULT_WEIGHTS = {
+    'rsi': 1.2,
+    'macd': 1.5,
+    'trend': 1.3,
+    'ma': 1.0,
+    'bollinger': 1.1,
+    'momentum': 0.9,
+    'volume': 0.8,
+    'support_resistance': 1.0,
+}
+
+DEFAULT_THRESHOLDS = {
+    'strong_buy': 0.8,    # Ağırlıklı skor >= bu değer ve risk düşükse GÜÇLÜ AL
+    'buy': 0.4,           # Ağırlıklı skor >= bu değer ise AL
+    'strong_sell': -0.8,  # Ağırlıklı skor <= bu değer ve risk düşükse GÜÇLÜ SAT
+    'sell': -0.4,         # Ağırlıklı skor <= bu değer ise SAT
+    'max_strong_risk': 60,  # Güçlü sinyal için risk skoru üst sınırı
+}
+
+DEFAULT_ALERT_THRESHOLDS = {
+    'volatility': 0.1,
+    'rapid_decline': -5,
+    'rapid_increase': 5,
+    'rsi_overbought': 75,
+    'rsi_oversold': 25
+}
+
+SECTIONS = ('weights', 'thresholds', 'alert_thresholds')
+
+
+class ScoringProfile:
+    """Ağırlık + eşik yapılandırması"""
+
+    def __init__(self, weights: Optional[Dict[str, float]] = None,
+                 thresholds: Optional[Dict[str, float]] = None,
+                 alert_thresholds: Optional[Dict[str, float]] = None,
+                 name: str = 'default'):
+        self.name = name
+        self.weights = {**DEFAULT_WEIGHTS, **(weights or {})}
+        self.thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+        self.alert_thresholds = {**DEFAULT_ALERT_THRESHOLDS, **(alert_thresholds or {})}
+
+        unknown = set(self.weights) - set(SIGNAL_NAMES)
+        if unknown:
+            raise ValueError(f"Bilinmeyen sinyal ağırlığı: {', '.join(sorted(unknown))}")
+        if sum(self.weights.values()) <= 0:
+            raise ValueError("Ağırlıkların toplamı pozitif olmalı")
+
+    def weight_vector(self) -> np.ndarray:
+        """Ağırlıklar SIGNAL_NAMES sırasında"""
+        return np.array([self.weights[name] for name in SIGNAL_NAMES], dtype=np.float64)
+
+    def weighted_score(self, scores) -> float:
+        """Tek tahmin için ağırlıklı skor (scores: SIGNAL_NAMES sırasında)"""
+        total = sum(self.weights.values())
+        return sum(score * self.weights[name] for name, score in zip(SIGNAL_NAMES, scores)) / total
+
+    def action_type(self, weighted_score: float, risk_score: float) -> str:
+        """Karar sınıfı: 'STRONG_BUY' / 'BUY' / 'STRONG_SELL' / 'SELL' / 'HOLD'"""
+        t = self.thresholds
+        if weighted_score >= t['strong_buy'] and risk_score < t['max_strong_risk']:
+            return 'STRONG_BUY'
+        if weighted_score >= t['buy']:
+            return 'BUY'
+        if weighted_score <= t['strong_sell'] and risk_score < t['max_strong_risk']:
+            return 'STRONG_SELL'
+        if weighted_score <= t['sell']:
+            return 'SELL'
+        return 'HOLD'
+
+    def directions(self, score_matrix: np.ndarray, risk_scores: np.ndarray,
+                   min_confidence: float = 0) -> np.ndarray:
+        """
+        Çok sayıda anlık görüntü için vektörel karar yönleri (+1 AL, -1 SAT, 0 BEKLE)
+        score_matrix: (n x sinyal) alt skorlar, risk_scores: n risk skoru
+        """
+        weights = self.weight_vector()
+        weighted = score_matrix @ weights / weights.sum()
+        confidence = np.minimum(np.abs(weighted) * 15 + 50, 95)
+
+        # action_type ile aynı sıra: önce AL koşulları, sonra SAT koşulları
+        t = self.thresholds
+        low_risk = risk_scores < t['max_strong_risk']
+        buy = ((weighted >= t['strong_buy']) & low_risk) | (weighted >= t['buy'])
+        sell = ~buy & (((weighted <= t['strong_sell']) & low_risk) | (weighted <= t['sell']))
+
+        directions = np.where(buy, 1, np.where(sell, -1, 0)).astype(np.int8)
+        directions[confidence < min_confidence] = 0
+        return directions
+
+    def with_overrides(self, overrides: Dict[str, Any], name: Optional[str] = None) -> 'ScoringProfile':
+        """'weights.rsi' / 'thresholds.buy' gibi noktalı anahtarlarla yeni profil"""
+        sections = self.to_dict()
+        for key, value in overrides.items():
+            section, _, field = key.partition('.')
+            if section not in SECTIONS or not field:
+                raise ValueError(f"Geçersiz profil anahtarı: {key}")
+            sections[section][field] = value
+        return ScoringProfile(**sections, name=name or self.name)
+
+    def to_dict(self) -> Dict[str, Dict]:
+        return {
+            'weights': dict(self.weights),
+            'thresholds': dict(self.thresholds),
+            'alert_thresholds': dict(self.alert_thresholds)
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, name: str = 'default') -> 'ScoringProfile':
+        return cls(
+            weights=data.get('weights'),
+            thresholds=data.get('thresholds'),
+            alert_thresholds=data.get('alert_thresholds'),
+            name=data.get('name', name)
+        )
+
+    @classmethod
+    def load(cls, path: str) -> 'ScoringProfile':
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f), name=path)
+
+    def save(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'name': self.name, **self.to_dict()}, f, ensure_ascii=False, indent=2)
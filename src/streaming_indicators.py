@@ -0,0 +1,330 @@
+"""
+AKIŞ (STREAMING) GÖSTERGE DURUMU ⚡
+Her yeni tick'te O(1) güncellenen teknik gösterge durumu
+"""
+
+import math
+from collections import deque
+from typing import Optional
+
+# Kayan toplamlarda birikecek float hatasını temizlemek için
+# her N güncellemede bir toplam pencereden yeniden hesaplanır
+RESYNC_INTERVAL = 1024
+
+# Bundan dar min/max aralığı düz sayılır: yuvarlama gürültüsü stokastikte 0-100 sıçramasına dönüşmesin
+FLAT_RANGE = 1e-9
+
+
+class RollingSum:
+    """Sabit pencereli kayan toplam (O(1) güncelleme)"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values = deque()
+        self.total = 0.0
+        self.nonzero = 0  # Penceredeki sıfır olmayan değer sayısı
+        self._updates = 0
+
+    def push(self, value: float) -> None:
+        """Pencereye yeni değer ekle, en eskisini çıkar"""
+        self.values.append(value)
+        self.total += value
+        if value != 0:
+            self.nonzero += 1
+
+        if len(self.values) > self.period:
+            old = self.values.popleft()
+            self.total -= old
+            if old != 0:
+                self.nonzero -= 1
+
+        self._updates += 1
+        if self.nonzero == 0:
+            # Tamamen sıfır pencerede artık hata kalmasın
+            self.total = 0.0
+        elif self._updates >= RESYNC_INTERVAL:
+            self.total = math.fsum(self.values)
+            self._updates = 0
+
+    def mean(self) -> float:
+        """Penceredeki değerlerin ortalaması"""
+        return self.total / len(self.values) if self.values else 0
+
+    def is_full(self) -> bool:
+        return len(self.values) >= self.period
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+
+class RollingExtrema:
+    """Monoton deque ile kayan pencere min/max (amortize O(1))"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self._index = 0
+        self._min = deque()  # (indeks, değer) - değerler artan
+        self._max = deque()  # (indeks, değer) - değerler azalan
+        self.last = None
+
+    def push(self, value: float) -> None:
+        """Pencereye yeni değer ekle, süresi dolanları at"""
+        while self._min and self._min[-1][1] >= value:
+            self._min.pop()
+        self._min.append((self._index, value))
+
+        while self._max and self._max[-1][1] <= value:
+            self._max.pop()
+        self._max.append((self._index, value))
+
+        expired = self._index - self.period
+        if self._min[0][0] <= expired:
+            self._min.popleft()
+        if self._max[0][0] <= expired:
+            self._max.popleft()
+
+        self._index += 1
+        self.last = value
+
+    def min(self) -> float:
+        return self._min[0][1]
+
+    def max(self) -> float:
+        return self._max[0][1]
+
+    def is_full(self) -> bool:
+        return self._index >= self.period
+
+
+def stochastic_value(window: RollingExtrema) -> float:
+    """Penceredeki son değerin min/max aralığındaki konumu (0-100)"""
+    if not window.is_full():
+        return 50
+
+    min_value = window.min()
+    max_value = window.max()
+
+    if max_value - min_value <= FLAT_RANGE:
+        return 50
+
+    return ((window.last - min_value) / (max_value - min_value)) * 100
+
+
+class RollingVariance:
+    """Kayan pencerede ortalama ve varyans (Welford, kayan pencere uyarlaması)"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.values = deque()
+        self.mean = 0.0
+        self._m2 = 0.0
+        self._updates = 0
+
+    def push(self, value: float) -> None:
+        """Pencereye yeni değer ekle"""
+        self.values.append(value)
+
+        if len(self.values) > self.period:
+            # Eski değeri yenisiyle değiştir (pencere boyu sabit)
+            old = self.values.popleft()
+            old_mean = self.mean
+            self.mean += (value - old) / self.period
+            self._m2 += (value - old) * (value - self.mean + old - old_mean)
+        else:
+            n = len(self.values)
+            delta = value - self.mean
+            self.mean += delta / n
+            self._m2 += delta * (value - self.mean)
+
+        self._updates += 1
+        if self._updates >= RESYNC_INTERVAL:
+            self._resync()
+
+    def _resync(self) -> None:
+        """Birikmiş float hatasını temizle"""
+        n = len(self.values)
+        self.mean = math.fsum(self.values) / n
+        self._m2 = math.fsum((v - self.mean) ** 2 for v in self.values)
+        self._updates = 0
+
+    def stdev(self) -> float:
+        """Örneklem standart sapması (statistics.stdev ile aynı)"""
+        n = len(self.values)
+        if n < 2:
+            return 0
+        return math.sqrt(max(self._m2, 0.0) / (n - 1))
+
+
+class StreamingEMA:
+    """İlk `period` değerin ortalamasıyla tohumlanan akış EMA'sı"""
+
+    def __init__(self, period: int):
+        self.period = period
+        self.multiplier = 2 / (period + 1)
+        self.value = None
+        self._seed = RollingSum(period)
+
+    def push(self, price: float) -> None:
+        if self.value is None:
+            self._seed.push(price)
+            if self._seed.is_full():
+                self.value = self._seed.mean()
+        else:
+            self.value = (price * self.multiplier) + (self.value * (1 - self.multiplier))
+
+    def get(self) -> float:
+        """EMA değeri (tohum dolmadıysa ortalama)"""
+        if self.value is None:
+            return self._seed.mean()
+        return self.value
+
+
+class WilderRSI:
+    """Wilder yumuşatmalı akış RSI"""
+
+    def __init__(self, period: int = 14):
+        self.period = period
+        self.avg_gain = None
+        self.avg_loss = None
+        self._gains = RollingSum(period)
+        self._losses = RollingSum(period)
+
+    def push(self, delta: float) -> None:
+        gain = delta if delta > 0 else 0
+        loss = -delta if delta < 0 else 0
+
+        if self.avg_gain is None:
+            self._gains.push(gain)
+            self._losses.push(loss)
+            if self._gains.is_full():
+                self.avg_gain = self._gains.mean()
+                self.avg_loss = self._losses.mean()
+        else:
+            self.avg_gain = (self.avg_gain * (self.period - 1) + gain) / self.period
+            self.avg_loss = (self.avg_loss * (self.period - 1) + loss) / self.period
+
+    def is_ready(self) -> bool:
+        return self.avg_gain is not None
+
+    def get(self) -> float:
+        if self.avg_gain is None:
+            return 50
+        if self.avg_loss == 0:
+            return 100
+        rs = self.avg_gain / self.avg_loss
+        return 100 - (100 / (1 + rs))
+
+
+class StreamingIndicatorState:
+    """Bir coin için tüm akış göstergelerini tutar"""
+
+    # Destek/direnç ve Fibonacci için saklanan son fiyat sayısı
+    RECENT_SIZE = 50
+
+    def __init__(self):
+        self.count = 0
+        self.last_price = None
+        self.last_volume = 0.0
+        self.recent = deque(maxlen=self.RECENT_SIZE)
+
+        self.ma = {period: RollingSum(period) for period in (5, 10, 20, 50)}
+        self.ema = {period: StreamingEMA(period) for period in (12, 26)}
+        # MACD sinyal çizgisi: MACD değerlerinin 9 EMA'sı (EMA 26 tohumlandıktan sonra beslenir)
+        self.macd_signal = StreamingEMA(9)
+        self.rsi = WilderRSI(14)
+        self.rsi_window = RollingExtrema(14)
+        self.bollinger = RollingVariance(20)
+        self.true_range = RollingSum(14)
+        self.volume = RollingSum(20)
+
+        # Trend gücü: son delta hariç 13 deltanın yönlü toplamları
+        self.trend_up = RollingSum(13)
+        self.trend_down = RollingSum(13)
+        self._last_delta = None
+
+    def update(self, price: float, volume: float = 0,
+               high: Optional[float] = None, low: Optional[float] = None) -> None:
+        """
+        Yeni tick (veya kapanmış bar) ile tüm göstergeleri O(1) güncelle
+        Bar modunda high/low verilir ve ATR gerçek true range ile hesaplanır
+        """
+        if self.last_price is not None:
+            delta = price - self.last_price
+
+            self.rsi.push(delta)
+            if self.rsi.is_ready():
+                self.rsi_window.push(self.rsi.get())
+
+            if high is None or low is None:
+                self.true_range.push(abs(delta))
+            else:
+                self.true_range.push(max(high - low, abs(high - self.last_price), abs(low - self.last_price)))
+
+            if self._last_delta is not None:
+                self.trend_up.push(self._last_delta if self._last_delta > 0 else 0)
+                self.trend_down.push(-self._last_delta if self._last_delta < 0 else 0)
+            self._last_delta = delta
+
+        for ma in self.ma.values():
+            ma.push(price)
+        for ema in self.ema.values():
+            ema.push(price)
+        if self.ema[26].value is not None:
+            self.macd_signal.push(self.ema[12].value - self.ema[26].value)
+        self.bollinger.push(price)
+        self.volume.push(volume)
+
+        self.recent.append(price)
+        self.last_price = price
+        self.last_volume = volume
+        self.count += 1
+
+    def moving_average(self, period: int) -> float:
+        return self.ma[period].mean()
+
+    def exponential_moving_average(self, period: int) -> float:
+        return self.ema[period].get()
+
+    def macd(self):
+        """(MACD, sinyal, histogram) - MACD serisi oluşmadan sinyal MACD'ye eşit sayılır"""
+        line = self.ema[12].get() - self.ema[26].get()
+        if self.ema[26].value is None:
+            return line, line, 0.0
+        signal = self.macd_signal.get()
+        return line, signal, line - signal
+
+    def stochastic_rsi(self) -> float:
+        """Son 14 RSI değeri üzerinden Stochastic RSI"""
+        return stochastic_value(self.rsi_window)
+
+    def bollinger_bands(self, std_dev: int = 2):
+        middle = self.bollinger.mean
+        std = self.bollinger.stdev()
+        return middle + (std_dev * std), middle, middle - (std_dev * std)
+
+    def atr(self) -> float:
+        return self.true_range.mean()
+
+    def volume_ratio(self) -> float:
+        volume_ma = self.volume.mean()
+        return (self.last_volume / volume_ma) if volume_ma > 0 else 1
+
+    def trend_strength(self) -> float:
+        """Trend gücü (ADX benzeri basitleştirilmiş)"""
+        if not self.trend_up.is_full():
+            return 50
+
+        positive_moves = self.trend_up.total
+        negative_moves = self.trend_down.total
+        total_movement = positive_moves + negative_moves
+
+        if total_movement == 0:
+            return 50
+
+        return abs(positive_moves - negative_moves) / total_movement * 100
+
+    def price_ago(self, ticks: int) -> Optional[float]:
+        """`ticks` tick önceki fiyat (yetersizse None)"""
+        if len(self.recent) <= ticks:
+            return None
+        return self.recent[-ticks - 1]
@@ -0,0 +1,153 @@
+"""
+TICK HALKA TAMPONU 🔁
+Coin başına fiyat/hacim/zaman geçmişini önceden ayrılmış NumPy dizilerinde tutar
+"""
+
+from datetime import datetime
+from typing import Union
+
+import numpy as np
+
+# Tek tick kaydı (disk kaydı, ikili dosyalar ve toplu işlemler için)
+TICK_DTYPE = np.dtype([('timestamp', '<i8'), ('price', '<f8'), ('volume', '<f8')])
+
+
+def to_epoch_ms(timestamp: Union[datetime, int, float, None]) -> int:
+    """datetime veya epoch-ms değerini epoch-ms tamsayısına çevir"""
+    if timestamp is None:
+        return int(datetime.now().timestamp() * 1000)
+    if isinstance(timestamp, datetime):
+        return int(timestamp.timestamp() * 1000)
+    return int(timestamp)
+
+
+def candles_to_ticks(open_times: np.ndarray, opens: np.ndarray, highs: np.ndarray,
+                     lows: np.ndarray, closes: np.ndarray, volumes: np.ndarray) -> np.ndarray:
+    """
+    Her barı bar süresi içine yayılmış 4 tick'e (açılış, uç, uç, kapanış) çevir
+    Yükselen barlarda önce dip, düşen barlarda önce tepe gelir
+    """
+    n = len(open_times)
+    if n == 0:
+        return np.zeros(0, dtype=TICK_DTYPE)
+
+    if n > 1:
+        interval = int(np.median(np.diff(open_times)))
+    else:
+        interval = 4
+    step = max(interval // 4, 1)
+
+    rising = closes >= opens
+    first = np.where(rising, lows, highs)
+    second = np.where(rising, highs, lows)
+
+    ticks = np.zeros(n * 4, dtype=TICK_DTYPE)
+    ticks['timestamp'] = (open_times[:, None] + np.arange(4) * step).ravel()
+    ticks['timestamp'][3::4] = open_times + interval - 1
+    ticks['price'] = np.column_stack((opens, first, second, closes)).ravel()
+    ticks['volume'][3::4] = volumes
+    return ticks
+
+
+def compress_ticks(ticks: np.ndarray, interval_ms: int) -> np.ndarray:
+    """
+    Aynı `interval_ms` kovasındaki tick'leri açılış/yüksek/düşük/kapanış tick'lerine indir
+    Bar tabanlı göstergeler değişmez, tekrar oynatılacak tick sayısı kova başına en fazla 4 olur
+    """
+    if len(ticks) == 0:
+        return ticks
+
+    buckets = ticks['timestamp'] // interval_ms
+    starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+    if len(starts) * 4 >= len(ticks):
+        return ticks
+
+    ends = np.r_[starts[1:], len(ticks)] - 1
+    prices = ticks['price']
+
+    compressed = candles_to_ticks(
+        buckets[starts] * interval_ms,
+        prices[starts],
+        np.maximum.reduceat(prices, starts),
+        np.minimum.reduceat(prices, starts),
+        prices[ends],
+        np.add.reduceat(ticks['volume'], starts)
+    )
+    # Tick'ler kovadaki gerçek ilk/son tick zamanlarında kalır (zaman sırası bozulmaz)
+    for offset in range(3):
+        compressed['timestamp'][offset::4] = ticks['timestamp'][starts]
+    compressed['timestamp'][3::4] = ticks['timestamp'][ends]
+    return compressed
+
+
+class TickRingBuffer:
+    """
+    Sabit kapasiteli tick halkası
+
+    Her değer dizide iki kez (i ve i + capacity) yazılır; böylece son
+    `capacity` değer her zaman bitişik bir dilimdir ve sıralı okumalar
+    kopyasız (zero-copy) görünüm olarak döner.
+    """
+
+    def __init__(self, capacity: int):
+        if capacity <= 0:
+            raise ValueError("capacity pozitif olmalı")
+
+        self.capacity = capacity
+        self._prices = np.zeros(capacity * 2, dtype=np.float64)
+        self._volumes = np.zeros(capacity * 2, dtype=np.float64)
+        self._timestamps = np.zeros(capacity * 2, dtype=np.int64)
+        self._head = 0  # Bir sonraki yazma konumu (0..capacity-1)
+        self._size = 0
+
+    def append(self, price: float, volume: float = 0, timestamp_ms: int = 0) -> None:
+        """Yeni tick ekle (O(1), bellek ayırma yok)"""
+        head = self._head
+        mirror = head + self.capacity
+
+        self._prices[head] = self._prices[mirror] = price
+        self._volumes[head] = self._volumes[mirror] = volume
+        self._timestamps[head] = self._timestamps[mirror] = timestamp_ms
+
+        self._head = (head + 1) % self.capacity
+        if self._size < self.capacity:
+            self._size += 1
+
+    def _window(self, array: np.ndarray) -> np.ndarray:
+        """Eskiden yeniye sıralı, salt okunur görünüm"""
+        if self._size < self.capacity:
+            view = array[:self._size]
+        else:
+            view = array[self._head:self._head + self.capacity]
+        view = view.view()
+        view.flags.writeable = False
+        return view
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._window(self._prices)
+
+    @property
+    def volumes(self) -> np.ndarray:
+        return self._window(self._volumes)
+
+    @property
+    def timestamps(self) -> np.ndarray:
+        """Epoch-ms zaman damgaları"""
+        return self._window(self._timestamps)
+
+    @property
+    def last_price(self) -> float:
+        return float(self._prices[self._head - 1 + self.capacity])
+
+    @property
+    def last_timestamp(self) -> int:
+        return int(self._timestamps[self._head - 1 + self.capacity])
+
+    @property
+    def nbytes(self) -> int:
+        """Tamponun kapladığı bellek (byte)"""
+        return self._prices.nbytes + self._volumes.nbytes + self._timestamps.nbytes
+
+    def __len__(self) -> int:
+        return self._size
@@ -0,0 +1,182 @@
+"""
+KALICI TICK KAYDI 💾
+Tick'leri coin başına, sabit genişlikli ikili kayıtlar (TICK_DTYPE, 24 byte) halinde
+yalnızca sona eklenen segment dosyalarına yazar; okuma mmap ile ayrıştırmasız yapılır
+
+Dizin yapısı:
+    <kök>/<COIN>/<ilk tick epoch-ms, 13 hane>.ticks
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.tick_buffer import TICK_DTYPE
+
+SEGMENT_SUFFIX = '.ticks'
+
+
+class TickLog:
+    """Segmentli, yalnızca eklenen tick kaydı"""
+
+    def __init__(self, root: str, segment_records: int = 1 << 20, max_segments: int = 48):
+        if segment_records <= 0 or max_segments <= 0:
+            raise ValueError("segment_records ve max_segments pozitif olmalı")
+
+        self.root = root
+        self.segment_records = segment_records  # Segment başına kayıt (1M kayıt = 24 MB)
+        self.max_segments = max_segments  # Coin başına tutulacak segment sayısı (eskiler silinir)
+        self._writers = {}  # Coin -> [dosya, segmentteki kayıt sayısı]
+        self._lock = threading.Lock()
+        self.stats = {'records_written': 0, 'segments_created': 0, 'segments_deleted': 0}
+
+        os.makedirs(root, exist_ok=True)
+
+    # ─────────────────────────── Yazma ───────────────────────────
+
+    def _segments(self, symbol: str) -> List[str]:
+        """Coinin segment dosyaları (eskiden yeniye)"""
+        directory = os.path.join(self.root, symbol)
+        if not os.path.isdir(directory):
+            return []
+        names = sorted(name for name in os.listdir(directory) if name.endswith(SEGMENT_SUFFIX))
+        return [os.path.join(directory, name) for name in names]
+
+    def _open_segment(self, symbol: str, first_timestamp: int) -> list:
+        directory = os.path.join(self.root, symbol)
+        os.makedirs(directory, exist_ok=True)
+
+        segments = self._segments(symbol)
+        if segments:
+            path = segments[-1]
+            size = os.path.getsize(path)
+            count = size // TICK_DTYPE.itemsize
+            if count < self.segment_records:
+                handle = open(path, 'r+b')
+                # Çökme sonrası yarım kalan kaydı at
+                handle.truncate(count * TICK_DTYPE.itemsize)
+                handle.seek(0, os.SEEK_END)
+                return [handle, count]
+
+        path = os.path.join(directory, f"{first_timestamp:013d}{SEGMENT_SUFFIX}")
+        self.stats['segments_created'] += 1
+        self._apply_retention(symbol, keep=self.max_segments - 1)
+        return [open(path, 'ab'), 0]
+
+    def _apply_retention(self, symbol: str, keep: int) -> None:
+        segments = self._segments(symbol)
+        for path in segments[:max(len(segments) - keep, 0)]:
+            os.remove(path)
+            self.stats['segments_deleted'] += 1
+
+    def append(self, symbol: str, records: np.ndarray) -> None:
+        """Bir coinin zaman sıralı TICK_DTYPE kayıtlarını ekle"""
+        with self._lock:
+            offset = 0
+            while offset < len(records):
+                writer = self._writers.get(symbol)
+                if writer is None:
+                    writer = self._writers[symbol] = self._open_segment(symbol, int(records['timestamp'][offset]))
+
+                handle, count = writer
+                take = min(self.segment_records - count, len(records) - offset)
+                handle.write(records[offset:offset + take].tobytes())
+                handle.flush()
+                writer[1] += take
+                offset += take
+                self.stats['records_written'] += take
+
+                if writer[1] >= self.segment_records:
+                    handle.close()
+                    del self._writers[symbol]
+
+    def append_batch(self, trades: Iterable[Tuple[str, float, float, int]]) -> None:
+        """[(coin, fiyat, hacim, epoch-ms), ...] toplu yaz (veri alım hattından çağrılır)"""
+        grouped = {}
+        for symbol, price, volume, timestamp in trades:
+            grouped.setdefault(symbol, []).append((timestamp, price, volume))
+
+        for symbol, rows in grouped.items():
+            self.append(symbol, np.array(rows, dtype=TICK_DTYPE))
+
+    def close(self) -> None:
+        with self._lock:
+            for handle, _ in self._writers.values():
+                handle.close()
+            self._writers.clear()
+
+    # ─────────────────────────── Okuma ───────────────────────────
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if os.path.isdir(os.path.join(self.root, name)) and self._segments(name)
+        )
+
+    @staticmethod
+    def _map(path: str) -> Optional[np.ndarray]:
+        """Segmenti salt okunur mmap olarak aç (yarım kayıt sayılmaz)"""
+        count = os.path.getsize(path) // TICK_DTYPE.itemsize
+        if count == 0:
+            return None
+        return np.memmap(path, dtype=TICK_DTYPE, mode='r', shape=(count,))
+
+    def read(self, symbol: str, since_ms: Optional[int] = None, limit: Optional[int] = None,
+             until_ms: Optional[int] = None) -> np.ndarray:
+        """
+        Coinin [since_ms, until_ms] aralığındaki kayıtlarını oku (zaman sıralı kopya)
+        Sadece gereken segmentler eşlenir: aralık ve `limit` dışında kalanlar açılmaz
+        """
+        parts = []
+        total = 0
+
+        for path in reversed(self._segments(symbol)):
+            first = int(os.path.basename(path)[:-len(SEGMENT_SUFFIX)])
+            if until_ms is not None and first > until_ms:
+                continue
+
+            records = self._map(path)
+            if records is None:
+                continue
+
+            if until_ms is not None:
+                end = int(np.searchsorted(records['timestamp'], until_ms, side='right'))
+                records = records[:end]
+            if since_ms is not None:
+                start = int(np.searchsorted(records['timestamp'], since_ms, side='left'))
+                records = records[start:]
+
+            parts.append(records)
+            total += len(records)
+
+            if (limit is not None and total >= limit) or (since_ms is not None and first <= since_ms):
+                break
+
+        if not parts:
+            return np.zeros(0, dtype=TICK_DTYPE)
+
+        if limit is not None and total > limit:
+            # Fazlalık en eski parçadan kesilir; birleştirme tek kopya üretir
+            parts[-1] = parts[-1][total - limit:]
+        return np.concatenate(parts[::-1])
+
+    def read_all(self, since_ms: Optional[int] = None) -> Dict[str, np.ndarray]:
+        """Tüm coinler (backtest için)"""
+        return {symbol: self.read(symbol, since_ms) for symbol in self.symbols()}
+
+    def get_stats(self) -> Dict:
+        sizes = {}
+        for symbol in self.symbols():
+            sizes[symbol] = sum(os.path.getsize(path) for path in self._segments(symbol))
+
+        return {
+            **self.stats,
+            'root': self.root,
+            'symbols': len(sizes),
+            'records': sum(sizes.values()) // TICK_DTYPE.itemsize,
+            'bytes': sum(sizes.values())
+        }
@@ -0,0 +1,89 @@
+"""
+ORTAK TICK DEPOSU 🗄️
+Her coin için tick'ler tek bir yerde (TickRingBuffer) tutulur; grafik API'si ve tahmin motoru
+aynı veriden okur. Zaman metni tick başına değil, sadece serileştirme anında üretilir.
+Yazıcı (ingestion thread) ve okuyucular (Flask istekleri) ortak kilidi (`lock`) kullanır;
+dışarıya verilen aralıklar kopyadır, sonradan gelen tick'lerle değişmez.
+"""
+
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from src.tick_buffer import TickRingBuffer
+
+
+def tick_records(timestamps: np.ndarray, prices: np.ndarray) -> List[Dict]:
+    """Grafik için sözlük listesi - 'time' metni burada, okuma anında üretilir"""
+    return [
+        {
+            'price': price,
+            'timestamp': timestamp,
+            'time': time.strftime('%H:%M:%S', time.localtime(timestamp / 1000))
+        }
+        for timestamp, price in zip(timestamps.tolist(), prices.tolist())
+    ]
+
+
+class TickStore:
+    """Coin -> TickRingBuffer deposu"""
+
+    def __init__(self, capacity: int = 200):
+        if capacity <= 0:
+            raise ValueError("capacity pozitif olmalı")
+
+        self.capacity = capacity
+        self.buffers = {}  # Coin -> TickRingBuffer
+        self.lock = threading.RLock()  # Tahmin motoru da aynı kilidi kullanır
+
+    def append(self, symbol: str, price: float, volume: float, timestamp_ms: int) -> TickRingBuffer:
+        """Tick ekle (O(1)); coin için tampon yoksa oluşturulur"""
+        with self.lock:
+            buffer = self.buffers.get(symbol)
+            if buffer is None:
+                buffer = self.buffers[symbol] = TickRingBuffer(self.capacity)
+            buffer.append(price, volume, timestamp_ms)
+            return buffer
+
+    def get(self, symbol: str) -> Optional[TickRingBuffer]:
+        return self.buffers.get(symbol)
+
+    def symbols(self) -> List[str]:
+        return list(self.buffers)
+
+    def window(self, symbol: str, points: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Son `points` tick'in (zaman, fiyat, hacim) kopyasız görünümleri (eskiden yeniye)"""
+        buffer = self.buffers[symbol]
+        timestamps, prices, volumes = buffer.timestamps, buffer.prices, buffer.volumes
+        if points is not None:
+            timestamps, prices, volumes = timestamps[-points:], prices[-points:], volumes[-points:]
+        return timestamps, prices, volumes
+
+    def range(self, symbol: str, since_ms: Optional[int] = None,
+              until_ms: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """[since_ms, until_ms] aralığındaki tick'lerin kopyası (zaman sıralı olduğu için ikili arama)"""
+        with self.lock:
+            timestamps, prices, volumes = self.window(symbol)
+            start = int(np.searchsorted(timestamps, since_ms, side='left')) if since_ms is not None else 0
+            end = int(np.searchsorted(timestamps, until_ms, side='right')) if until_ms is not None else len(timestamps)
+            return timestamps[start:end].copy(), prices[start:end].copy(), volumes[start:end].copy()
+
+    def to_records(self, symbol: str, points: Optional[int] = None) -> List[Dict]:
+        """Son `points` tick'in grafik kayıtları"""
+        with self.lock:
+            timestamps, prices, _ = self.window(symbol, points)
+            timestamps, prices = timestamps.copy(), prices.copy()
+        return tick_records(timestamps, prices)
+
+    @property
+    def nbytes(self) -> int:
+        """Tüm tamponların kapladığı bellek (byte)"""
+        return sum(buffer.nbytes for buffer in self.buffers.values())
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self.buffers
+
+    def __len__(self) -> int:
+        return len(self.buffers)
@@ -0,0 +1,36 @@
+"""
+TOKEN BÜTÇESİ 🧮
+Mesajların yaklaşık token sayısı ve modele göre prompt bütçesi
+- Tokenizer yüklemeden karakter sayısından tahmin (Türkçe için biraz fazla tahmin eder, güvenli taraf)
+- Bütçe = model bağlam penceresi - cevap için ayrılan MAX_TOKENS (en fazla CONTEXT_MAX_PROMPT_TOKENS)
+"""
+
+from config.settings import Settings
+
+# Ortalama token başına karakter (Türkçe metinde İngilizceden düşük)
+CHARS_PER_TOKEN = 3
+# Mesaj başına rol/ayraç ek yükü
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text):
+    """Metnin yaklaşık token sayısı (mesaj ek yükü dahil)"""
+    return -(-len(text) // CHARS_PER_TOKEN) + MESSAGE_OVERHEAD_TOKENS
+
+
+def context_budget(model):
+    """Model için prompt'a (system + geçmiş) ayrılabilecek token sayısı"""
+    window = Settings.CONTEXT_WINDOW_TOKENS.get(model, Settings.DEFAULT_CONTEXT_WINDOW_TOKENS)
+    return max(min(window - Settings.MAX_TOKENS, Settings.CONTEXT_MAX_PROMPT_TOKENS), 1024)
+
+
+def truncate_to_tokens(text, tokens):
+    """Metni baştan ve sondan koruyarak yaklaşık `tokens` tokene kısalt"""
+    limit = max(tokens - MESSAGE_OVERHEAD_TOKENS, 0) * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+
+    marker = f"\n\n[... {len(text) - limit} karakter bağlam sınırı nedeniyle kısaltıldı ...]\n\n"
+    keep = max(limit - len(marker), 0)
+    head = keep * 2 // 3
+    return text[:head] + marker + text[len(text) - (keep - head):]
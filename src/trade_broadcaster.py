@@ -0,0 +1,171 @@
+"""
+TRADE YAYINCISI 📡💱
+Binance trade'lerini her trade'de değil, sabit hızda tek bir toplu çerçeve olarak yayınlar
+Coin başına sadece son trade tutulur; yavaş istemciler için çerçeveler birleştirilir (drop-to-latest)
+"""
+
+import threading
+import time
+from typing import Dict, List
+
+
+def _merge_trades(target: Dict[str, List], trades: Dict[str, List]) -> None:
+    """Yeni trade'leri bekleyen çerçeveye kat: fiyat/miktar/zaman son trade'den, sayaç toplanır"""
+    for symbol, trade in trades.items():
+        previous = target.get(symbol)
+        if previous is None:
+            target[symbol] = list(trade)
+        else:
+            target[symbol] = [trade[0], trade[1], trade[2], previous[3] + trade[3]]
+
+
+class TradeBroadcaster:
+    """
+    Birleştirici (coalescing), hız sınırlı trade yayıncısı
+
+    Çerçeve: {'t': sunucu zamanı (ms), 'trades': {coin: [fiyat, miktar, trade zamanı, birleşen trade sayısı]}}
+
+    Geri basınç: istemci her çerçeveyi 'trades_ack' ile onaylar. Onaylanmamış çerçevesi olan
+    istemciye yeni çerçeve gönderilmez; gelen trade'ler o istemcinin bekleyen çerçevesinde
+    coin başına en son değere indirgenir ve onay gelince tek seferde gönderilir.
+    """
+
+    EVENT = 'trade_batch'
+
+    def __init__(self, socketio, rate_hz: float = 5.0, ack_timeout: float = 5.0):
+        if rate_hz <= 0:
+            raise ValueError("rate_hz pozitif olmalı")
+
+        self.socketio = socketio
+        self.interval = 1 / rate_hz
+        self.ack_timeout = ack_timeout  # Onay gelmezse istemci bu süre sonra tekrar hazır sayılır
+
+        self.running = False
+        self._lock = threading.Lock()
+        self._latest = {}  # Coin -> [fiyat, miktar, zaman, sayaç] (son çerçeveden beri)
+        self._clients = {}  # sid -> {'in_flight_since': monotonic | None, 'pending': dict | None}
+        self.stats = {
+            'trades_received': 0,
+            'frames_built': 0,
+            'frames_sent': 0,
+            'frames_coalesced': 0,
+            'emits': 0
+        }
+
+    def start(self) -> None:
+        """Zamanlayıcıyı başlat (zaten çalışıyorsa bir şey yapmaz)"""
+        if self.running:
+            return
+        self.running = True
+        self.socketio.start_background_task(self._run)
+        print(f"📡 Trade yayıncısı başlatıldı ({1 / self.interval:.0f} Hz)")
+
+    def stop(self) -> None:
+        self.running = False
+
+    def _run(self) -> None:
+        while self.running:
+            try:
+                self.flush_once()
+            except Exception as e:
+                print(f"❌ Trade yayın hatası: {e}")
+            self.socketio.sleep(self.interval)
+
+    def publish(self, symbol: str, price: float, quantity: float, timestamp: int, count: int = 1) -> None:
+        """Trade'i kaydet (O(1), yayın yapmaz; count: bu değere indirgenmiş trade sayısı)"""
+        with self._lock:
+            self.stats['trades_received'] += count
+            previous = self._latest.get(symbol)
+            if previous:
+                count += previous[3]
+            self._latest[symbol] = [price, quantity, timestamp, count]
+
+    def add_client(self, sid: str) -> None:
+        with self._lock:
+            self._clients[sid] = {'in_flight_since': None, 'pending': None}
+
+    def remove_client(self, sid: str) -> None:
+        with self._lock:
+            self._clients.pop(sid, None)
+
+    def _frame(self, trades: Dict[str, List]) -> Dict:
+        return {'t': int(time.time() * 1000), 'trades': trades}
+
+    def _emit(self, payload: Dict, to) -> None:
+        self.socketio.emit(self.EVENT, payload, to=to)
+        self.stats['emits'] += 1
+
+    def _prune_disconnected(self) -> None:
+        manager = self.socketio.server.manager
+        for sid in [sid for sid in self._clients if not manager.is_connected(sid, '/')]:
+            del self._clients[sid]
+
+    def flush_once(self) -> int:
+        """Son çerçeveden beri gelen trade'leri hazır istemcilere gönder; gönderilen istemci sayısı"""
+        with self._lock:
+            trades, self._latest = self._latest, {}
+            if not trades:
+                return 0
+            self.stats['frames_built'] += 1
+
+            self._prune_disconnected()
+            now = time.monotonic()
+            shared = []  # Ortak çerçeveyi alacak istemciler (tek serileştirme)
+            individual = []  # Bekleyen çerçevesi zaman aşımına uğramış istemciler
+
+            for sid, client in self._clients.items():
+                in_flight = client['in_flight_since']
+                if in_flight is not None and now - in_flight < self.ack_timeout:
+                    # İstemci geride: çerçeveyi en son değerlere indirgeyerek beklet
+                    if client['pending'] is None:
+                        client['pending'] = {}
+                    _merge_trades(client['pending'], trades)
+                    self.stats['frames_coalesced'] += 1
+                    continue
+
+                client['in_flight_since'] = now
+                if client['pending']:
+                    _merge_trades(client['pending'], trades)
+                    individual.append((sid, client['pending']))
+                    client['pending'] = None
+                else:
+                    shared.append(sid)
+
+        if shared:
+            self._emit(self._frame(trades), shared)
+        for sid, pending in individual:
+            self._emit(self._frame(pending), sid)
+
+        sent = len(shared) + len(individual)
+        self.stats['frames_sent'] += sent
+        return sent
+
+    def ack(self, sid: str) -> None:
+        """İstemci son çerçeveyi işledi: bekleyen varsa hemen gönder"""
+        with self._lock:
+            client = self._clients.get(sid)
+            if client is None:
+                return
+
+            pending = client['pending']
+            client['pending'] = None
+            client['in_flight_since'] = time.monotonic() if pending else None
+
+        if pending:
+            self._emit(self._frame(pending), sid)
+            self.stats['frames_sent'] += 1
+
+    def get_stats(self) -> Dict:
+        with self._lock:
+            lagging = sum(1 for client in self._clients.values() if client['pending'])
+            clients = len(self._clients)
+
+        received = self.stats['trades_received']
+        return {
+            **self.stats,
+            'running': self.running,
+            'rate_hz': round(1 / self.interval, 2),
+            'clients': clients,
+            'lagging_clients': lagging,
+            'trades_per_emit': round(received / self.stats['emits'], 2) if self.stats['emits'] else 0
+        }
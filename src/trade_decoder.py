@@ -0,0 +1,162 @@
+"""
+BINANCE TRADE ÇÖZÜCÜ ⚡
+Trade çerçevelerinden sadece gerekli alanları (stream -> coin, p, q, T) çıkarır
+- Kurulu ise hızlı JSON kütüphanesi (orjson / ujson), değilse standart json kullanılır
+- Stream adı -> coin eşlemesi önbelleklenir
+- 'scan' modu JSON ağacı kurmadan alanları tek regex ile metinden okur (beklenmeyen
+  biçimde JSON ayrıştırıcıya düşer); 'auto' hızlı JSON kütüphanesi yoksa bunu seçer
+
+Mikro kıyaslama:
+    python -m src.trade_decoder
+"""
+
+import json
+import re
+import time
+from typing import Callable, Dict, Optional, Tuple
+
+try:
+    import orjson
+    JSON_BACKEND = 'orjson'
+    json_loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        JSON_BACKEND = 'ujson'
+        json_loads = ujson.loads
+    except ImportError:
+        JSON_BACKEND = 'json'
+        json_loads = json.loads
+
+# (coin, fiyat, miktar, trade zamanı epoch-ms)
+Trade = Tuple[str, float, float, int]
+
+# Stream adının '@' öncesi, fiyat, miktar ve trade zamanı
+_TRADE_PATTERN = re.compile(r'"stream":"([^"@]+)[^"]*".*?"p":"([^"]+)".*?"q":"([^"]+)".*?"T":(\d+)')
+
+
+class TradeDecoder:
+    """Binance combined-stream trade mesajlarını (coin, fiyat, miktar, zaman) demetine çevirir"""
+
+    MODES = ('auto', 'scan', 'parse')
+
+    def __init__(self, mode: str = 'auto', loads: Optional[Callable] = None):
+        if mode not in self.MODES:
+            raise ValueError(f"Geçersiz mod: {mode}")
+        if mode == 'auto':
+            # Hızlı JSON kütüphanesi C'de tam ayrıştırmada regex'ten hızlı; yoksa regex taraması
+            mode = 'parse' if loads is None and JSON_BACKEND != 'json' else 'scan'
+
+        self.mode = mode
+        self.loads = loads or json_loads
+        self._symbols = {}  # Stream adı -> coin ('btcusdt@trade' -> 'BTCUSDT')
+        self.stats = {'decoded': 0, 'fallbacks': 0, 'skipped': 0}
+
+    def symbol_for(self, stream: str) -> str:
+        symbol = self._symbols.get(stream)
+        if symbol is None:
+            symbol = self._symbols[stream] = stream.split('@', 1)[0].upper()
+        return symbol
+
+    def decode(self, message) -> Optional[Trade]:
+        """Trade mesajını çöz; trade olmayan mesajlar için None"""
+        if self.mode == 'scan':
+            if isinstance(message, (bytes, bytearray)):
+                message = message.decode('utf-8')
+            trade = self._scan(message)
+            if trade is not None:
+                self.stats['decoded'] += 1
+                return trade
+            self.stats['fallbacks'] += 1
+
+        trade = self._parse(message)
+        if trade is None:
+            self.stats['skipped'] += 1
+        else:
+            self.stats['decoded'] += 1
+        return trade
+
+    def _scan(self, message: str) -> Optional[Trade]:
+        """Alanları metinden tek regex eşleşmesiyle oku (JSON ağacı yok); biçim beklenmedikse None"""
+        match = _TRADE_PATTERN.search(message)
+        if match is None:
+            return None
+
+        stream, price, quantity, trade_time = match.groups()
+        symbol = self._symbols.get(stream)
+        if symbol is None:
+            symbol = self._symbols[stream] = stream.upper()
+        return symbol, float(price), float(quantity), int(trade_time)
+
+    def _parse(self, message) -> Optional[Trade]:
+        data = self.loads(message)
+        trade_data = data.get('data')
+        if trade_data is None or 'p' not in trade_data:
+            return None
+
+        return (
+            self.symbol_for(data.get('stream', 'unknown')),
+            float(trade_data['p']),
+            float(trade_data.get('q', 0)),
+            int(trade_data['T'])
+        )
+
+    def get_stats(self) -> Dict:
+        return {**self.stats, 'mode': self.mode, 'backend': JSON_BACKEND, 'cached_streams': len(self._symbols)}
+
+
+# ═══════════════════════════════════════════════════════════
+# MİKRO KIYASLAMA
+# ═══════════════════════════════════════════════════════════
+
+def _sample_messages(count: int):
+    symbols = ['btcusdt', 'ethusdt', 'bnbusdt', 'solusdt', 'xrpusdt']
+    messages = []
+    for i in range(count):
+        symbol = symbols[i % len(symbols)]
+        messages.append(json.dumps({
+            'stream': f'{symbol}@trade',
+            'data': {
+                'e': 'trade', 'E': 1700000000000 + i, 's': symbol.upper(), 't': 3000000000 + i,
+                'p': f'{43000 + i % 1000 * 0.01:.8f}', 'q': f'{0.001 + i % 7 * 0.0001:.8f}',
+                'T': 1700000000000 + i, 'm': i % 2 == 0, 'M': True
+            }
+        }, separators=(',', ':')))
+    return messages
+
+
+def _baseline(message):
+    """Eski on_binance_message ayrıştırması"""
+    data = json.loads(message)
+    stream_name = data.get('stream', 'unknown')
+    if 'data' in data:
+        trade_data = data['data']
+        symbol = stream_name.split('@')[0].upper()
+        return symbol, float(trade_data['p']), float(trade_data.get('q', 0)), trade_data['T']
+
+
+def benchmark(count: int = 200_000) -> Dict[str, float]:
+    """Saniyede çözülen mesaj sayıları"""
+    messages = _sample_messages(count)
+    candidates = {
+        'baseline (json.loads + dict)': _baseline,
+        'parse (json)': TradeDecoder('parse', json.loads).decode,
+        f'parse ({JSON_BACKEND})': TradeDecoder('parse').decode,
+        'scan (regex)': TradeDecoder('scan').decode,
+    }
+
+    results = {}
+    for name, decode in candidates.items():
+        started = time.perf_counter()
+        for message in messages:
+            decode(message)
+        results[name] = count / (time.perf_counter() - started)
+    return results
+
+
+if __name__ == '__main__':
+    results = benchmark()
+    base = next(iter(results.values()))
+    print(f"⚡ Trade çözme kıyaslaması (JSON: {JSON_BACKEND}, auto: {TradeDecoder().mode})\n")
+    for name, rate in results.items():
+        print(f"{name:<32}{rate:>14,.0f} msg/s{rate / base:>8.2f}x")